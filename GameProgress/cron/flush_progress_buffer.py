@@ -0,0 +1,26 @@
+import logging
+
+from django.utils.timezone import now
+
+from GameProgress.services.progress_writes import flush_pending_progress, FLUSH_BATCH_SIZE
+
+logger = logging.getLogger(__name__)
+
+
+def flush_progress_buffer_cron():
+    """
+    Drain the write-behind buffer (batch after batch) once.
+    Safe for cron or the job worker (periodic job); concurrent flushers simply skip.
+    """
+    total = 0
+    try:
+        while True:
+            flushed = flush_pending_progress()
+            total += flushed
+            if flushed < FLUSH_BATCH_SIZE:
+                break
+        if total:
+            logger.info(f"[{now()}] Flushed {total} buffered progress update(s)")
+    except Exception as e:
+        logger.error(f"[{now()}] Progress buffer flush failed: {e}")
+    return total
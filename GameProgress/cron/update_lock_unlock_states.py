@@ -1,17 +1,15 @@
 import logging
-import threading
-import time
 
 from django.utils.timezone import now
 
 from GameProgress.models.level_progress import LevelProgress
 from GameProgress.models.level_schedule import SectionLevelSchedule
+from GameProgress.services.progress_versions import update_progress_rows
+from GameProgress.services.snapshots import run_daily_ranking_snapshot
 from StudentManagementSystem.models import Student
 
 logger = logging.getLogger(__name__)
 
-_background_loop_started = False
-
 
 def auto_update_lock_states(student_qs):
     """
@@ -29,11 +27,15 @@ def auto_update_lock_states(student_qs):
         try:
             # Unlock students in this section if start_date passed and still locked
             if sched.start_date and sched.start_date <= current_time:
-                unlocked_count = LevelProgress.objects.filter(
-                    student__section_id=sched.section_id,
-                    level_id=sched.level_id,
-                    unlocked=False
-                ).update(unlocked=True)
+                unlocked_count = update_progress_rows(
+                    LevelProgress.objects.filter(
+                        student__section_id=sched.section_id,
+                        level_id=sched.level_id,
+                        unlocked=False
+                    ),
+                    Student.objects.filter(section_id=sched.section_id),
+                    unlocked=True,
+                )
 
                 if unlocked_count > 0:
                     logger.info(
@@ -43,11 +45,15 @@ def auto_update_lock_states(student_qs):
 
             # Lock students if due_date passed and currently unlocked
             if sched.due_date and sched.due_date <= current_time:
-                locked_count = LevelProgress.objects.filter(
-                    student__section_id=sched.section_id,
-                    level_id=sched.level_id,
-                    unlocked=True
-                ).update(unlocked=False)
+                locked_count = update_progress_rows(
+                    LevelProgress.objects.filter(
+                        student__section_id=sched.section_id,
+                        level_id=sched.level_id,
+                        unlocked=True
+                    ),
+                    Student.objects.filter(section_id=sched.section_id),
+                    unlocked=False,
+                )
 
                 if locked_count > 0:
                     logger.info(
@@ -70,7 +76,7 @@ def auto_update_lock_states(student_qs):
 def auto_update_lock_states_cron():
     """
     Run auto lock/unlock update once (manual or scheduled call).
-    Safe for cron or background threads.
+    Safe for cron or the job worker (periodic job).
     """
     try:
         students = Student.objects.all()
@@ -83,23 +89,14 @@ def auto_update_lock_states_cron():
         logger.error(f"[{now()}] Auto update lock/unlock failed: {e}")
 
 
-def start_auto_update_background():
+def ranking_snapshot_cron():
     """
-    Start a background loop that runs auto_update_lock_states_cron() every minute.
-    Guaranteed to run only once per Django instance.
+    Take the daily ranking snapshot once per day (no-op when today's already exists).
+    Safe for cron or the job worker (periodic job).
     """
-    global _background_loop_started
-    if _background_loop_started:
-        return
-    _background_loop_started = True
-
-    def loop():
-        while True:
-            try:
-                auto_update_lock_states_cron()
-            except Exception as e:
-                logger.error(f"[AUTO-UPDATE LOOP] Error in background loop: {e}")
-            time.sleep(60)
-
-    threading.Thread(target=loop, daemon=True).start()
-    logger.info("Background auto-update loop started")
+    try:
+        taken = run_daily_ranking_snapshot()
+        if taken:
+            logger.info(f"[{now()}] Ranking snapshot stored for {taken} students")
+    except Exception as e:
+        logger.error(f"[{now()}] Ranking snapshot failed: {e}")
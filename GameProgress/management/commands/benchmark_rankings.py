@@ -0,0 +1,271 @@
+import json
+import random
+import statistics
+import time
+import tracemalloc
+
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test import Client
+
+from GameProgress.models import (
+    AchievementDefinition,
+    AchievementProgress,
+    LevelDefinition,
+    LevelProgress,
+)
+from GameProgress.services.ranking import (
+    RANKING_SORT_FIELDS,
+    get_all_student_rankings,
+    get_section_rankings,
+    get_student_performance,
+)
+from GameProgress.services.progress_versions import bump_definitions_version
+from GameProgress.services.scoreboard import rebuild_student_scores
+from StudentManagementSystem.models import Student, Teacher, SimpleAdmin
+from StudentManagementSystem.models.roles import Role
+from StudentManagementSystem.models.section import Department, YearLevel, Section
+from StudentManagementSystem.models.teachers import HandledSection
+
+BENCH_DEPARTMENTS = ["BCS", "BIT"]
+BENCH_YEARS = [1, 2, 3, 4]
+BENCH_LETTERS = "ABCDEFGHIJ"
+BATCH_SIZE = 5000
+
+
+# ============================================================
+# 🔹 SYNTHETIC COHORT
+# ============================================================
+
+class Cohort:
+    """Reproducible synthetic cohort (same seed + size → same data)."""
+
+    def __init__(self, size, levels, achievements, seed):
+        self.size = size
+        self.levels = levels
+        self.achievements = achievements
+        self.rng = random.Random(seed)
+
+    def build(self):
+        password = make_password("bench")
+        sections = []
+        for dept_name in BENCH_DEPARTMENTS:
+            dept, _ = Department.objects.get_or_create(name=dept_name)
+            for year in BENCH_YEARS:
+                year_level, _ = YearLevel.objects.get_or_create(year=year)
+                for letter in BENCH_LETTERS:
+                    section, _ = Section.objects.get_or_create(department=dept, year_level=year_level, letter=letter)
+                    sections.append(section)
+
+        levels = LevelDefinition.objects.bulk_create([
+            LevelDefinition(name=f"BenchLevel{i:02d}", sort_order=1000 + i) for i in range(self.levels)
+        ])
+        achievements = AchievementDefinition.objects.bulk_create([
+            AchievementDefinition(code=f"BENCH_{i:02d}", title=f"Bench {i}", description="benchmark")
+            for i in range(self.achievements)
+        ])
+        bump_definitions_version()  # 🔹 definitions registry must see the bench definitions
+
+        students = Student.objects.bulk_create(
+            [
+                Student(
+                    student_id=f"B{self.size}-{i:06d}",
+                    first_name=f"First{self.rng.randint(0, 5000)}",
+                    last_name=f"Last{self.rng.randint(0, 5000)}",
+                    password=password,
+                    section=section,
+                    year_level=section.year_level,
+                )
+                for i, section in ((i, sections[i % len(sections)]) for i in range(self.size))
+            ],
+            batch_size=BATCH_SIZE,
+        )
+
+        self._bulk(LevelProgress, (
+            LevelProgress(
+                student=student,
+                level=level,
+                best_time=self.rng.choice([0, self.rng.randint(1, 180)]),
+                unlocked=True,
+            )
+            for student in students for level in levels
+        ))
+        self._bulk(AchievementProgress, (
+            AchievementProgress(student=student, achievement=achievement, unlocked=self.rng.random() < 0.4)
+            for student in students for achievement in achievements
+        ))
+        rebuild_student_scores(chunk_size=BATCH_SIZE)
+
+        admin = SimpleAdmin.objects.create(username=f"bench-admin-{self.size}", password=password,
+                                           first_name="Bench", last_name="Admin")
+        teacher = Teacher.objects.create(teacher_id=f"BENCH-T-{self.size}", password=password,
+                                         first_name="Bench", last_name="Teacher")
+        for section in sections[:4]:
+            HandledSection.objects.create(teacher=teacher, department=section.department,
+                                          year_level=section.year_level, section=section)
+        return {"admin": admin, "teacher": teacher, "student": students[0], "section": sections[0]}
+
+    @staticmethod
+    def _bulk(model, rows):
+        batch = []
+        for row in rows:
+            batch.append(row)
+            if len(batch) == BATCH_SIZE:
+                model.objects.bulk_create(batch)
+                batch = []
+        if batch:
+            model.objects.bulk_create(batch)
+
+
+def bench_host():
+    """A Host header ALLOWED_HOSTS accepts (the test Client's "testserver" is refused when DEBUG=false)."""
+    for host in settings.ALLOWED_HOSTS:
+        host = host.strip().lstrip(".")
+        if host and host != "*":
+            return host
+    return "localhost"
+
+
+def session_client(user_id, role):
+    client = Client(HTTP_HOST=bench_host())
+    session = client.session
+    session["user_id"] = user_id
+    session["role"] = role
+    session.save()
+    return client
+
+
+# ============================================================
+# 🔹 MEASUREMENT
+# ============================================================
+
+class QueryCounter:
+    """connection.execute_wrapper hook (unlike connection.queries it survives request_started resets)."""
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+def measure(func, repeat):
+    """Run func once traced (queries + peak memory), then `repeat` times untraced for wall time."""
+    cache.clear()
+    queries = QueryCounter()
+    tracemalloc.start()
+    with connection.execute_wrapper(queries):
+        func()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    timings = []
+    for _ in range(repeat):
+        cache.clear()  # 🔹 always measure the uncached path
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+
+    return {
+        "median_ms": round(statistics.median(timings) * 1000, 2),
+        "min_ms": round(min(timings) * 1000, 2),
+        "queries": queries.count,
+        "peak_kib": round(peak / 1024, 1),
+    }
+
+
+def benchmark_cases(users):
+    """(name, callable) for every benchmarked code path."""
+    section = users["section"]
+    section_code = f"{section.department.name}{section.year_level.year}{section.letter}"
+    filters = {
+        "all": {},
+        "department": {"department_filter": section.department.name},
+        "section": {"filter_by": section_code},
+        "search": {"search_query": "First1"},
+    }
+
+    cases = []
+    for sort_by in RANKING_SORT_FIELDS:
+        for sort_order in ("desc", "asc"):
+            for filter_name, kwargs in filters.items():
+                cases.append((
+                    f"rankings sort={sort_by}:{sort_order} filter={filter_name}",
+                    lambda s=sort_by, o=sort_order, k=kwargs: get_all_student_rankings(
+                        sort_by=s, sort_order=o, **k
+                    ),
+                ))
+
+    cases.append(("section rankings", get_section_rankings))
+    cases.append(("student performance", lambda: get_student_performance(users["student"])))
+
+    admin = session_client(users["admin"].id, Role.ADMIN)
+    teacher = session_client(users["teacher"].id, Role.TEACHER)
+    student = session_client(users["student"].id, Role.STUDENT)
+    for name, client, url in [
+        ("view admin ranking", admin, "/student_rankings/?sort_by=score&per_page=25"),
+        ("view teacher ranking", teacher, "/teacher/teacher/student-ranking/?sort_by=score&per_page=25"),
+        ("view student ranking", student, "/student/ranking/?sort_by=score&per_page=25"),
+    ]:
+        def view(c=client, u=url):
+            response = c.get(u)
+            if response.status_code != 200:
+                raise CommandError(f"{u} → {response.status_code} (timings would measure an error page)")
+
+        cases.append((name, view))
+    return cases
+
+
+class _Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = "Benchmark rankings, scoring and ranking views against synthetic cohorts (data is rolled back)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 50000], help="Cohort sizes")
+        parser.add_argument("--levels", type=int, default=30)
+        parser.add_argument("--achievements", type=int, default=20)
+        parser.add_argument("--seed", type=int, default=42, help="Random seed for reproducible cohorts")
+        parser.add_argument("--repeat", type=int, default=3, help="Timed runs per case")
+        parser.add_argument("--only", type=str, default="", help="Only run cases whose name contains this")
+        parser.add_argument("--json", type=str, default="", help="Also write results to this JSON file")
+
+    def handle(self, *args, **options):
+        # ✅ Usage:
+        # Full suite:     python manage.py benchmark_rankings
+        # Quick check:    python manage.py benchmark_rankings --sizes 1000 --only view
+        # Compare runs:   python manage.py benchmark_rankings --json before.json
+        # Needs a local PostgreSQL; every cohort is created inside a transaction and rolled back.
+        results = []
+        for size in options["sizes"]:
+            self.stdout.write(f"🔹 Cohort: {size} students × {options['levels']} levels × "
+                              f"{options['achievements']} achievements")
+            try:
+                with transaction.atomic():
+                    start = time.perf_counter()
+                    users = Cohort(size, options["levels"], options["achievements"], options["seed"]).build()
+                    self.stdout.write(f"   built in {time.perf_counter() - start:.1f}s")
+
+                    for name, func in benchmark_cases(users):
+                        if options["only"] and options["only"] not in name:
+                            continue
+                        row = {"cohort": size, "case": name, **measure(func, options["repeat"])}
+                        results.append(row)
+                        self.stdout.write(
+                            f"   {name:<55} {row['median_ms']:>10.2f} ms  {row['queries']:>4} q  "
+                            f"{row['peak_kib']:>10.1f} KiB"
+                        )
+                    raise _Rollback
+            except _Rollback:
+                pass
+
+        if options["json"]:
+            with open(options["json"], "w") as fh:
+                json.dump(results, fh, indent=2)
+        self.stdout.write(self.style.SUCCESS(f"✅ Benchmarked {len(results)} case(s)"))
@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand
+
+from GameProgress.models import FailedProgressUpdate, PendingProgressUpdate
+from GameProgress.services.progress_writes import flush_pending_progress, FLUSH_BATCH_SIZE
+
+
+class Command(BaseCommand):
+    help = "Apply every buffered (write-behind) game autosave now"
+
+    def handle(self, *args, **options):
+        # ✅ Usage: python manage.py flush_progress_buffer
+        # The worker (run_worker) does this every PROGRESS_FLUSH_INTERVAL seconds when
+        # PROGRESS_WRITE_BEHIND=true; use it to drain the buffer after turning write-behind off.
+        # Saves that could not be applied are kept in FailedProgressUpdate (dead letter)
+        failed_before = FailedProgressUpdate.objects.count()
+        total = 0
+        while True:
+            flushed = flush_pending_progress(wait=True)
+            total += flushed
+            if flushed < FLUSH_BATCH_SIZE:
+                break
+        left = PendingProgressUpdate.objects.count()
+        failed = FailedProgressUpdate.objects.count() - failed_before
+        self.stdout.write(self.style.SUCCESS(f"✅ Flushed {total} buffered update(s), {left} left"))
+        if failed:
+            self.stdout.write(self.style.WARNING(f"⚠️ {failed} update(s) could not be applied, see FailedProgressUpdate"))
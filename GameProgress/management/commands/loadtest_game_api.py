@@ -0,0 +1,297 @@
+import asyncio
+import json
+import math
+import random
+import time
+import uuid
+from collections import defaultdict
+
+import aiohttp
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+
+from GameProgress.services.progress import sync_student_progress
+from GameProgress.services.scoreboard import refresh_student_scores
+from StudentManagementSystem.models import Student
+from StudentManagementSystem.models.section import Department, Section, YearLevel
+
+LOADTEST_PREFIX = "LT-"
+LOADTEST_DEPARTMENT = "LT"
+SECTION_SIZE = 40  # 🔹 students per section, about a real class
+
+
+# ============================================================
+# 🔹 TEST ACCOUNTS
+# ============================================================
+
+def loadtest_sections(count):
+    """Enough sections of the load-test department for `count` students (years 1-4 × letters A-Z at most)."""
+    department, _ = Department.objects.get_or_create(name=LOADTEST_DEPARTMENT)
+    sections = []
+    for index in range(min(max(1, math.ceil(count / SECTION_SIZE)), 4 * 26)):
+        year_level, _ = YearLevel.objects.get_or_create(year=index // 26 + 1)
+        section, _ = Section.objects.get_or_create(
+            department=department, year_level=year_level, letter=chr(ord("A") + index % 26),
+        )
+        sections.append(section)
+    return sections
+
+
+def seed_accounts(count, password, prefix=LOADTEST_PREFIX):
+    """
+    Create (or reuse) `count` load-test students shaped like registered ones:
+    a section, progress rows and a scoreboard row each. Returns their student_ids.
+    """
+    student_ids = [f"{prefix}{i:05d}" for i in range(count)]
+    existing = set(Student.objects.filter(student_id__in=student_ids).values_list("student_id", flat=True))
+    hashed = make_password(password)
+    sections = loadtest_sections(count)
+    for index, section in enumerate(sections):
+        members = student_ids[index::len(sections)]
+        for student_id in members:
+            if student_id not in existing:
+                Student.objects.create(
+                    student_id=student_id, first_name="Load", last_name=student_id, password=hashed,
+                    section=section, year_level=section.year_level,
+                )
+        # 🔹 accounts seeded before sections existed
+        Student.objects.filter(student_id__in=members, section__isnull=True).update(
+            section=section, year_level=section.year_level,
+        )
+
+    ids = list(Student.objects.filter(student_id__in=student_ids).values_list("id", flat=True))
+    refresh_student_scores(ids)  # reused accounts keep the progress of earlier runs
+    sync_student_progress(ids)
+    return student_ids
+
+
+def remove_accounts(prefix=LOADTEST_PREFIX):
+    deleted, _ = Student.objects.filter(student_id__startswith=prefix).delete()
+    Department.objects.filter(name=LOADTEST_DEPARTMENT).delete()  # 🔹 and their sections
+    return deleted
+
+
+# ============================================================
+# 🔹 MEASUREMENT
+# ============================================================
+
+class Stats:
+    """Latencies and outcomes per endpoint."""
+
+    def __init__(self):
+        self.latencies = defaultdict(list)
+        self.statuses = defaultdict(lambda: defaultdict(int))
+
+    def record(self, endpoint, status, seconds):
+        self.latencies[endpoint].append(seconds)
+        self.statuses[endpoint][status] += 1
+
+    @staticmethod
+    def percentile(values, pct):
+        """Nearest-rank percentile of a sorted list."""
+        return values[max(0, math.ceil(pct / 100 * len(values)) - 1)]
+
+    def report(self, elapsed):
+        rows = []
+        for endpoint in sorted(self.latencies):
+            values = sorted(self.latencies[endpoint])
+            statuses = self.statuses[endpoint]
+            errors = sum(n for status, n in statuses.items() if status == "error" or status >= 400)
+            rows.append({
+                "endpoint": endpoint,
+                "requests": len(values),
+                "rps": round(len(values) / elapsed, 2),
+                "p50_ms": round(self.percentile(values, 50) * 1000, 1),
+                "p95_ms": round(self.percentile(values, 95) * 1000, 1),
+                "p99_ms": round(self.percentile(values, 99) * 1000, 1),
+                "error_rate": round(errors / len(values), 4),
+                "statuses": {str(status): n for status, n in sorted(statuses.items(), key=str)},
+            })
+        return rows
+
+
+# ============================================================
+# 🔹 SIMULATED UNITY CLIENT
+# ============================================================
+
+class SimulatedStudent:
+    """
+    One game client: logs in, downloads its save, then loops autosave / revalidate with think times,
+    the way the Unity client does (full save document, numbered saves, If-None-Match / since).
+    """
+
+    def __init__(self, session, base_url, student_id, password, stats, options, rng):
+        self.session = session
+        self.base_url = base_url
+        self.student_id = student_id
+        self.password = password
+        self.stats = stats
+        self.options = options
+        self.rng = rng
+        self.headers = {"Accept-Encoding": "br, gzip"}
+        self.pk = None
+        self.document = None
+        self.etag = None
+        self.seq = 0
+
+    async def request(self, endpoint, method, path, **kwargs):
+        start = time.perf_counter()
+        try:
+            async with self.session.request(method, self.base_url + path, **kwargs) as response:
+                body = await response.read()
+                status = response.status
+                headers = response.headers
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            self.stats.record(endpoint, "error", time.perf_counter() - start)
+            return None, None, None
+        self.stats.record(endpoint, status, time.perf_counter() - start)
+        return status, headers, body
+
+    async def login(self):
+        status, _, body = await self.request(
+            "login", "POST", "/api/student_login/",
+            data={"student_id": self.student_id, "password": self.password},
+        )
+        if status != 200:
+            return False
+        data = json.loads(body)
+        self.pk = data["student"]["id"]
+        self.headers["Authorization"] = f"Bearer {data['token']}"
+        return True
+
+    async def get_progress(self):
+        headers = dict(self.headers)
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        status, response_headers, body = await self.request(
+            "get_progress", "GET", f"/api/progress/{self.pk}/", headers=headers
+        )
+        if status == 200:
+            self.document = json.loads(body)
+            self.etag = response_headers.get("ETag")
+
+    def play(self):
+        """Advance the local save like a play session: new times on a level or two, maybe an achievement."""
+        levels = self.document["levels"]["value"]
+        for name in self.rng.sample(sorted(levels), min(len(levels), self.rng.randint(1, 2))):
+            level = levels[name]
+            level["currentTime"] = self.rng.randint(0, 180)
+            level["bestTime"] = max(level["bestTime"], level["currentTime"])
+            level["unlocked"] = True
+        locked = [code for code, ach in self.document["achievements"]["value"].items() if not ach["unlocked"]]
+        if locked and self.rng.random() < 0.1:
+            self.document["achievements"]["value"][self.rng.choice(locked)]["unlocked"] = True
+
+    async def save_progress(self):
+        self.play()
+        self.seq += 1
+        headers = {
+            **self.headers,
+            "Content-Type": "application/json",
+            "X-Save-Seq": str(self.seq),
+            "Idempotency-Key": uuid.uuid4().hex,
+        }
+        await self.request(
+            "update_progress", "POST", f"/api/progress/update/{self.pk}/",
+            data=json.dumps(self.document, separators=(",", ":")), headers=headers,
+        )
+
+    async def run(self, deadline):
+        await asyncio.sleep(self.rng.uniform(0, self.options["ramp_up"]))
+        if not await self.login():
+            return
+        await self.get_progress()
+        if self.document is None:
+            return
+
+        while time.monotonic() < deadline:
+            await asyncio.sleep(self.rng.uniform(self.options["think_min"], self.options["think_max"]))
+            if time.monotonic() >= deadline:
+                break
+            if self.rng.random() < self.options["read_ratio"]:
+                await self.get_progress()
+            else:
+                await self.save_progress()
+
+
+async def run_load(base_url, student_ids, password, options):
+    stats = Stats()
+    rng = random.Random(options["seed"])
+    timeout = aiohttp.ClientTimeout(total=options["timeout"])
+    connector = aiohttp.TCPConnector(limit=len(student_ids))
+    async with aiohttp.ClientSession(timeout=timeout, connector=connector) as session:
+        deadline = time.monotonic() + options["ramp_up"] + options["duration"]
+        clients = [
+            SimulatedStudent(session, base_url, student_id, password, stats, options, random.Random(rng.random()))
+            for student_id in student_ids
+        ]
+        start = time.monotonic()
+        await asyncio.gather(*(client.run(deadline) for client in clients))
+        elapsed = time.monotonic() - start
+    return stats, elapsed
+
+
+class Command(BaseCommand):
+    help = "Load-test the game API with simulated Unity clients (login, then get / update loops)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--url", type=str, default="http://localhost:8000", help="Server base URL")
+        parser.add_argument("--students", type=int, default=40, help="Simulated students (one lab ≈ 40)")
+        parser.add_argument("--duration", type=float, default=60, help="Seconds of get/update loops")
+        parser.add_argument("--ramp-up", type=float, default=10, help="Seconds over which clients log in")
+        parser.add_argument("--think-min", type=float, default=2, help="Min seconds between client requests")
+        parser.add_argument("--think-max", type=float, default=8, help="Max seconds between client requests")
+        parser.add_argument("--read-ratio", type=float, default=0.2, help="Share of loop requests that are reads")
+        parser.add_argument("--timeout", type=float, default=30, help="Per-request timeout in seconds")
+        parser.add_argument("--password", type=str, default="loadtest", help="Password of the test accounts")
+        parser.add_argument("--seed", type=int, default=42, help="Random seed for reproducible runs")
+        parser.add_argument("--seed-accounts", action="store_true", help=f"Create {LOADTEST_PREFIX}* students first")
+        parser.add_argument("--cleanup", action="store_true", help=f"Delete {LOADTEST_PREFIX}* students afterwards")
+        parser.add_argument("--json", type=str, default="", help="Also write results to this JSON file")
+
+    def handle(self, *args, **options):
+        # ✅ Usage:
+        # First run:      python manage.py loadtest_game_api --seed-accounts --students 40
+        # Whole campus:   python manage.py loadtest_game_api --students 400 --duration 300 --url http://localhost:8001
+        # Remove data:    python manage.py loadtest_game_api --students 0 --cleanup
+        # Targets a running server (runserver, gunicorn or the "asgi" compose profile); accounts are
+        # LT-00000..., all sharing --password. Rate limits (PROGRESS_RATE_LIMITS) apply: many clients
+        # behind one IP may need a larger PROGRESS_BURST_IP on the server.
+        if options["think_min"] > options["think_max"]:
+            raise CommandError("--think-min must not exceed --think-max")
+
+        count = options["students"]
+        if options["seed_accounts"]:
+            student_ids = seed_accounts(count, options["password"])
+            self.stdout.write(f"🔹 Seeded {len(student_ids)} load-test account(s)")
+        else:
+            student_ids = list(
+                Student.objects.filter(student_id__startswith=LOADTEST_PREFIX)
+                .order_by("student_id").values_list("student_id", flat=True)[:count]
+            )
+            if len(student_ids) < count:
+                raise CommandError(f"Only {len(student_ids)} {LOADTEST_PREFIX}* account(s); pass --seed-accounts")
+
+        if student_ids:
+            self.stdout.write(
+                f"🔹 {len(student_ids)} client(s) → {options['url']} for {options['duration']:.0f}s "
+                f"(+{options['ramp_up']:.0f}s ramp-up)"
+            )
+            stats, elapsed = asyncio.run(run_load(options["url"].rstrip("/"), student_ids, options["password"], options))
+            results = stats.report(elapsed)
+
+            for row in results:
+                self.stdout.write(
+                    f"   {row['endpoint']:<16} {row['requests']:>7} req  {row['rps']:>8.2f}/s  "
+                    f"p50 {row['p50_ms']:>8.1f} ms  p95 {row['p95_ms']:>8.1f} ms  p99 {row['p99_ms']:>8.1f} ms  "
+                    f"errors {row['error_rate'] * 100:>5.1f}%  {row['statuses']}"
+                )
+            total = sum(row["requests"] for row in results)
+            self.stdout.write(self.style.SUCCESS(f"✅ {total} request(s) in {elapsed:.1f}s ({total / elapsed:.2f}/s)"))
+
+            if options["json"]:
+                with open(options["json"], "w") as fh:
+                    json.dump({"elapsed_s": round(elapsed, 2), "endpoints": results}, fh, indent=2)
+
+        if options["cleanup"]:
+            self.stdout.write(f"🧹 Removed {remove_accounts()} load-test row(s)")
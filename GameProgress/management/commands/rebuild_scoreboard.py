@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+
+from GameProgress.services.scoreboard import rebuild_student_scores
+
+
+class Command(BaseCommand):
+    help = "Rebuild the materialized StudentScore scoreboard from all level and achievement progress"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--chunk-size", type=int, default=1000, help="Students recomputed per transaction")
+
+    def handle(self, *args, **options):
+        # ✅ Usage: python manage.py rebuild_scoreboard
+        # Run after bulk imports or manual SQL edits to LevelProgress / AchievementProgress
+        total = rebuild_student_scores(chunk_size=options["chunk_size"])
+        self.stdout.write(self.style.SUCCESS(f"✅ Rebuilt scoreboard for {total} student(s)"))
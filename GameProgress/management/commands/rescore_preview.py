@@ -0,0 +1,43 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from GameProgress.models import StudentScore
+from GameProgress.services.scoring import compile_thresholds, score_students
+
+
+def parse_thresholds(value):
+    """'90:100,60:70,30:40,1:10' → [(90, 100), (60, 70), (30, 40), (1, 10)]"""
+    try:
+        pairs = [item.split(":") for item in value.split(",") if item.strip()]
+        return sorted(((int(t), int(s)) for t, s in pairs), reverse=True)
+    except ValueError:
+        raise CommandError("Thresholds must look like 90:100,60:70,30:40,1:10")
+
+
+class Command(BaseCommand):
+    help = "Preview how student scores would change under different level score thresholds (read-only)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("thresholds", type=str, help="Comma-separated min_time:score pairs")
+        parser.add_argument("--top", type=int, default=10, help="Show the N biggest score changes")
+
+    def handle(self, *args, **options):
+        # ✅ Usage: python manage.py rescore_preview 90:100,60:70,30:40,1:10
+        # Nothing is written; StudentScore keeps the live thresholds
+        thresholds = parse_thresholds(options["thresholds"])
+        # Stars do not affect scores, so the preview table carries placeholder stars
+        table = compile_thresholds(thresholds, stars=[0] * len(thresholds))
+
+        proposed = score_students(table=table)
+        current = dict(StudentScore.objects.values_list("student_id", "score"))
+
+        deltas = sorted(
+            ((sid, current.get(sid, 0), proposed.get(sid, 0)) for sid in current.keys() | proposed.keys()),
+            key=lambda row: abs(row[2] - row[1]),
+            reverse=True,
+        )
+        changed = [row for row in deltas if row[1] != row[2]]
+
+        self.stdout.write(f"Students scored: {len(deltas)}, changed: {len(changed)}")
+        for sid, old, new in changed[:options["top"]]:
+            self.stdout.write(f"  student #{sid}: {old} → {new} ({new - old:+d})")
+        self.stdout.write(self.style.SUCCESS("✅ Preview complete (no data changed)"))
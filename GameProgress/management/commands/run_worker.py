@@ -0,0 +1,64 @@
+import signal
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from GameProgress.services.jobs import (
+    claim_job,
+    recover_stale_jobs,
+    run_job,
+    schedule_periodic_jobs,
+    worker_id,
+)
+
+MAINTENANCE_INTERVAL = 30  # seconds between periodic-job / stale-job checks
+
+
+class Command(BaseCommand):
+    help = "Run background jobs (progress syncs, scoreboard rebuilds, schedules, autosave flushes)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--poll", type=float, default=2, help="Seconds to sleep when the queue is empty")
+        parser.add_argument("--once", action="store_true", help="Run every due job, then exit")
+
+    def handle(self, *args, **options):
+        # ✅ Usage:
+        # Worker process:   python manage.py run_worker
+        # Drain and exit:   python manage.py run_worker --once
+        # Runs as the "worker" compose service; any number of workers can share the queue
+        # (jobs are claimed with SKIP LOCKED). SIGTERM lets the current job finish first.
+        self.stopping = False
+        signal.signal(signal.SIGTERM, self._stop)
+        signal.signal(signal.SIGINT, self._stop)
+
+        worker = worker_id()
+        self.stdout.write(f"🔹 Worker {worker} started")
+        done = failed = 0
+        next_maintenance = 0
+
+        while not self.stopping:
+            close_old_connections()
+            if time.monotonic() >= next_maintenance and not options["once"]:
+                schedule_periodic_jobs()
+                recovered = recover_stale_jobs()
+                if recovered:
+                    self.stdout.write(f"   requeued {recovered} job(s) of lost workers")
+                next_maintenance = time.monotonic() + MAINTENANCE_INTERVAL
+
+            job = claim_job(worker)
+            if job is None:
+                if options["once"]:
+                    break
+                time.sleep(options["poll"])
+                continue
+
+            start = time.perf_counter()
+            ok = run_job(job)
+            done, failed = done + ok, failed + (not ok)
+            self.stdout.write(f"   {'✅' if ok else '❌'} {job.name}{tuple(job.args)} in {time.perf_counter() - start:.2f}s")
+
+        self.stdout.write(self.style.SUCCESS(f"✅ Worker {worker} stopped ({done} done, {failed} failed)"))
+
+    def _stop(self, signum, frame):
+        self.stopping = True
@@ -1,6 +1,6 @@
 from django.core.management.base import BaseCommand
 
-from GameProgress.models.achievement_definition import AchievementDefinition
+from GameProgress.services.progress import add_achievement
 
 
 class Command(BaseCommand):
@@ -18,14 +18,7 @@ class Command(BaseCommand):
         for index, (title, description) in enumerate(titles_and_descs, start=1):
             code = f"ach_{index:03d}"  # ach_001, ach_002, etc.
 
-            # Removed the 'unlocked' field from the defaults dictionary
-            AchievementDefinition.objects.get_or_create(
-                code=code,
-                defaults={
-                    "title": title,
-                    "description": description,
-                    "is_active": True,  # Ensure 'is_active' is set to True (or leave it as default)
-                }
-            )
+            # 🔹 Created active; stamps + bumps the definitions version
+            add_achievement(code, title, description)
 
         self.stdout.write(self.style.SUCCESS("✅ Achievements seeded successfully."))
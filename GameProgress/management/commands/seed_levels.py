@@ -1,6 +1,6 @@
 from django.core.management.base import BaseCommand
 
-from GameProgress.models.level_definition import LevelDefinition
+from GameProgress.services.progress import add_level
 
 
 class Command(BaseCommand):
@@ -13,9 +13,6 @@ class Command(BaseCommand):
         level_names = ["Tutorial"] + [f"Level{i}" for i in range(1, 6)]  # Customize upper range
 
         for name in level_names:
-            LevelDefinition.objects.get_or_create(
-                name=name,
-                defaults={"unlocked": False}
-            )
+            add_level(name, unlocked=False)  # 🔹 stamps + bumps the definitions version
 
         self.stdout.write(self.style.SUCCESS("✅ Levels seeded: " + ", ".join(level_names)))
@@ -10,6 +10,7 @@ from GameProgress.models.achievement_definition import AchievementDefinition
 from GameProgress.models.achievement_progress import AchievementProgress
 from GameProgress.models.level_definition import LevelDefinition
 from GameProgress.models.level_progress import LevelProgress
+from GameProgress.services.scoreboard import refresh_student_scores
 from StudentManagementSystem.models import UserProfile
 from StudentManagementSystem.models.section import Section
 from StudentManagementSystem.models.student import Student
@@ -75,6 +76,8 @@ class Command(BaseCommand):
                 defaults={'unlocked': random.choice([True, False])}
             )
 
+        refresh_student_scores([student.id])
+
         return f"Created student {student_id}"
 
     def handle(self, *args, **options):
@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand
+
+from GameProgress.services.snapshots import (
+    SNAPSHOT_RETENTION_DAYS,
+    prune_ranking_snapshots,
+    take_ranking_snapshot,
+)
+
+
+class Command(BaseCommand):
+    help = "Store today's ranking snapshot (rank, section rank, score per student) and prune old ones"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--keep-days", type=int, default=SNAPSHOT_RETENTION_DAYS, help="Delete snapshots older than this"
+        )
+
+    def handle(self, *args, **options):
+        # ✅ Usage: python manage.py take_ranking_snapshot --keep-days 90
+        # The worker (run_worker) already does this once a day; use for cron or backfills
+        taken = take_ranking_snapshot()
+        pruned = prune_ranking_snapshots(options["keep_days"])
+        self.stdout.write(self.style.SUCCESS(f"✅ Snapshot rows: {taken}, pruned: {pruned}"))
@@ -0,0 +1,74 @@
+# Generated by Django 5.2.18 on 2026-10-18 14:21
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Case, Count, IntegerField, Q, Sum, Value, When
+
+# Snapshot of GameProgress.services.ranking.LEVEL_SCORE_THRESHOLDS at the time of this migration
+LEVEL_SCORE_THRESHOLDS = [(90, 100), (60, 70), (30, 40), (1, 10)]
+
+
+def backfill_student_scores(apps, schema_editor):
+    Student = apps.get_model('StudentManagementSystem', 'Student')
+    LevelProgress = apps.get_model('GameProgress', 'LevelProgress')
+    AchievementProgress = apps.get_model('GameProgress', 'AchievementProgress')
+    StudentScore = apps.get_model('GameProgress', 'StudentScore')
+
+    score_case = Case(
+        *[When(best_time__gte=t, then=Value(s)) for t, s in LEVEL_SCORE_THRESHOLDS],
+        default=Value(0),
+        output_field=IntegerField(),
+    )
+    levels = {
+        row['student_id']: row
+        for row in LevelProgress.objects.values('student_id').annotate(
+            level_score=Sum(score_case),
+            total_time=Sum('best_time'),
+            completed=Count('id', filter=Q(best_time__gt=0)),
+        )
+    }
+    achievements = {
+        row['student_id']: row['total']
+        for row in AchievementProgress.objects.filter(unlocked=True).values('student_id').annotate(total=Count('id'))
+    }
+
+    StudentScore.objects.bulk_create(
+        [
+            StudentScore(
+                student_id=student_id,
+                score=levels.get(student_id, {}).get('level_score') or 0,
+                total_time_remaining=levels.get(student_id, {}).get('total_time') or 0,
+                achievements_unlocked=achievements.get(student_id, 0),
+                levels_completed=levels.get(student_id, {}).get('completed') or 0,
+            )
+            for student_id in Student.objects.values_list('id', flat=True)
+        ],
+        batch_size=1000,
+        ignore_conflicts=True,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('GameProgress', '0002_initial'),
+        ('StudentManagementSystem', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StudentScore',
+            fields=[
+                ('student', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='score_summary', serialize=False, to='StudentManagementSystem.student')),
+                ('score', models.PositiveIntegerField(default=0)),
+                ('total_time_remaining', models.PositiveIntegerField(default=0)),
+                ('achievements_unlocked', models.PositiveIntegerField(default=0)),
+                ('levels_completed', models.PositiveIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['-score'], name='GameProgres_score_52b5b8_idx'), models.Index(fields=['-total_time_remaining', '-achievements_unlocked'], name='GameProgres_total_t_22758c_idx'), models.Index(fields=['-achievements_unlocked', '-total_time_remaining'], name='GameProgres_achieve_cbec3d_idx')],
+            },
+        ),
+        migrations.RunPython(backfill_student_scores, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 5.2.18 on 2026-10-18 14:24
+
+from django.db import migrations, models
+
+
+def create_progress_counter(apps, schema_editor):
+    VersionCounter = apps.get_model('GameProgress', 'VersionCounter')
+    VersionCounter.objects.get_or_create(name='progress', defaults={'value': 0})
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('GameProgress', '0003_studentscore'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='VersionCounter',
+            fields=[
+                ('name', models.CharField(max_length=50, primary_key=True, serialize=False)),
+                ('value', models.PositiveBigIntegerField(default=0)),
+            ],
+        ),
+        migrations.RunPython(create_progress_counter, migrations.RunPython.noop),
+    ]
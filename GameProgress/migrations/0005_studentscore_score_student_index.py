@@ -0,0 +1,22 @@
+# Generated by Django 5.2.18 on 2026-10-18 14:27
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('GameProgress', '0004_versioncounter'),
+        ('StudentManagementSystem', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='studentscore',
+            name='GameProgres_score_52b5b8_idx',
+        ),
+        migrations.AddIndex(
+            model_name='studentscore',
+            index=models.Index(fields=['-score', 'student'], name='GameProgres_score_024d69_idx'),
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 5.2.18 on 2026-10-18 14:29
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('GameProgress', '0005_studentscore_score_student_index'),
+        ('StudentManagementSystem', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RankingSnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('taken_on', models.DateField()),
+                ('rank', models.PositiveIntegerField()),
+                ('section_rank', models.PositiveIntegerField(blank=True, null=True)),
+                ('score', models.PositiveIntegerField(default=0)),
+                ('student', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='ranking_snapshots', to='StudentManagementSystem.student')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['taken_on'], name='GameProgres_taken_o_78b665_idx')],
+                'unique_together': {('student', 'taken_on')},
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 14:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('GameProgress', '0006_rankingsnapshot'),
+        ('StudentManagementSystem', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='levelprogress',
+            index=models.Index(fields=['level', '-best_time'], name='GameProgres_level_i_c2cdc1_idx'),
+        ),
+    ]
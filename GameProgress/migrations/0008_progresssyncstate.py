@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-18 14:33
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('GameProgress', '0007_levelprogress_level_best_time_index'),
+        ('StudentManagementSystem', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProgressSyncState',
+            fields=[
+                ('student', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='progress_sync', serialize=False, to='StudentManagementSystem.student')),
+                ('version', models.PositiveBigIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+    ]
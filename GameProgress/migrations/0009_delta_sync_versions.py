@@ -0,0 +1,61 @@
+# Generated by Django 5.2.18 on 2026-10-18 14:35
+
+from django.db import migrations, models
+
+PROGRESS_VERSION_SEQUENCE = 'gameprogress_progress_version_seq'
+
+
+def start_sequence_after_existing_versions(apps, schema_editor):
+    # Existing per-student versions were plain counters; continue above the highest one
+    ProgressSyncState = apps.get_model('GameProgress', 'ProgressSyncState')
+    highest = ProgressSyncState.objects.aggregate(v=models.Max('version'))['v'] or 0
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute(f"SELECT setval('{PROGRESS_VERSION_SEQUENCE}', %s)", [highest + 1])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('GameProgress', '0008_progresssyncstate'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='achievementdefinition',
+            name='version',
+            field=models.PositiveBigIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='achievementprogress',
+            name='version',
+            field=models.PositiveBigIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='leveldefinition',
+            name='version',
+            field=models.PositiveBigIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='levelprogress',
+            name='version',
+            field=models.PositiveBigIntegerField(default=0),
+        ),
+        migrations.CreateModel(
+            name='DefinitionTombstone',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('level', 'Level'), ('achievement', 'Achievement')], max_length=20)),
+                ('key', models.CharField(max_length=100)),
+                ('version', models.PositiveBigIntegerField()),
+                ('deleted_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['version'], name='GameProgres_version_4edab3_idx')],
+            },
+        ),
+        migrations.RunSQL(
+            f'CREATE SEQUENCE IF NOT EXISTS {PROGRESS_VERSION_SEQUENCE}',
+            f'DROP SEQUENCE IF EXISTS {PROGRESS_VERSION_SEQUENCE}',
+        ),
+        migrations.RunPython(start_sequence_after_existing_versions, migrations.RunPython.noop),
+    ]
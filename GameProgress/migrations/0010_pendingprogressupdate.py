@@ -0,0 +1,27 @@
+# Generated by Django 5.2.18 on 2026-10-18 14:43
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('GameProgress', '0009_delta_sync_versions'),
+        ('StudentManagementSystem', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PendingProgressUpdate',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('payload', models.JSONField()),
+                ('received_at', models.DateTimeField(auto_now_add=True)),
+                ('student', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='pending_progress_updates', to='StudentManagementSystem.student')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['student', 'id'], name='GameProgres_student_dc7e10_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-18 14:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('GameProgress', '0010_pendingprogressupdate'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='progresssyncstate',
+            name='last_save_key',
+            field=models.CharField(blank=True, db_default='', max_length=64),
+        ),
+        migrations.AddField(
+            model_name='progresssyncstate',
+            name='last_save_result',
+            field=models.JSONField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='progresssyncstate',
+            name='last_save_seq',
+            field=models.PositiveBigIntegerField(db_default=0),
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 5.2.18 on 2026-10-18 15:10
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('GameProgress', '0012_backgroundjob'),
+        ('StudentManagementSystem', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FailedProgressUpdate',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('payload', models.JSONField()),
+                ('error', models.TextField()),
+                ('received_at', models.DateTimeField()),
+                ('failed_at', models.DateTimeField(auto_now_add=True)),
+                ('student', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='failed_progress_updates', to='StudentManagementSystem.student')),
+            ],
+        ),
+    ]
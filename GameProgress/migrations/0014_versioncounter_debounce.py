@@ -0,0 +1,24 @@
+# Generated by Django 5.2.18 on 2026-10-18 15:28
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('GameProgress', '0013_failedprogressupdate'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='versioncounter',
+            name='bumped_at',
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+        migrations.AddField(
+            model_name='versioncounter',
+            name='pending',
+            field=models.BooleanField(default=False),
+        ),
+    ]
@@ -2,3 +2,11 @@ from .achievement_definition import AchievementDefinition
 from .achievement_progress import AchievementProgress
 from .level_definition import LevelDefinition
 from .level_progress import LevelProgress
+from .student_score import StudentScore
+from .version_counter import VersionCounter
+from .ranking_snapshot import RankingSnapshot
+from .progress_sync_state import ProgressSyncState
+from .definition_tombstone import DefinitionTombstone
+from .pending_progress_update import PendingProgressUpdate
+from .background_job import BackgroundJob
+from .failed_progress_update import FailedProgressUpdate
@@ -6,6 +6,7 @@ class AchievementDefinition(models.Model):
     title = models.CharField(max_length=200)
     description = models.TextField()
     is_active = models.BooleanField(default=True)  # ✅ This is the only control you need
+    version = models.PositiveBigIntegerField(default=0)  # definitions version of the last change (delta sync)
 
     class Meta:
         ordering = ["code"]
@@ -10,6 +10,7 @@ class AchievementProgress(models.Model):
     achievement = models.ForeignKey(AchievementDefinition, on_delete=models.CASCADE)
     unlocked = models.BooleanField(default=False)  # 🔹 whether student has obtained it
     is_active = models.BooleanField(default=True)  # 🔹 whether teacher allows it for this student
+    version = models.PositiveBigIntegerField(default=0)  # 🔹 progress version of the last change (delta sync)
 
     class Meta:
         unique_together = ('student', 'achievement')
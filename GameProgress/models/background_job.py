@@ -0,0 +1,44 @@
+from django.db import models
+from django.db.models import Q
+from django.utils.timezone import now
+
+
+# GameProgress/models/background_job.py
+class BackgroundJob(models.Model):
+    """
+    Durable background job, claimed by `run_worker` processes with SELECT ... FOR UPDATE SKIP LOCKED.
+    At most one QUEUED job exists per dedupe_key, so repeated requests for the same work coalesce.
+    """
+    QUEUED = "queued"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+    STATUS_CHOICES = [(QUEUED, "Queued"), (RUNNING, "Running"), (DONE, "Done"), (FAILED, "Failed")]
+
+    name = models.CharField(max_length=100)  # key of services.jobs.JOB_HANDLERS
+    args = models.JSONField(default=list)
+    dedupe_key = models.CharField(max_length=255)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=QUEUED)
+    run_at = models.DateTimeField(default=now)  # not claimed before this (scheduling / retry backoff)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    max_attempts = models.PositiveSmallIntegerField(default=3)
+    last_error = models.TextField(blank=True, default="")
+    locked_at = models.DateTimeField(null=True, blank=True)  # claimed, then refreshed by the worker's heartbeat
+    locked_by = models.CharField(max_length=100, blank=True, default="")  # worker host:pid
+    created_at = models.DateTimeField(auto_now_add=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["status", "run_at"]),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["dedupe_key"],
+                condition=Q(status="queued"),
+                name="background_job_one_queued_per_key",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.name} [{self.status}] #{self.id}"
@@ -0,0 +1,25 @@
+from django.db import models
+
+
+# GameProgress/models/definition_tombstone.py
+class DefinitionTombstone(models.Model):
+    """
+    Marker left behind when a level / achievement definition is deleted (or an achievement code renamed),
+    so delta syncs can tell clients to drop it.
+    """
+    LEVEL = "level"
+    ACHIEVEMENT = "achievement"
+    KIND_CHOICES = [(LEVEL, "Level"), (ACHIEVEMENT, "Achievement")]
+
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES)
+    key = models.CharField(max_length=100)  # LevelDefinition.name / AchievementDefinition.code
+    version = models.PositiveBigIntegerField()  # definitions version of the deletion
+    deleted_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["version"]),
+        ]
+
+    def __str__(self):
+        return f"{self.kind}:{self.key} (v{self.version})"
@@ -0,0 +1,20 @@
+from django.db import models
+
+from StudentManagementSystem.models.student import Student
+
+
+# GameProgress/models/failed_progress_update.py
+class FailedProgressUpdate(models.Model):
+    """
+    Dead letter of the write-behind buffer: a buffered save the flusher could not apply
+    (e.g. a value the database refuses). Moved out of PendingProgressUpdate so it never
+    blocks the other saves of its batch; kept with the error for inspection.
+    """
+    student = models.ForeignKey(Student, on_delete=models.CASCADE, related_name="failed_progress_updates")
+    payload = models.JSONField()  # same shape as PendingProgressUpdate.payload
+    error = models.TextField()
+    received_at = models.DateTimeField()  # when the save was buffered
+    failed_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"{self.student_id} @ {self.received_at} (failed)"
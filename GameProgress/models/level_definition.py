@@ -5,6 +5,7 @@ class LevelDefinition(models.Model):
     name = models.CharField(max_length=100, unique=True)
     unlocked = models.BooleanField(default=False)
     sort_order = models.IntegerField(default=999)
+    version = models.PositiveBigIntegerField(default=0)  # definitions version of the last change (delta sync)
 
     class Meta:
         ordering = ["sort_order"]
@@ -11,10 +11,12 @@ class LevelProgress(models.Model):
     best_time = models.PositiveIntegerField(default=0)
     current_time = models.PositiveIntegerField(default=0)
     unlocked = models.BooleanField(default=False)  # 🔹 per-student unlock status
+    version = models.PositiveBigIntegerField(default=0)  # 🔹 progress version of the last change (delta sync)
 
     class Meta:
         unique_together = ('student', 'level')
         indexes = [
             models.Index(fields=["student"]),
             models.Index(fields=["best_time"]),
+            models.Index(fields=["level", "-best_time"]),  # per-level leaderboards (top-N range scan)
         ]
@@ -0,0 +1,24 @@
+from django.db import models
+
+from StudentManagementSystem.models.student import Student
+
+
+# GameProgress/models/pending_progress_update.py
+class PendingProgressUpdate(models.Model):
+    """
+    Append-only write-behind buffer for game autosaves (PROGRESS_WRITE_BEHIND).
+    Rows hold an already validated payload and are deleted by the flusher in the same
+    transaction that applies them, so an accepted autosave is never lost.
+    """
+    student = models.ForeignKey(Student, on_delete=models.CASCADE, related_name="pending_progress_updates")
+    # {"levels": [[name, current_time, best_time, unlocked | null], ...], "achievements": [code, ...]}
+    payload = models.JSONField()
+    received_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["student", "id"]),
+        ]
+
+    def __str__(self):
+        return f"{self.student_id} @ {self.received_at}"
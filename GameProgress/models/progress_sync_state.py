@@ -0,0 +1,28 @@
+from django.db import models
+
+from StudentManagementSystem.models.student import Student
+
+
+# GameProgress/models/progress_sync_state.py
+class ProgressSyncState(models.Model):
+    """
+    Per-student sync bookkeeping for the game API.
+    `version` is bumped by every write to the student's LevelProgress / AchievementProgress,
+    so clients can revalidate their save document without it being rebuilt.
+    `last_save_*` remember the newest client save applied (sequence number / idempotency key),
+    so retried and out-of-order uploads are dropped before any progress row is read.
+    """
+    student = models.OneToOneField(
+        Student,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="progress_sync",
+    )
+    version = models.PositiveBigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+    last_save_seq = models.PositiveBigIntegerField(db_default=0)
+    last_save_key = models.CharField(max_length=64, blank=True, db_default="")
+    last_save_result = models.JSONField(null=True, blank=True)  # response of that save, replayed to retries
+
+    def __str__(self):
+        return f"{self.student_id}: v{self.version}"
@@ -0,0 +1,25 @@
+from django.db import models
+
+from StudentManagementSystem.models.student import Student
+
+
+# GameProgress/models/ranking_snapshot.py
+class RankingSnapshot(models.Model):
+    """
+    One row per student per day: their global rank, section rank and score at snapshot time.
+    Written in bulk by the daily snapshot job; read for rank deltas and trend lines.
+    """
+    student = models.ForeignKey(Student, on_delete=models.CASCADE, related_name="ranking_snapshots")
+    taken_on = models.DateField()
+    rank = models.PositiveIntegerField()
+    section_rank = models.PositiveIntegerField(null=True, blank=True)
+    score = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        unique_together = ("student", "taken_on")
+        indexes = [
+            models.Index(fields=["taken_on"]),  # retention pruning / "latest snapshot" lookups
+        ]
+
+    def __str__(self):
+        return f"{self.student_id} @ {self.taken_on}: #{self.rank}"
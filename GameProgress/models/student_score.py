@@ -0,0 +1,33 @@
+from django.db import models
+
+from StudentManagementSystem.models.student import Student
+
+
+# GameProgress/models/student_score.py
+class StudentScore(models.Model):
+    """
+    Materialized scoreboard row (one per student).
+    Kept current by the progress write paths so rankings never re-aggregate
+    the whole LevelProgress / AchievementProgress history.
+    """
+    student = models.OneToOneField(
+        Student,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="score_summary",
+    )
+    score = models.PositiveIntegerField(default=0)
+    total_time_remaining = models.PositiveIntegerField(default=0)
+    achievements_unlocked = models.PositiveIntegerField(default=0)
+    levels_completed = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["-score", "student"]),  # rank counts + neighbour windows
+            models.Index(fields=["-total_time_remaining", "-achievements_unlocked"]),
+            models.Index(fields=["-achievements_unlocked", "-total_time_remaining"]),
+        ]
+
+    def __str__(self):
+        return f"{self.student_id}: {self.score}"
@@ -0,0 +1,52 @@
+from datetime import timedelta
+
+from django.db import models, transaction
+from django.db.models import F
+from django.utils.timezone import now
+
+
+class VersionCounter(models.Model):
+    """
+    Named, monotonically increasing counters shared by every worker.
+    Used as cache-busting versions (e.g. rankings are cached per "progress" version).
+    """
+    PROGRESS = "progress"  # any student's score changed
+    DEFINITIONS = "definitions"  # LevelDefinition / AchievementDefinition changed
+
+    name = models.CharField(max_length=50, primary_key=True)
+    value = models.PositiveBigIntegerField(default=0)
+    # Debounced counters (mark_changed / settle): a change waiting for its bump, and when the last bump happened
+    pending = models.BooleanField(default=False)
+    bumped_at = models.DateTimeField(default=now)
+
+    def __str__(self):
+        return f"{self.name}={self.value}"
+
+    @classmethod
+    def current(cls, name):
+        """Return the current value of a counter (0 if it was never bumped)."""
+        return cls.objects.filter(name=name).values_list("value", flat=True).first() or 0
+
+    @classmethod
+    def bump(cls, name):
+        """Atomically increment a counter and return its new value."""
+        with transaction.atomic():
+            if not cls.objects.filter(name=name).update(value=F("value") + 1, pending=False, bumped_at=now()):
+                cls.objects.get_or_create(name=name, defaults={"value": 1})
+            return cls.objects.filter(name=name).values_list("value", flat=True).get()
+
+    @classmethod
+    def mark_changed(cls, name):
+        """
+        Record a change without bumping (see settle). Only the first change since the last
+        bump writes the row; later ones match nothing, so busy writers never queue on it.
+        """
+        if not cls.objects.filter(name=name, pending=False).update(pending=True):
+            cls.objects.get_or_create(name=name, defaults={"pending": True})
+
+    @classmethod
+    def settle(cls, name, interval):
+        """Bump a counter with a pending change, at most once every `interval` seconds."""
+        cls.objects.filter(name=name, pending=True, bumped_at__lte=now() - timedelta(seconds=interval)).update(
+            value=F("value") + 1, pending=False, bumped_at=now(),
+        )
@@ -0,0 +1,107 @@
+import threading
+from dataclasses import dataclass
+from types import MappingProxyType
+
+from django.db import connection
+
+from GameProgress.models import LevelDefinition, AchievementDefinition
+from GameProgress.services.progress_versions import get_definitions_version
+
+
+# ============================================================
+# 🔹 IMMUTABLE SNAPSHOTS
+# ============================================================
+
+@dataclass(frozen=True)
+class LevelDef:
+    id: int
+    name: str
+    unlocked: bool
+    sort_order: int
+    version: int
+
+
+@dataclass(frozen=True)
+class AchievementDef:
+    id: int
+    code: str
+    title: str
+    description: str
+    is_active: bool
+    version: int
+
+
+@dataclass(frozen=True)
+class DefinitionsSnapshot:
+    """
+    Every LevelDefinition (by sort_order) and AchievementDefinition (by code) as of one
+    definitions version. Shared by all threads of a worker, so it is never mutated.
+    """
+    version: int
+    levels: tuple
+    achievements: tuple
+    levels_by_name: MappingProxyType
+    achievements_by_code: MappingProxyType
+
+    @property
+    def active_achievements(self):
+        return tuple(ach for ach in self.achievements if ach.is_active)
+
+    @classmethod
+    def load(cls, version):
+        levels = tuple(
+            LevelDef(*row) for row in LevelDefinition.objects.order_by("sort_order", "id").values_list(
+                "id", "name", "unlocked", "sort_order", "version"
+            )
+        )
+        achievements = tuple(
+            AchievementDef(*row) for row in AchievementDefinition.objects.order_by("code").values_list(
+                "id", "code", "title", "description", "is_active", "version"
+            )
+        )
+        return cls(
+            version=version,
+            levels=levels,
+            achievements=achievements,
+            levels_by_name=MappingProxyType({level.name: level for level in levels}),
+            achievements_by_code=MappingProxyType({ach.code: ach for ach in achievements}),
+        )
+
+
+# ============================================================
+# 🔹 PER-WORKER REGISTRY
+# ============================================================
+# Every definitions change bumps VersionCounter "definitions" (see progress_versions),
+# so checking that one row is enough to notice edits made by any other worker.
+
+_snapshot = None
+_lock = threading.Lock()
+
+
+def get_definitions(version=None):
+    """
+    Current DefinitionsSnapshot. Costs one primary-key lookup of the version row, or no
+    query at all when the caller already read the definitions version (e.g. for an ETag).
+    """
+    global _snapshot
+    if version is None:
+        version = get_definitions_version()
+
+    snapshot = _snapshot
+    if snapshot is not None and snapshot.version == version:
+        return snapshot
+
+    with _lock:
+        if _snapshot is not None and _snapshot.version == version:
+            return _snapshot
+        snapshot = DefinitionsSnapshot.load(version)
+        # 🔹 Never keep what an open transaction can see: it may still roll back
+        if not connection.in_atomic_block:
+            _snapshot = snapshot
+        return snapshot
+
+
+def clear_definitions_cache():
+    """Drop this worker's snapshot (the next get_definitions() reloads)."""
+    global _snapshot
+    _snapshot = None
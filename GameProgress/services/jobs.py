@@ -0,0 +1,191 @@
+import json
+import logging
+import os
+import socket
+import threading
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import IntegrityError, connection, transaction
+from django.utils.module_loading import import_string
+from django.utils.timezone import now
+
+from GameProgress.models import BackgroundJob
+
+logger = logging.getLogger(__name__)
+
+# Job name → handler (dotted path, imported by the worker when the job runs)
+JOB_HANDLERS = {
+    "sync_all_progress": "GameProgress.services.progress.sync_all_students_with_all_progress",
+    "sync_student_progress": "GameProgress.services.progress.sync_student_progress",
+    "sync_level_progress": "GameProgress.services.progress.sync_level_progress",
+    "sync_achievement_progress": "GameProgress.services.progress.sync_achievement_progress",
+    "rebuild_scoreboard": "GameProgress.services.scoreboard.rebuild_student_scores",
+    "auto_update_lock_states": "GameProgress.cron.update_lock_unlock_states.auto_update_lock_states_cron",
+    "ranking_snapshot": "GameProgress.cron.update_lock_unlock_states.ranking_snapshot_cron",
+    "flush_progress_buffer": "GameProgress.cron.flush_progress_buffer.flush_progress_buffer_cron",
+    "prune_jobs": "GameProgress.services.jobs.prune_finished_jobs",
+}
+
+RETRY_BASE_DELAY = 10  # seconds before the first retry; doubles on every further attempt
+HEARTBEAT_INTERVAL = 30  # seconds between locked_at refreshes while a job runs
+STALE_AFTER = timedelta(minutes=2)  # a RUNNING job without heartbeat this long lost its worker (crash / kill -9)
+KEEP_FINISHED = timedelta(days=1)  # DONE / FAILED rows kept for inspection
+
+
+def periodic_jobs():
+    """[(job name, interval seconds), ...] kept scheduled by the workers (the old background loops)."""
+    jobs = [
+        ("auto_update_lock_states", 60),
+        ("ranking_snapshot", 60),
+        ("prune_jobs", 60 * 60),
+    ]
+    if settings.PROGRESS_WRITE_BEHIND:
+        jobs.append(("flush_progress_buffer", settings.PROGRESS_FLUSH_INTERVAL))
+    return jobs
+
+
+def worker_id():
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+# ============================================================
+# 🔹 ENQUEUE
+# ============================================================
+
+def enqueue_job(name, *args, dedupe_key=None, delay=0, max_attempts=3, unless_running=False):
+    """
+    Queue `name(*args)` for the worker. Returns the new job id, or None when an identical job
+    (same dedupe_key, by default name + args) is already queued: ten registrations → one sync.
+    `unless_running` also skips while one runs (used to keep periodic jobs to one instance).
+    """
+    if name not in JOB_HANDLERS:
+        raise ValueError(f"Unknown job: {name}")
+    encoded_args = json.dumps(list(args))
+    dedupe_key = dedupe_key or f"{name}:{encoded_args}"
+    table = BackgroundJob._meta.db_table
+    statuses = [BackgroundJob.QUEUED, BackgroundJob.RUNNING] if unless_running else [BackgroundJob.QUEUED]
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'INSERT INTO "{table}" (name, args, dedupe_key, status, run_at, attempts, max_attempts, '
+            f"last_error, locked_by, created_at) "
+            f"SELECT %s, %s::jsonb, %s, %s, NOW() + %s * INTERVAL '1 second', 0, %s, '', '', NOW() "
+            f'WHERE NOT EXISTS (SELECT 1 FROM "{table}" WHERE dedupe_key = %s AND status = ANY(%s)) '
+            f"ON CONFLICT (dedupe_key) WHERE status = %s DO NOTHING "
+            f"RETURNING id",
+            [name, encoded_args, dedupe_key, BackgroundJob.QUEUED, delay, max_attempts,
+             dedupe_key, statuses, BackgroundJob.QUEUED],
+        )
+        row = cursor.fetchone()
+    return row[0] if row else None
+
+
+def schedule_periodic_jobs():
+    """Make sure every periodic job has a queued or running instance (idempotent, cheap)."""
+    for name, interval in periodic_jobs():
+        enqueue_job(name, delay=interval, max_attempts=1, unless_running=True)
+
+
+# ============================================================
+# 🔹 CLAIM / RUN
+# ============================================================
+
+def claim_job(worker=None):
+    """Take the next due job (SKIP LOCKED: workers never wait on each other). Returns it or None."""
+    table = BackgroundJob._meta.db_table
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'UPDATE "{table}" SET status = %s, attempts = attempts + 1, locked_at = NOW(), locked_by = %s '
+            f'WHERE id = (SELECT id FROM "{table}" WHERE status = %s AND run_at <= NOW() '
+            f"ORDER BY run_at, id FOR UPDATE SKIP LOCKED LIMIT 1) "
+            f"RETURNING id",
+            [BackgroundJob.RUNNING, worker or worker_id(), BackgroundJob.QUEUED],
+        )
+        row = cursor.fetchone()
+    return BackgroundJob.objects.get(pk=row[0]) if row else None
+
+
+def _requeue(job, error, delay):
+    """Put a failed job back in the queue, or fail it when an identical job is already queued."""
+    try:
+        with transaction.atomic():
+            BackgroundJob.objects.filter(pk=job.pk).update(
+                status=BackgroundJob.QUEUED, run_at=now() + timedelta(seconds=delay),
+                last_error=error, locked_at=None,
+            )
+    except IntegrityError:
+        BackgroundJob.objects.filter(pk=job.pk).update(
+            status=BackgroundJob.FAILED, finished_at=now(), last_error=f"{error}\n(retry coalesced into queued job)",
+        )
+
+
+def _heartbeat(job_id, stop):
+    """Refresh locked_at every HEARTBEAT_INTERVAL until `stop` is set (own thread, own connection)."""
+    try:
+        while not stop.wait(HEARTBEAT_INTERVAL):
+            try:
+                BackgroundJob.objects.filter(pk=job_id, status=BackgroundJob.RUNNING).update(locked_at=now())
+            except Exception as e:
+                logger.warning(f"[JOBS] Heartbeat of job #{job_id} failed: {e}")
+    finally:
+        connection.close()
+
+
+def run_job(job):
+    """
+    Run a claimed job; retries with exponential backoff until max_attempts. Returns True on success.
+    A heartbeat keeps locked_at fresh meanwhile, so only jobs of dead workers ever look stale.
+    """
+    stop = threading.Event()
+    heartbeat = threading.Thread(target=_heartbeat, args=(job.pk, stop), daemon=True)
+    heartbeat.start()
+    try:
+        import_string(JOB_HANDLERS[job.name])(*job.args)
+    except Exception as e:
+        error = f"{type(e).__name__}: {e}"
+        if job.attempts < job.max_attempts:
+            logger.warning(f"[JOBS] {job} failed (attempt {job.attempts}/{job.max_attempts}), retrying: {error}")
+            _requeue(job, error, RETRY_BASE_DELAY * 2 ** (job.attempts - 1))
+        else:
+            logger.error(f"[JOBS] {job} failed for good: {error}")
+            BackgroundJob.objects.filter(pk=job.pk).update(
+                status=BackgroundJob.FAILED, finished_at=now(), last_error=error,
+            )
+        return False
+    finally:
+        stop.set()
+        heartbeat.join()
+        # 🔹 Periodic jobs schedule their own next run, whatever happened to this one
+        interval = dict(periodic_jobs()).get(job.name)
+        if interval is not None:
+            enqueue_job(job.name, delay=interval, max_attempts=1)
+
+    BackgroundJob.objects.filter(pk=job.pk).update(status=BackgroundJob.DONE, finished_at=now(), locked_at=None)
+    return True
+
+
+# ============================================================
+# 🔹 MAINTENANCE
+# ============================================================
+
+def recover_stale_jobs():
+    """Requeue RUNNING jobs whose worker died (no heartbeat for STALE_AFTER). Returns how many."""
+    recovered = 0
+    for job in BackgroundJob.objects.filter(status=BackgroundJob.RUNNING, locked_at__lt=now() - STALE_AFTER):
+        if job.attempts < job.max_attempts:
+            _requeue(job, "worker lost", 0)
+        else:
+            BackgroundJob.objects.filter(pk=job.pk).update(
+                status=BackgroundJob.FAILED, finished_at=now(), last_error="worker lost",
+            )
+        recovered += 1
+    return recovered
+
+
+def prune_finished_jobs():
+    """Delete DONE / FAILED jobs older than KEEP_FINISHED. Returns rows deleted."""
+    deleted, _ = BackgroundJob.objects.filter(
+        status__in=[BackgroundJob.DONE, BackgroundJob.FAILED], finished_at__lt=now() - KEEP_FINISHED,
+    ).delete()
+    return deleted
@@ -0,0 +1,68 @@
+from GameProgress.models import LevelDefinition, LevelProgress
+from GameProgress.services.ranking import section_filter_q
+from GameProgress.services.scoring import default_table
+
+MAX_LEADERBOARD_SIZE = 100
+
+# Column order of the compact API rows
+LEADERBOARD_FIELDS = ["rank", "student_id", "name", "section", "best_time", "score", "stars"]
+
+
+# ============================================================
+# 🔹 PER-LEVEL LEADERBOARD
+# ============================================================
+
+def get_level_leaderboard(level_name, limit=10, filter_by=None, department_filter=None):
+    """
+    Best times (most time remaining) for one level, optionally within a section
+    ("2B" / "CS2B") and/or department. Served by ORDER BY best_time DESC LIMIT N
+    on the (level, -best_time) index. Returns None when the level does not exist.
+    """
+    level = LevelDefinition.objects.filter(name=level_name).only("id", "name").first()
+    if level is None:
+        return None
+
+    limit = max(1, min(int(limit), MAX_LEADERBOARD_SIZE))
+    entries = list(
+        LevelProgress.objects.filter(level=level, best_time__gt=0)
+        .filter(section_filter_q(filter_by, department_filter, prefix="student__"))
+        .select_related("student__section__department", "student__section__year_level")
+        .only(
+            "best_time",
+            "student__student_id",
+            "student__first_name",
+            "student__last_name",
+            "student__section__letter",
+            "student__section__department__name",
+            "student__section__year_level__year",
+        )
+        .order_by("-best_time", "student_id")[:limit]
+    )
+    scores, stars = default_table().score_and_stars([e.best_time for e in entries])
+
+    rows = []
+    rank = previous = None
+    for position, (entry, score, star_count) in enumerate(zip(entries, scores.tolist(), stars.tolist()), start=1):
+        if entry.best_time != previous:
+            rank, previous = position, entry.best_time
+        student = entry.student
+        rows.append({
+            "rank": rank,
+            "student_id": student.student_id,
+            "name": f"{student.first_name} {student.last_name}",
+            "section": student.full_section,
+            "best_time": entry.best_time,
+            "score": score,
+            "stars": star_count,
+        })
+
+    return {"level": level.name, "entries": rows}
+
+
+def compact_leaderboard(leaderboard):
+    """Unity payload: one header row plus positional rows instead of repeated keys."""
+    return {
+        "level": leaderboard["level"],
+        "fields": LEADERBOARD_FIELDS,
+        "rows": [[row[f] for f in LEADERBOARD_FIELDS] for row in leaderboard["entries"]],
+    }
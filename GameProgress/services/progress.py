@@ -1,4 +1,5 @@
-from django.db import transaction
+from django.db import connection, transaction
+from django.db.models.expressions import RawSQL
 from django.shortcuts import get_object_or_404
 
 from GameProgress.models import (
@@ -6,50 +7,148 @@ from GameProgress.models import (
     AchievementDefinition,
     LevelProgress,
     AchievementProgress,
+    ProgressSyncState,
 )
 from GameProgress.models.level_schedule import SectionLevelSchedule
+from GameProgress.services.progress_versions import (
+    bump_student_versions,
+    claim_progress_version,
+    student_subquery,
+    touch_definitions,
+)
+from GameProgress.services.scoreboard import ensure_student_scores, reset_student_scores
 from StudentManagementSystem.models.student import Student
 
+MISSING_STUDENTS_TABLE = "sync_missing_students"  # per-transaction temp table (ON COMMIT DROP)
+
 
 # ============================================================
 # 🔹 GLOBAL SYNCHRONIZATION
 # ============================================================
 
+def _definition_subquery(model, ids):
+    """SQL + params selecting definition ids (all of them when `ids` is None)."""
+    if ids is None:
+        return f'SELECT id FROM "{model._meta.db_table}"', []
+    return f'SELECT id FROM "{model._meta.db_table}" WHERE id = ANY(%s)', [list(ids)]
+
+
+def _missing_students(model, definition_model, definition_field, students, ids):
+    """SQL + params selecting students lacking at least one `model` row for the definitions (none when `ids` is [])."""
+    if ids is not None and not ids:
+        return "SELECT NULL::bigint AS id WHERE FALSE", []
+
+    student_sql, student_params = student_subquery(students)
+    definition_sql, definition_params = _definition_subquery(definition_model, ids)
+    return (
+        f"SELECT s.id FROM ({student_sql}) s WHERE EXISTS (SELECT 1 FROM ({definition_sql}) d "
+        f'WHERE NOT EXISTS (SELECT 1 FROM "{model._meta.db_table}" p '
+        f"WHERE p.student_id = s.id AND p.{definition_field} = d.id))",
+        [*student_params, *definition_params],
+    )
+
+
+def _insert_missing(name, model, definition_model, definition_field, defaults, students, ids, version):
+    """
+    `name AS (INSERT ... SELECT students × definitions ... ON CONFLICT DO NOTHING RETURNING student_id)`
+    CTE + params; an empty CTE when `ids` is [].
+    """
+    if ids is not None and not ids:
+        return f"{name} AS (SELECT NULL::bigint AS student_id WHERE FALSE)", []
+
+    student_sql, student_params = student_subquery(students)
+    definition_sql, definition_params = _definition_subquery(definition_model, ids)
+    columns = ", ".join(f'"{column}"' for column in defaults)
+    values = ", ".join(["%s"] * len(defaults))
+    return (
+        f'{name} AS (INSERT INTO "{model._meta.db_table}" (student_id, {definition_field}, {columns}, version) '
+        f"SELECT s.id, d.id, {values}, %s FROM ({student_sql}) s CROSS JOIN ({definition_sql}) d "
+        f"ON CONFLICT (student_id, {definition_field}) DO NOTHING RETURNING student_id)",
+        [*defaults.values(), version, *student_params, *definition_params],
+    )
+
+
+def materialize_progress_rows(students=None, levels=None, achievements=None):
+    """
+    Create the missing LevelProgress / AchievementProgress rows for students × definitions
+    with INSERT ... SELECT ... CROSS JOIN ... ON CONFLICT DO NOTHING, entirely in PostgreSQL
+    (constant memory whatever the cohort size).
+    `students`: queryset / id list / None (→ everyone); `levels`, `achievements`: definition ids,
+    None (→ all) or [] (→ none). Returns (LevelProgress created, AchievementProgress created).
+    """
+    level_sql, level_params = _missing_students(LevelProgress, LevelDefinition, "level_id", students, levels)
+    achievement_sql, achievement_params = _missing_students(
+        AchievementProgress, AchievementDefinition, "achievement_id", students, achievements,
+    )
+    with transaction.atomic():
+        # 🔹 The students missing rows stay in PostgreSQL (a temp table the lock, the version claim
+        # and both inserts join), and only they are locked, before the version is taken
+        # (see progress_versions); nothing missing → no lock, no version, autosaves never wait on a no-op sync
+        with connection.cursor() as cursor:
+            cursor.execute(f"DROP TABLE IF EXISTS {MISSING_STUDENTS_TABLE}")
+            cursor.execute(f"CREATE TEMP TABLE {MISSING_STUDENTS_TABLE} (id bigint PRIMARY KEY) ON COMMIT DROP")
+            cursor.execute(
+                f"INSERT INTO {MISSING_STUDENTS_TABLE} (id) {level_sql} UNION {achievement_sql}",
+                [*level_params, *achievement_params],
+            )
+            if not cursor.rowcount:
+                return 0, 0
+            cursor.execute(f"ANALYZE {MISSING_STUDENTS_TABLE}")
+        students = Student.objects.filter(id__in=RawSQL(f"SELECT id FROM {MISSING_STUDENTS_TABLE}", []))
+        version = claim_progress_version(students)
+        level_cte, level_params = _insert_missing(
+            "lvl", LevelProgress, LevelDefinition, "level_id",
+            {"best_time": 0, "current_time": 0, "unlocked": False}, students, levels, version,
+        )
+        achievement_cte, achievement_params = _insert_missing(
+            "ach", AchievementProgress, AchievementDefinition, "achievement_id",
+            {"unlocked": False, "is_active": True}, students, achievements, version,
+        )
+        sync_table = ProgressSyncState._meta.db_table
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"WITH {level_cte}, {achievement_cte}, "
+                f"touched AS (SELECT student_id FROM lvl UNION SELECT student_id FROM ach), "
+                f'bumped AS (UPDATE "{sync_table}" AS st SET version = GREATEST(st.version, %s), updated_at = NOW() '
+                f"FROM touched WHERE st.student_id = touched.student_id) "
+                f"SELECT (SELECT COUNT(*) FROM lvl), (SELECT COUNT(*) FROM ach)",
+                [*level_params, *achievement_params, version],
+            )
+            return cursor.fetchone()
+
+
 def sync_all_students_with_all_progress():
     """
     Ensure every student has progress rows for all Level and Achievement definitions.
-    Creates any missing LevelProgress / AchievementProgress records.
+    Creates any missing LevelProgress / AchievementProgress records (and StudentScore rows).
+    Returns (LevelProgress created, AchievementProgress created).
     """
-    students = list(Student.objects.values_list("id", flat=True))
-    levels = list(LevelDefinition.objects.values_list("id", flat=True))
-    achievements = list(AchievementDefinition.objects.values_list("id", flat=True))
+    new_levels, new_achievements = materialize_progress_rows()
+    ensure_student_scores()
+    print(f"✅ Sync completed! ({new_levels} new LevelProgress, {new_achievements} new AchievementProgress)")
+    return new_levels, new_achievements
 
-    existing_levels = set(LevelProgress.objects.values_list("student_id", "level_id"))
-    existing_achievements = set(AchievementProgress.objects.values_list("student_id", "achievement_id"))
 
-    new_level_progress = []
-    new_achievement_progress = []
+# ============================================================
+# 🔹 SCOPED SYNCHRONIZATION (one event → only the rows it needs)
+# ============================================================
 
-    for student_id in students:
-        for level_id in levels:
-            if (student_id, level_id) not in existing_levels:
-                new_level_progress.append(
-                    LevelProgress(student_id=student_id, level_id=level_id)
-                )
+def sync_student_progress(student_ids):
+    """New student(s): rows for every definition and a scoreboard row, for these students only."""
+    student_ids = list(student_ids)
+    created = materialize_progress_rows(student_ids)
+    ensure_student_scores(student_ids)
+    return created
 
-        for achievement_id in achievements:
-            if (student_id, achievement_id) not in existing_achievements:
-                new_achievement_progress.append(
-                    AchievementProgress(student_id=student_id, achievement_id=achievement_id)
-                )
 
-    with transaction.atomic():
-        if new_level_progress:
-            LevelProgress.objects.bulk_create(new_level_progress, batch_size=1000, ignore_conflicts=True)
-        if new_achievement_progress:
-            AchievementProgress.objects.bulk_create(new_achievement_progress, batch_size=1000, ignore_conflicts=True)
+def sync_level_progress(level_id):
+    """New level: one LevelProgress row per student, no achievement rows."""
+    return materialize_progress_rows(levels=[level_id], achievements=[])
+
 
-    print(f"✅ Sync completed! ({len(new_level_progress)} new LevelProgress, {len(new_achievement_progress)} new AchievementProgress)")
+def sync_achievement_progress(achievement_id):
+    """New achievement: one AchievementProgress row per student, no level rows."""
+    return materialize_progress_rows(levels=[], achievements=[achievement_id])
 
 
 # ============================================================
@@ -60,7 +159,9 @@ def add_level(name: str, unlocked: bool = False):
     """
     Create or retrieve a LevelDefinition globally.
     """
-    level, _ = LevelDefinition.objects.get_or_create(name=name, defaults={"unlocked": unlocked})
+    level, created = LevelDefinition.objects.get_or_create(name=name, defaults={"unlocked": unlocked})
+    if created:
+        touch_definitions(LevelDefinition.objects.filter(pk=level.pk))
     return level
 
 
@@ -69,8 +170,8 @@ def lock_level(level_name: str):
     Globally lock a single level.
     """
     level = get_object_or_404(LevelDefinition, name=level_name)
+    touch_definitions(LevelDefinition.objects.filter(pk=level.pk), unlocked=False)
     level.unlocked = False
-    level.save(update_fields=["unlocked"])
     return level
 
 
@@ -79,20 +180,20 @@ def unlock_level(level_name: str):
     Globally unlock a single level.
     """
     level = get_object_or_404(LevelDefinition, name=level_name)
+    touch_definitions(LevelDefinition.objects.filter(pk=level.pk), unlocked=True)
     level.unlocked = True
-    level.save(update_fields=["unlocked"])
     return level
 
 
 def lock_all_levels():
     """Globally lock ALL levels."""
-    LevelDefinition.objects.update(unlocked=False)
+    touch_definitions(LevelDefinition.objects.all(), unlocked=False)
     print("🔒 All levels globally locked.")
 
 
 def unlock_all_levels():
     """Globally unlock ALL levels."""
-    LevelDefinition.objects.update(unlocked=True)
+    touch_definitions(LevelDefinition.objects.all(), unlocked=True)
     print("🔓 All levels globally unlocked.")
 
 
@@ -104,10 +205,12 @@ def add_achievement(code: str, title: str, description: str):
     """
     Create or retrieve an AchievementDefinition globally.
     """
-    ach, _ = AchievementDefinition.objects.get_or_create(
+    ach, created = AchievementDefinition.objects.get_or_create(
         code=code,
         defaults={"title": title, "description": description, "is_active": True},
     )
+    if created:
+        touch_definitions(AchievementDefinition.objects.filter(pk=ach.pk))
     return ach
 
 
@@ -116,20 +219,20 @@ def set_achievement_active(code: str, active: bool = True):
     Globally set whether an AchievementDefinition is active (unlockable).
     """
     ach = get_object_or_404(AchievementDefinition, code=code)
+    touch_definitions(AchievementDefinition.objects.filter(pk=ach.pk), is_active=active)
     ach.is_active = active
-    ach.save(update_fields=["is_active"])
     return ach
 
 
 def enable_all_achievements():
     """Globally mark all achievements as active."""
-    AchievementDefinition.objects.update(is_active=True)
+    touch_definitions(AchievementDefinition.objects.all(), is_active=True)
     print("🏆 All achievements globally enabled.")
 
 
 def disable_all_achievements():
     """Globally disable all achievements."""
-    AchievementDefinition.objects.update(is_active=False)
+    touch_definitions(AchievementDefinition.objects.all(), is_active=False)
     print("🚫 All achievements globally disabled.")
 
 
@@ -144,17 +247,21 @@ def reset_all_progress():
     ✅ Source of Truth Reset:
     - Locks all LevelDefinition entries globally.
     - Resets all per-student LevelProgress and AchievementProgress.
+    - Zeroes the materialized StudentScore scoreboard.
     - Deletes all SectionLevelSchedule entries (so cron can't re-unlock old levels).
     - Ensures all teacher and cron schedules are wiped clean.
     """
     sync_all_students_with_all_progress()
     with transaction.atomic():
         # 1️⃣ Lock all global levels
-        LevelDefinition.objects.update(unlocked=False)
+        touch_definitions(LevelDefinition.objects.all(), unlocked=False)
 
         # 2️⃣ Reset per-student progress
-        LevelProgress.objects.update(best_time=0, current_time=0, unlocked=False)
-        AchievementProgress.objects.update(unlocked=False, is_active=True)
+        version = claim_progress_version()
+        LevelProgress.objects.update(best_time=0, current_time=0, unlocked=False, version=version)
+        AchievementProgress.objects.update(unlocked=False, is_active=True, version=version)
+        reset_student_scores()
+        bump_student_versions(version=version)
 
         # 3️⃣ 🚨 Remove all active schedules so no background cron can alter state afterward
         deleted_count, _ = SectionLevelSchedule.objects.all().delete()
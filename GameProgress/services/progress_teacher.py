@@ -2,78 +2,83 @@ from django.db import transaction
 
 from GameProgress.models import (
     LevelDefinition,
-    AchievementDefinition,
     AchievementProgress
 )
+from GameProgress.services.progress import materialize_progress_rows
+from GameProgress.services.progress_versions import (
+    bump_student_versions,
+    claim_progress_version,
+    update_progress_rows,
+)
+from GameProgress.services.ranking_cache import bump_progress_version
+from GameProgress.services.scoreboard import ensure_student_scores, reset_student_scores
 
 
 def sync_students_progress(student_qs):
-    """Sync only the given students with all level & achievement definitions."""
-    student_ids = list(student_qs.values_list("id", flat=True))
-    levels = list(LevelDefinition.objects.values_list("id", flat=True))
-    achievements = list(AchievementDefinition.objects.values_list("id", flat=True))
-
-    existing_levels = set(LevelProgress.objects.values_list("student_id", "level_id"))
-    existing_achievements = set(AchievementProgress.objects.values_list("student_id", "achievement_id"))
-
-    new_level_progress = []
-    new_achievement_progress = []
-
-    for student_id in student_ids:
-        for level_id in levels:
-            if (student_id, level_id) not in existing_levels:
-                new_level_progress.append(
-                    LevelProgress(student_id=student_id, level_id=level_id, best_time=0, current_time=0, unlocked=False)
-                )
-        for achievement_id in achievements:
-            if (student_id, achievement_id) not in existing_achievements:
-                new_achievement_progress.append(
-                    AchievementProgress(student_id=student_id, achievement_id=achievement_id, unlocked=False,
-                                        is_active=True)
-                )
-
-    with transaction.atomic():
-        LevelProgress.objects.bulk_create(new_level_progress, batch_size=1000, ignore_conflicts=True)
-        AchievementProgress.objects.bulk_create(new_achievement_progress, batch_size=1000, ignore_conflicts=True)
+    """
+    Sync only the given students with all level & achievement definitions (set-based, in SQL),
+    and give each of them a scoreboard row. Returns (LevelProgress created, AchievementProgress created).
+    """
+    created = materialize_progress_rows(student_qs)
+    ensure_student_scores(student_qs.values_list("id", flat=True))
+    return created
 
 
 def unlock_levels_for_students(student_qs, level_name=None):
     qs = LevelProgress.objects.filter(student__in=student_qs)
     if level_name:
         qs = qs.filter(level__name=level_name)
-    qs.update(unlocked=True)
+    with transaction.atomic():
+        update_progress_rows(qs, student_qs, unlocked=True)
+    bump_progress_version()
 
 
 def lock_levels_for_students(student_qs, level_name=None):
     qs = LevelProgress.objects.filter(student__in=student_qs)
     if level_name:
         qs = qs.filter(level__name=level_name)
-    qs.update(unlocked=False)
+    with transaction.atomic():
+        update_progress_rows(qs, student_qs, unlocked=False)
+    bump_progress_version()
 
 
 def reset_progress_for_students(student_qs):
-    LevelProgress.objects.filter(student__in=student_qs).update(best_time=0, current_time=0, unlocked=False)
-    AchievementProgress.objects.filter(student__in=student_qs).update(unlocked=False, is_active=True)
+    with transaction.atomic():
+        version = claim_progress_version(student_qs)
+        LevelProgress.objects.filter(student__in=student_qs).update(
+            best_time=0, current_time=0, unlocked=False, version=version
+        )
+        AchievementProgress.objects.filter(student__in=student_qs).update(unlocked=False, is_active=True, version=version)
+        reset_student_scores(student_qs.values_list("id", flat=True))
+        bump_student_versions(student_qs, version)
 
 
 def set_achievement_active_for_students(student_qs, achievement_code, active=True):
-    AchievementProgress.objects.filter(
-        student__in=student_qs,
-        achievement__code=achievement_code
-    ).update(is_active=active)
+    with transaction.atomic():
+        update_progress_rows(
+            AchievementProgress.objects.filter(student__in=student_qs, achievement__code=achievement_code),
+            student_qs,
+            is_active=active,
+        )
+    bump_progress_version()
 
 
 def enable_all_achievements_for_students(student_qs):
-    AchievementProgress.objects.filter(student__in=student_qs).update(is_active=True)
+    with transaction.atomic():
+        update_progress_rows(AchievementProgress.objects.filter(student__in=student_qs), student_qs, is_active=True)
+    bump_progress_version()
 
 
 def disable_all_achievements_for_students(student_qs):
-    AchievementProgress.objects.filter(student__in=student_qs).update(is_active=False)
+    with transaction.atomic():
+        update_progress_rows(AchievementProgress.objects.filter(student__in=student_qs), student_qs, is_active=False)
+    bump_progress_version()
 
 
 from django.utils.timezone import now
 from GameProgress.models.level_schedule import SectionLevelSchedule
 from GameProgress.models.level_progress import LevelProgress
+from StudentManagementSystem.models.student import Student
 
 
 def auto_update_lock_states(student_qs):
@@ -90,19 +95,21 @@ def auto_update_lock_states(student_qs):
 
         # 🔓 Unlock students in this section if start_date passed
         if sched.start_date and sched.start_date <= current_time:
-            updated = LevelProgress.objects.filter(
-                student__section_id=sched.section_id,
-                level_id=sched.level_id
-            ).update(unlocked=True)
+            updated = update_progress_rows(
+                LevelProgress.objects.filter(student__section_id=sched.section_id, level_id=sched.level_id),
+                Student.objects.filter(section_id=sched.section_id),
+                unlocked=True,
+            )
             # if updated:
             # print(f"   🔓 Unlocked {updated} rows", flush=True)
 
         # 🔒 Lock students if due_date passed
         if sched.due_date and sched.due_date <= current_time:
-            updated = LevelProgress.objects.filter(
-                student__section_id=sched.section_id,
-                level_id=sched.level_id
-            ).update(unlocked=False)
+            updated = update_progress_rows(
+                LevelProgress.objects.filter(student__section_id=sched.section_id, level_id=sched.level_id),
+                Student.objects.filter(section_id=sched.section_id),
+                unlocked=False,
+            )
             # if updated:
             #     print(f"   🔒 Locked {updated} rows", flush=True)
 
@@ -123,10 +130,11 @@ def unlock_level_with_schedule(student_qs, level_name, section, start_date=None,
 
     with transaction.atomic():
         # 🔓 Unlock for students
-        LevelProgress.objects.filter(
-            student__in=student_qs,
-            level=level
-        ).update(unlocked=True)
+        update_progress_rows(
+            LevelProgress.objects.filter(student__in=student_qs, level=level),
+            student_qs,
+            unlocked=True,
+        )
 
         # 📅 Create or update schedule entry
         sched, created = SectionLevelSchedule.objects.get_or_create(
@@ -143,4 +151,5 @@ def unlock_level_with_schedule(student_qs, level_name, section, start_date=None,
                 sched.due_date = due_date
             sched.save()
 
+    bump_progress_version()
     return True, f"Level '{level_name}' unlocked for section {section} with schedule applied."
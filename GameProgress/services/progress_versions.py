@@ -0,0 +1,171 @@
+from django.db import connection, transaction
+
+from GameProgress.models import ProgressSyncState, VersionCounter, DefinitionTombstone
+from StudentManagementSystem.models import Student
+
+PROGRESS_VERSION_SEQUENCE = "gameprogress_progress_version_seq"
+
+
+# ============================================================
+# 🔹 PER-STUDENT PROGRESS VERSIONS
+# ============================================================
+# Progress versions come from one PostgreSQL sequence: every write takes a fresh value,
+# stamps it on the progress rows it changes and raises the students' ProgressSyncState
+# to it. Versions only grow, so "rows with version > N" is exactly "changed since N".
+# Writers lock the students' ProgressSyncState rows BEFORE taking a version, so two
+# writes to the same student commit in version order and a delta reader never skips one.
+
+def next_progress_version():
+    """Allocate a new progress version (nextval is lock-free across concurrent writers)."""
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT nextval(%s)", [PROGRESS_VERSION_SEQUENCE])
+        return cursor.fetchone()[0]
+
+
+def student_subquery(students):
+    """SQL + params selecting the ids of a queryset / id list / None (→ everyone)."""
+    if students is None:
+        student_qs = Student.objects.all()
+    elif hasattr(students, "query"):
+        student_qs = students if students.model is Student else Student.objects.filter(id__in=students)
+    else:
+        student_qs = Student.objects.filter(id__in=list(students))
+    return student_qs.values("id").query.sql_with_params()
+
+
+def _upsert_sync_state(students, version, on_conflict):
+    """One INSERT ... SELECT ... ON CONFLICT over the students' ProgressSyncState rows (ordered by id)."""
+    subquery, params = student_subquery(students)
+    table = ProgressSyncState._meta.db_table
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'INSERT INTO "{table}" (student_id, version, updated_at) '
+            f"SELECT s.id, %s, NOW() FROM ({subquery}) s ORDER BY s.id "
+            f"ON CONFLICT (student_id) DO UPDATE SET {on_conflict.format(table=table)}",
+            [version, *params],
+        )
+
+
+def claim_progress_version(students=None):
+    """
+    Lock the students' sync-state rows (creating missing ones), then allocate a version.
+    Call inside the transaction that changes the progress rows.
+    """
+    _upsert_sync_state(students, 0, 'updated_at = "{table}".updated_at')
+    return next_progress_version()
+
+
+def bump_student_versions(students=None, version=None):
+    """
+    Raise the progress version of the given students (queryset, id list, or None → everyone)
+    to `version` (claimed when omitted). Returns the version.
+    Call inside the transaction that changes the progress rows.
+    """
+    version = version or claim_progress_version(students)
+    _upsert_sync_state(
+        students, version,
+        'version = GREATEST("{table}".version, EXCLUDED.version), updated_at = NOW()',
+    )
+    return version
+
+
+def update_progress_rows(queryset, students, **changes):
+    """
+    queryset.update(**changes) on LevelProgress / AchievementProgress rows, stamping them
+    with a new progress version and bumping `students` to it. Returns rows updated.
+    """
+    with transaction.atomic():
+        version = claim_progress_version(students)
+        updated = queryset.update(version=version, **changes)
+        if updated:
+            bump_student_versions(students, version)
+    return updated
+
+
+def get_student_version(student_id):
+    return (
+        ProgressSyncState.objects.filter(student_id=student_id)
+        .values_list("version", flat=True)
+        .first()
+    ) or 0
+
+
+# ============================================================
+# 🔹 DEFINITIONS VERSION
+# ============================================================
+
+def bump_definitions_version():
+    """Increment the global definitions version (levels / achievements added, edited, locked or deleted)."""
+    return VersionCounter.bump(VersionCounter.DEFINITIONS)
+
+
+def touch_definitions(queryset, **changes):
+    """queryset.update(**changes) on LevelDefinition / AchievementDefinition, stamped with a new definitions version."""
+    with transaction.atomic():  # 🔹 counter row stays locked until the stamped rows commit
+        return queryset.update(version=bump_definitions_version(), **changes)
+
+
+def tombstone_definition(kind, key):
+    """Record that a definition disappeared (deleted, or an achievement code renamed)."""
+    with transaction.atomic():
+        return DefinitionTombstone.objects.create(kind=kind, key=key, version=bump_definitions_version())
+
+
+def get_definitions_version():
+    return VersionCounter.current(VersionCounter.DEFINITIONS)
+
+
+# ============================================================
+# 🔹 ETAG / SYNC TOKEN
+# ============================================================
+
+def get_progress_versions(student_id):
+    """(student version, definitions version), read together in one query."""
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'SELECT (SELECT version FROM "{ProgressSyncState._meta.db_table}" WHERE student_id = %s), '
+            f'(SELECT value FROM "{VersionCounter._meta.db_table}" WHERE name = %s)',
+            [student_id, VersionCounter.DEFINITIONS],
+        )
+        student_version, definitions_version = cursor.fetchone()
+    return student_version or 0, definitions_version or 0
+
+
+def get_progress_versions_many(student_ids):
+    """({student_id: student version}, definitions version) for a batch, in one query."""
+    student_ids = list(student_ids)
+    if not student_ids:
+        return {}, get_definitions_version()
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"SELECT s.id, COALESCE(p.version, 0), "
+            f'(SELECT value FROM "{VersionCounter._meta.db_table}" WHERE name = %s) '
+            f"FROM unnest(%s::bigint[]) AS s(id) "
+            f'LEFT JOIN "{ProgressSyncState._meta.db_table}" AS p ON p.student_id = s.id',
+            [VersionCounter.DEFINITIONS, student_ids],
+        )
+        rows = cursor.fetchall()
+    return {student_id: version for student_id, version, _ in rows}, rows[0][2] or 0
+
+
+def format_sync_token(student_version, definitions_version):
+    """"<student version>.<definitions version>" — the ETag value and the `since` token."""
+    return f"{student_version}.{definitions_version}"
+
+
+def parse_sync_token(token):
+    """
+    Inverse of format_sync_token(); also takes a progress ETag (quoted, with its
+    ";<representation>" suffix). Raises ValueError on malformed tokens.
+    """
+    token = token.strip().removeprefix("W/").strip('"').split(";")[0]
+    student_version, definitions_version = token.split(".")
+    return int(student_version), int(definitions_version)
+
+
+def get_progress_etag(student_id):
+    """
+    Strong ETag for a student's save document: "<student version>.<definitions version>".
+    The progress tables are not touched.
+    """
+    return f'"{format_sync_token(*get_progress_versions(student_id))}"'
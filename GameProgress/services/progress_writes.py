@@ -0,0 +1,428 @@
+import json
+import logging
+
+from django.db import DataError, IntegrityError, connection, transaction
+
+from GameProgress.models import (
+    LevelDefinition,
+    LevelProgress,
+    AchievementDefinition,
+    AchievementProgress,
+    FailedProgressUpdate,
+    PendingProgressUpdate,
+    ProgressSyncState,
+)
+from GameProgress.services.progress_versions import bump_student_versions, claim_progress_version
+from GameProgress.services.scoreboard import refresh_student_scores
+
+logger = logging.getLogger(__name__)
+
+MAX_PROGRESS_TIME = 2147483647  # 🔹 PositiveIntegerField upper bound (best_time / current_time)
+
+
+# ============================================================
+# 🔹 PAYLOAD PARSING
+# ============================================================
+
+def parse_level_rows(levels):
+    """
+    [(name, current_time, best_time, unlocked | None), ...] from the Unity "levels" value.
+    Negative times are skipped, times past MAX_PROGRESS_TIME raise ValueError;
+    a missing "unlocked" keeps the stored flag.
+    """
+    rows = []
+    for name, values in levels.items():
+        current = int(values.get("currentTime", 0))
+        best = int(values.get("bestTime", 0))
+        if current > MAX_PROGRESS_TIME or best > MAX_PROGRESS_TIME:
+            raise ValueError(f"{name}: time out of range (max {MAX_PROGRESS_TIME})")
+        if current < 0 or best < 0:
+            continue
+        unlocked = values.get("unlocked")
+        rows.append((name, current, best, None if unlocked is None else bool(unlocked)))
+    return rows
+
+
+def parse_unlocked_achievements(achievements):
+    """Codes the client reports as unlocked (achievements are never re-locked by the game)."""
+    return [code for code, values in achievements.items() if values.get("unlocked", False)]
+
+
+# ============================================================
+# 🔹 SET-BASED WRITES
+# ============================================================
+
+def _update_levels(cursor, rows, version):
+    """
+    One UPDATE ... FROM (VALUES ...) for every (student, level) in the payloads:
+    best_time only ever grows (GREATEST), and rows that would not change are left alone.
+    Returns the student_id of every updated row.
+    """
+    if not rows:
+        return []
+    lp, ld = LevelProgress._meta.db_table, LevelDefinition._meta.db_table
+    values = ", ".join(["(%s::bigint, %s::varchar, %s::integer, %s::integer, %s::boolean)"] * len(rows))
+    cursor.execute(
+        f'UPDATE "{lp}" AS lp SET '
+        f'"current_time" = v.current_secs, '
+        f"best_time = GREATEST(lp.best_time, v.best_secs), "
+        f"unlocked = COALESCE(v.unlocked, lp.unlocked), "
+        f"version = %s "
+        f"FROM (VALUES {values}) AS v(student_id, name, current_secs, best_secs, unlocked) "
+        f'JOIN "{ld}" AS ld ON ld.name = v.name '
+        f"WHERE lp.student_id = v.student_id AND lp.level_id = ld.id "
+        f'AND (lp."current_time" <> v.current_secs '
+        f"OR lp.best_time < v.best_secs "
+        f"OR lp.unlocked <> COALESCE(v.unlocked, lp.unlocked)) "
+        f"RETURNING lp.student_id",
+        [version, *(value for row in rows for value in row)],
+    )
+    return [student_id for (student_id,) in cursor.fetchall()]
+
+
+def _unlock_achievements(cursor, rows, version):
+    """
+    One UPDATE for every newly unlocked, globally active (student, achievement) in the payloads.
+    Returns the student_id of every updated row.
+    """
+    if not rows:
+        return []
+    ap, ad = AchievementProgress._meta.db_table, AchievementDefinition._meta.db_table
+    values = ", ".join(["(%s::bigint, %s::varchar)"] * len(rows))
+    cursor.execute(
+        f'UPDATE "{ap}" AS ap SET unlocked = TRUE, version = %s '
+        f"FROM (VALUES {values}) AS v(student_id, code) "
+        f'JOIN "{ad}" AS ad ON ad.code = v.code '
+        f"WHERE ap.student_id = v.student_id AND ap.achievement_id = ad.id "
+        f"AND ad.is_active AND NOT ap.unlocked "
+        f"RETURNING ap.student_id",
+        [version, *(value for row in rows for value in row)],
+    )
+    return [student_id for (student_id,) in cursor.fetchall()]
+
+
+def apply_progress_rows(student_ids, level_rows, achievement_rows):
+    """
+    Apply parsed rows ((student_id, name, current, best, unlocked) / (student_id, code)) for
+    `student_ids` in one transaction: one UPDATE per table, without reading anything back first.
+    Returns {student pk: {"levels": rows updated, "achievements": rows updated}}.
+    """
+    results = {student_id: {"levels": 0, "achievements": 0} for student_id in student_ids}
+    if not level_rows and not achievement_rows:
+        return results
+
+    with transaction.atomic():
+        version = claim_progress_version(list(results))
+        with connection.cursor() as cursor:
+            for student_id in _update_levels(cursor, level_rows, version):
+                results[student_id]["levels"] += 1
+            for student_id in _unlock_achievements(cursor, achievement_rows, version):
+                results[student_id]["achievements"] += 1
+
+        changed = [student_id for student_id, counts in results.items() if counts["levels"] or counts["achievements"]]
+        if changed:
+            refresh_student_scores(changed, debounce=True)  # 🔹 autosaves: rankings catch up in batches
+            bump_student_versions(changed, version)
+
+    return results
+
+
+def apply_progress_payloads(payloads):
+    """
+    Write Unity save payloads for many students ({student pk: payload}) in one transaction.
+    Existing rows only (nothing is created); unknown levels / achievements are ignored.
+    Returns {student pk: {"levels": rows updated, "achievements": rows updated}}.
+    """
+    level_rows, achievement_rows = [], []
+    for student_id, data in payloads.items():
+        level_rows += [(student_id, *row) for row in parse_level_rows(data.get("levels", {}).get("value", {}))]
+        achievement_rows += [
+            (student_id, code)
+            for code in parse_unlocked_achievements(data.get("achievements", {}).get("value", {}))
+        ]
+    return apply_progress_rows(list(payloads), level_rows, achievement_rows)
+
+
+def apply_progress_payload(student_id, data):
+    """Single-student apply_progress_payloads(). Returns {"levels": n, "achievements": n}."""
+    return apply_progress_payloads({student_id: data})[student_id]
+
+
+# ============================================================
+# 🔹 SAVE SEQUENCES / IDEMPOTENCY KEYS
+# ============================================================
+# Clients may number their saves (monotonic `seq`) and/or tag them with an idempotency key.
+# ProgressSyncState keeps the newest one applied per student: rejected_save() drops retries
+# with one primary-key read, claim_save() re-checks under the row lock inside the write.
+
+MAX_IDEMPOTENCY_KEY_LENGTH = 64
+MAX_SAVE_SEQ = 9223372036854775807  # 🔹 ProgressSyncState.last_save_seq (PositiveBigIntegerField)
+
+
+def parse_save_identity(seq=None, key=None):
+    """(seq as int or None, stripped key) of a save; raises ValueError when malformed."""
+    key = str(key or "").strip()
+    if seq is not None and seq != "":
+        seq = int(seq)
+        if not 0 <= seq <= MAX_SAVE_SEQ:
+            raise ValueError(f"seq must be between 0 and {MAX_SAVE_SEQ}")
+    else:
+        seq = None
+    if len(key) > MAX_IDEMPOTENCY_KEY_LENGTH:
+        raise ValueError(f"Idempotency-Key longer than {MAX_IDEMPOTENCY_KEY_LENGTH} characters")
+    return seq, key
+
+
+def rejected_save(student_id, seq=None, key=""):
+    """
+    Response document for a save that must not be applied, else None:
+    "duplicate" (already applied; carries its original result) or "stale" (older than the last one).
+    """
+    if seq is None and not key:
+        return None
+    state = (
+        ProgressSyncState.objects.filter(student_id=student_id)
+        .values_list("last_save_seq", "last_save_key", "last_save_result")
+        .first()
+    )
+    if state is None:
+        return None
+
+    last_seq, last_key, last_result = state
+    if seq is not None:
+        if seq > last_seq:
+            return None
+        status = "duplicate" if seq == last_seq and (not key or key == last_key) else "stale"
+    elif key == last_key:
+        status = "duplicate"
+    else:
+        return None
+
+    rejected = {"status": status, "applied_seq": last_seq}
+    if status == "duplicate":
+        rejected["result"] = last_result
+    return rejected
+
+
+def claim_save(student_id, seq=None, key=""):
+    """
+    Record (seq, key) as the student's newest save unless an equal or newer one is already recorded.
+    Locks the student's ProgressSyncState row; call inside the transaction that applies the save.
+    """
+    table = ProgressSyncState._meta.db_table
+    if seq is not None:
+        newer = f'"{table}".last_save_seq < EXCLUDED.last_save_seq'
+    else:
+        newer = f'"{table}".last_save_key <> EXCLUDED.last_save_key'
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'INSERT INTO "{table}" (student_id, version, updated_at, last_save_seq, last_save_key) '
+            f"VALUES (%s, 0, NOW(), %s, %s) "
+            f"ON CONFLICT (student_id) DO UPDATE SET "
+            f'last_save_seq = GREATEST("{table}".last_save_seq, EXCLUDED.last_save_seq), '
+            f"last_save_key = EXCLUDED.last_save_key, last_save_result = NULL "
+            f"WHERE {newer} "
+            f"RETURNING student_id",
+            [student_id, seq or 0, key],
+        )
+        return cursor.fetchone() is not None
+
+
+def save_progress_payload(student_id, data, seq=None, key="", buffered=False):
+    """
+    Apply (or, with `buffered`, queue) one client save at most once per (seq, key).
+    Returns the response document: {"status": "updated", "updated": {...}} / {"status": "queued"},
+    with "applied_seq" when numbered, or the rejected_save() document for retries.
+    """
+    if seq is None and not key:
+        return _save(student_id, data, buffered)
+
+    with transaction.atomic():
+        if not claim_save(student_id, seq, key):
+            return rejected_save(student_id, seq, key)
+        result = _save(student_id, data, buffered)
+        if seq is not None:
+            result["applied_seq"] = seq
+        ProgressSyncState.objects.filter(student_id=student_id).update(last_save_result=result)
+    return result
+
+
+def save_progress_payloads(saves, buffered=False):
+    """
+    save_progress_payload() for many students in one transaction (lab gateways).
+    `saves`: [(student_id, data, seq, key), ...], one per student. Buffered saves go through
+    the write-behind buffer like single saves; direct ones first flush what the students
+    still have buffered, so an older buffered save never lands on top of a newer one.
+    Returns {student pk: response document}.
+    """
+    saves = sorted(saves, key=lambda save: save[0])  # 🔹 sync-state rows locked in id order
+    results, accepted = {}, {}
+    with transaction.atomic():
+        if not buffered:
+            flush_student_progress([student_id for student_id, *_ in saves])
+        for student_id, data, seq, key in saves:
+            if (seq is not None or key) and not claim_save(student_id, seq, key):
+                results[student_id] = rejected_save(student_id, seq, key)
+            else:
+                accepted[student_id] = (data, seq, key)
+
+        if buffered:
+            for student_id, (data, _, _) in accepted.items():
+                buffer_progress_payload(student_id, data)
+                results[student_id] = {"status": "queued"}
+        else:
+            updated = apply_progress_payloads({student_id: data for student_id, (data, _, _) in accepted.items()})
+            for student_id in accepted:
+                results[student_id] = {"status": "updated", "updated": updated[student_id]}
+
+        for student_id, (_, seq, key) in accepted.items():
+            if seq is not None:
+                results[student_id]["applied_seq"] = seq
+            if seq is not None or key:
+                ProgressSyncState.objects.filter(student_id=student_id).update(last_save_result=results[student_id])
+    return results
+
+
+def _save(student_id, data, buffered):
+    if buffered:
+        buffer_progress_payload(student_id, data)
+        return {"status": "queued"}
+    return {"status": "updated", "updated": apply_progress_payload(student_id, data)}
+
+
+# ============================================================
+# 🔹 WRITE-BEHIND BUFFER (PROGRESS_WRITE_BEHIND)
+# ============================================================
+# Autosaves are validated and appended to PendingProgressUpdate; flush_pending_progress()
+# later folds every buffered save of a student into one row per level and applies the
+# whole batch with apply_progress_rows(). Background flushes are serialized by a global
+# advisory lock; reads flush only their own students (flush_student_progress) under a
+# per-student lock. Both take buffered rows with FOR UPDATE in id order, so a save is
+# applied by exactly one of them and saves of a student are always applied in arrival order.
+# When a batch fails on bad data, its saves are retried one by one and the failing ones
+# are moved to FailedProgressUpdate (dead letter) instead of blocking the buffer.
+
+FLUSH_LOCK_KEY = 0x7468696E6B  # pg advisory lock id ("think")
+STUDENT_FLUSH_LOCK_SPACE = 0x7468  # first key of the per-student pg_advisory_xact_lock(int, int)
+FLUSH_BATCH_SIZE = 5000  # buffered saves per flush transaction
+# Errors caused by the saved data itself: retrying them can never succeed
+BAD_SAVE_ERRORS = (DataError, IntegrityError, KeyError, TypeError, ValueError)
+
+
+def buffer_progress_payload(student_id, data):
+    """Validate a save payload and append it to the write-behind buffer."""
+    PendingProgressUpdate.objects.create(
+        student_id=student_id,
+        payload={
+            "levels": parse_level_rows(data.get("levels", {}).get("value", {})),
+            "achievements": parse_unlocked_achievements(data.get("achievements", {}).get("value", {})),
+        },
+    )
+
+
+def coalesce_pending(updates):
+    """
+    Fold buffered saves [(student_id, payload), ...] (oldest first) into apply_progress_rows() input:
+    max best_time, latest current_time, latest explicit unlocked flag, union of unlocked achievements.
+    """
+    levels, achievements = {}, set()
+    for student_id, payload in updates:
+        for name, current, best, unlocked in payload["levels"]:
+            previous = levels.get((student_id, name))
+            if previous:
+                best = max(best, previous[1])
+                unlocked = previous[2] if unlocked is None else unlocked
+            levels[(student_id, name)] = (current, best, unlocked)
+        achievements.update((student_id, code) for code in payload["achievements"])
+
+    level_rows = [(student_id, name, *values) for (student_id, name), values in levels.items()]
+    return level_rows, sorted(achievements)
+
+
+def _apply_pending(rows):
+    """Apply buffered saves [(id, student_id, payload, received_at), ...] (oldest first) in one go."""
+    updates = [(student_id, payload) for _, student_id, payload, _ in rows]
+    level_rows, achievement_rows = coalesce_pending(updates)
+    apply_progress_rows({student_id for student_id, _ in updates}, level_rows, achievement_rows)
+
+
+def _take_pending(cursor, where, params, limit=None):
+    """Delete and return buffered saves [(id, student_id, payload, received_at), ...], oldest first."""
+    table = PendingProgressUpdate._meta.db_table
+    cursor.execute(
+        f'DELETE FROM "{table}" WHERE id IN '
+        f'(SELECT id FROM "{table}" {where}ORDER BY id LIMIT %s FOR UPDATE) '
+        f"RETURNING id, student_id, payload, received_at",
+        [*params, limit],
+    )
+    return [
+        (pk, student_id, payload if isinstance(payload, dict) else json.loads(payload), received_at)
+        for pk, student_id, payload, received_at in sorted(cursor.fetchall())
+    ]
+
+
+def _apply_taken(rows):
+    """Apply taken saves in one go; on bad data, one savepoint per save and dead-letter the failures."""
+    try:
+        with transaction.atomic():
+            _apply_pending(rows)
+    except BAD_SAVE_ERRORS:
+        # 🔹 Isolate the bad save(s): one savepoint per save, in arrival order
+        for row in rows:
+            try:
+                with transaction.atomic():
+                    _apply_pending([row])
+            except BAD_SAVE_ERRORS as e:
+                _, student_id, payload, received_at = row
+                logger.error(f"[PROGRESS FLUSH] Buffered save of student {student_id} failed: {e}")
+                FailedProgressUpdate.objects.create(
+                    student_id=student_id, payload=payload, error=f"{type(e).__name__}: {e}".strip(),
+                    received_at=received_at,
+                )
+
+
+def flush_pending_progress(limit=FLUSH_BATCH_SIZE, wait=False):
+    """
+    Apply (and remove) up to `limit` buffered saves, oldest first (the background flusher).
+    Without `wait`, returns 0 straight away when another flush is running.
+    Saves that cannot be applied are moved to FailedProgressUpdate.
+    Returns the number of buffered saves taken off the buffer.
+    """
+    with transaction.atomic():
+        with connection.cursor() as cursor:
+            if wait:
+                cursor.execute("SELECT pg_advisory_xact_lock(%s)", [FLUSH_LOCK_KEY])
+            else:
+                cursor.execute("SELECT pg_try_advisory_xact_lock(%s)", [FLUSH_LOCK_KEY])
+                if not cursor.fetchone()[0]:
+                    return 0
+            rows = _take_pending(cursor, "", [], limit)
+        if rows:
+            _apply_taken(rows)
+    return len(rows)
+
+
+def flush_student_progress(student_ids):
+    """
+    Read-your-writes for progress reads: apply every buffered save of these students now.
+    One indexed EXISTS-style lookup when nothing is buffered (the usual case); otherwise
+    per-student advisory locks, never the global flush lock. Returns saves applied.
+    """
+    pending = sorted(
+        PendingProgressUpdate.objects.filter(student_id__in=list(student_ids))
+        .values_list("student_id", flat=True).distinct()
+    )
+    if not pending:
+        return 0
+
+    with transaction.atomic():
+        with connection.cursor() as cursor:
+            for student_id in pending:  # 🔹 id order: concurrent readers never deadlock
+                cursor.execute(
+                    "SELECT pg_advisory_xact_lock(%s, %s)",
+                    [STUDENT_FLUSH_LOCK_SPACE, student_id % 2147483647],
+                )
+            rows = _take_pending(cursor, "WHERE student_id = ANY(%s) ", [pending])
+        if rows:
+            _apply_taken(rows)
+    return len(rows)
@@ -2,36 +2,27 @@ import re
 
 from django.db import models
 from django.db.models import (
-    Sum, Count, Case, When, Value, IntegerField
+    Max, Avg, Count, Case, When, Value, IntegerField, FloatField, CharField, F, Q, Window
 )
+from django.db.models.functions import Coalesce, Concat, Cast, Rank, RowNumber
 
-from GameProgress.models import LevelProgress, AchievementProgress
+from GameProgress.models import LevelProgress, AchievementProgress, StudentScore
+from GameProgress.services.scoring import LEVEL_SCORE_THRESHOLDS, LEVEL_STARS, score_levels
 from StudentManagementSystem.models import Student
 
-LEVEL_SCORE_THRESHOLDS = [
-    (90, 100),
-    (60, 70),
-    (30, 40),
-    (1, 10),
-]
-
 
 def calc_level_stars(best_time: int) -> int:
-    """Stars are derived from the score value using thresholds (reuse)."""
+    """Stars for a single level (vectorized: scoring.stars_levels)."""
     score = calc_level_score(best_time)
 
-    for threshold, s in LEVEL_SCORE_THRESHOLDS:
+    for (threshold, s), stars in zip(LEVEL_SCORE_THRESHOLDS, LEVEL_STARS):
         if score == s:
-            # map position in the list to stars
-            # top entry in list → 3 stars, then 2, then 2, then 1
-            idx = LEVEL_SCORE_THRESHOLDS.index((threshold, s))
-            stars_map = {0: 3, 1: 2, 2: 2, 3: 1}
-            return stars_map[idx]
+            return stars
     return 0
 
 
 def calc_level_score(best_time: int) -> int:
-    """Python-side scoring for a single level."""
+    """Python-side scoring for a single level (vectorized: scoring.score_levels)."""
     if best_time is None:
         return 0
     for threshold, score in LEVEL_SCORE_THRESHOLDS:
@@ -40,12 +31,6 @@ def calc_level_score(best_time: int) -> int:
     return 0
 
 
-def level_score_case(field="best_time"):
-    """Reusable ORM scoring expression."""
-    whens = [When(**{f"{field}__gte": t}, then=Value(s)) for t, s in LEVEL_SCORE_THRESHOLDS]
-    return Case(*whens, default=Value(0), output_field=IntegerField())
-
-
 # --------------------------
 # Student performance (single)
 # --------------------------
@@ -57,13 +42,9 @@ def get_student_performance(student):
         .annotate(best_time=models.Max("best_time"))
     )
 
-    total_score = 0
-    total_time_remaining = 0
-
-    for lp in level_progress:
-        remaining = lp["best_time"]
-        total_time_remaining += remaining
-        total_score += calc_level_score(remaining)
+    best_times = [lp["best_time"] for lp in level_progress]
+    total_time_remaining = sum(best_times)
+    total_score = int(score_levels(best_times).sum())
 
     achievements_unlocked = AchievementProgress.objects.filter(student=student, unlocked=True).count()
 
@@ -85,123 +66,287 @@ def get_student_performance(student):
 # --------------------------
 # All student rankings
 # --------------------------
-def get_all_student_rankings(
+# sort_by → ranking key (first field wins, the rest break ties)
+RANKING_SORT_FIELDS = {
+    "score": ("score",),
+    "time_remaining": ("total_time_remaining", "achievements_unlocked"),
+    "achievements": ("achievements_unlocked", "total_time_remaining"),
+    "name": ("last_name", "first_name"),
+    "section": ("section__department__name", "year_level__year", "section__letter"),
+}
+
+
+def _ranking_order(sort_by, sort_order):
+    fields = RANKING_SORT_FIELDS.get(sort_by, RANKING_SORT_FIELDS["score"])
+    if sort_order == "desc":
+        return [F(f).desc(nulls_last=True) for f in fields]
+    return [F(f).asc(nulls_last=True) for f in fields]
+
+
+def section_filter_q(filter_by=None, department_filter=None, prefix=""):
+    """
+    Q for a department name and/or a section code like "2B" / "CS2B".
+    `prefix` points at the student relation (e.g. "student__" from LevelProgress).
+    """
+    scope = Q()
+    if department_filter:
+        scope &= Q(**{f"{prefix}section__department__name": department_filter})
+
+    if filter_by:
+        match = re.match(r"([A-Za-z]*)(\d+)([A-Za-z])", filter_by)
+        if match:
+            dept, year, section_letter = match.groups()
+            scope &= Q(**{
+                f"{prefix}year_level__year": int(year),
+                f"{prefix}section__letter": section_letter.upper(),
+            })
+            if dept:
+                scope &= Q(**{f"{prefix}section__department__name": dept.upper()})
+    return scope
+
+
+def _ranking_scope(filter_by=None, department_filter=None, limit_to_students=None, search_query=None):
+    """Build the Q that selects which ranked students are returned (None → everyone)."""
+    scope = Q()
+
+    if limit_to_students is not None:
+        scope &= Q(id__in=limit_to_students)
+
+    scope &= section_filter_q(filter_by, department_filter)
+
+    if search_query:
+        scope &= (
+                Q(student_id__icontains=search_query)
+                | Q(first_name__icontains=search_query)
+                | Q(last_name__icontains=search_query)
+                | Q(full_name__icontains=search_query)
+                | Q(section_name__icontains=search_query)
+                | Q(score_text__icontains=search_query)
+        )
+
+    return scope or None
+
+
+def get_student_ranking_queryset(
         sort_by="score",
         sort_order="desc",
         filter_by=None,
         department_filter=None,
         limit_to_students=None,
+        search_query=None,
 ):
-    # --- Precompute scores like get_section_rankings ---
-    level_scores = (
-        LevelProgress.objects
-        .values("student_id", "level_id")
-        .annotate(per_level_score=level_score_case("best_time"))
-        .values("student_id")
-        .annotate(level_score=Sum("per_level_score"))
-    )
-    level_map = {row["student_id"]: row["level_score"] or 0 for row in level_scores}
-
-    time_scores = (
-        LevelProgress.objects
-        .values("student_id")
-        .annotate(total_time=Sum("best_time"))
+    """
+    Ranking as a lazy Student queryset: filtering, ORDER BY and LIMIT/OFFSET all run in PostgreSQL.
+
+    Each row is annotated with its scoreboard values plus
+      - rank:       RANK() OVER the requested sort key, across ALL students
+      - score_rank: RANK() OVER score, across ALL students (the global standing)
+    Filters are applied after the window functions, so both ranks stay global
+    even when a section / department / search filter narrows the page.
+    """
+    students = (
+        Student.objects.select_related("section__department", "section__year_level", "year_level")
+        .annotate(
+            score=Coalesce("score_summary__score", 0),
+            total_time_remaining=Coalesce("score_summary__total_time_remaining", 0),
+            achievements_unlocked=Coalesce("score_summary__achievements_unlocked", 0),
+            levels_completed=Coalesce("score_summary__levels_completed", 0),
+        )
     )
-    time_map = {row["student_id"]: row["total_time"] or 0 for row in time_scores}
+    if search_query:
+        students = students.annotate(
+            full_name=Concat("first_name", Value(" "), "last_name"),
+            section_name=Concat(
+                "section__department__name",
+                Cast("section__year_level__year", CharField()),
+                "section__letter",
+            ),
+            score_text=Cast("score", CharField()),
+        )
 
-    achievement_scores = (
-        AchievementProgress.objects.filter(unlocked=True)
-        .values("student_id")
-        .annotate(total=Count("id"))
+    order = _ranking_order(sort_by, sort_order)
+    students = students.annotate(
+        rank=Window(Rank(), order_by=order),
+        score_rank=Window(Rank(), order_by=F("score").desc()),
     )
-    achievement_map = {row["student_id"]: row["total"] or 0 for row in achievement_scores}
 
-    # --- Base queryset: all students ---
-    students = Student.objects.select_related("section__department", "year_level").all()
+    scope = _ranking_scope(filter_by, department_filter, limit_to_students, search_query)
+    if scope is not None:
+        # Evaluated per row as a window (PARTITION BY pk) so Django applies the filter
+        # in an outer query, after the global RANK() values have been computed.
+        students = students.annotate(
+            in_scope=Window(
+                Max(Case(When(scope, then=Value(1)), default=Value(0), output_field=IntegerField())),
+                partition_by=[F("pk")],
+            )
+        ).filter(in_scope=1)
 
-    # --- Filters ---
-    if limit_to_students is not None:
-        students = students.filter(id__in=limit_to_students)
+    return students.order_by(*order, "pk")
 
-    if department_filter:
-        students = students.filter(section__department__name=department_filter)
 
-    if filter_by:
-        match = re.match(r"([A-Za-z]*)(\d+)([A-Za-z])", filter_by)
-        if match:
-            dept, year, section_letter = match.groups()
-            filters = {
-                "year_level__year": int(year),
-                "section__letter": section_letter.upper(),
-            }
-            if dept:
-                filters["section__department__name"] = dept.upper()
-            students = students.filter(**filters)
-
-    # --- Build rankings ---
-    rankings = []
-    for s in students:
-        rankings.append(
-            {
-                "student_id": s.student_id,
-                "first_name": s.first_name,
-                "last_name": s.last_name,
-                "section": s.full_section,
-                "department": s.section.department.name if s.section and s.section.department else "N/A",
-                "year_level": s.year_level.year if s.year_level else "N/A",
-                "section_letter": s.section.letter if s.section else "N/A",
-                "total_time_remaining": time_map.get(s.id, 0),
-                "achievements_unlocked": achievement_map.get(s.id, 0),
-                "score": level_map.get(s.id, 0),
-            }
-        )
+def ranking_row(student):
+    """Serialize one row of get_student_ranking_queryset() to the legacy ranking dict."""
+    section = student.section
+    return {
+        "id": student.id,
+        "rank": student.rank,
+        "score_rank": student.score_rank,
+        "student_id": student.student_id,
+        "first_name": student.first_name,
+        "last_name": student.last_name,
+        "section": student.full_section,
+        "department": section.department.name if section and section.department else "N/A",
+        "year_level": student.year_level.year if student.year_level else "N/A",
+        "section_letter": section.letter if section else "N/A",
+        "total_time_remaining": student.total_time_remaining,
+        "achievements_unlocked": student.achievements_unlocked,
+        "score": student.score,
+    }
 
-    # --- Sorting ---
-    reverse = sort_order == "desc"
-    if sort_by == "score":
-        rankings.sort(key=lambda r: r["score"], reverse=reverse)
-    elif sort_by == "time_remaining":
-        rankings.sort(key=lambda r: (r["total_time_remaining"], r["achievements_unlocked"]), reverse=reverse)
-    elif sort_by == "achievements":
-        rankings.sort(key=lambda r: (r["achievements_unlocked"], r["total_time_remaining"]), reverse=reverse)
-    elif sort_by == "name":
-        rankings.sort(key=lambda r: (r["last_name"], r["first_name"]), reverse=reverse)
-    elif sort_by == "section":
-        rankings.sort(key=lambda r: (r["department"], r["year_level"], r["section_letter"]), reverse=reverse)
 
-    return rankings
+def get_all_student_rankings(
+        sort_by="score",
+        sort_order="desc",
+        filter_by=None,
+        department_filter=None,
+        limit_to_students=None,
+        search_query=None,
+):
+    """List-of-dicts wrapper around get_student_ranking_queryset() for exports and scripts."""
+    students = get_student_ranking_queryset(
+        sort_by=sort_by,
+        sort_order=sort_order,
+        filter_by=filter_by,
+        department_filter=department_filter,
+        limit_to_students=limit_to_students,
+        search_query=search_query,
+    )
+    return [ranking_row(s) for s in students]
 
 
 # --------------------------
-# Section rankings
+# Top-K leaderboards
 # --------------------------
-def get_section_rankings(sort_order="desc", limit=5):
-    # per student level scores
-    level_scores = (
-        LevelProgress.objects
-        .values("student_id", "level_id")
-        .annotate(per_level_score=level_score_case("best_time"))
-        .values("student_id")
-        .annotate(level_score=Sum("per_level_score"))
+# sort_by → scoreboard ordering (only scoreboard columns, so ORDER BY ... LIMIT can walk an index)
+TOP_K_SORT_FIELDS = {
+    "score": ("score",),
+    "time_remaining": ("total_time_remaining", "achievements_unlocked"),
+    "achievements": ("achievements_unlocked", "total_time_remaining"),
+}
+
+
+def _top_k_order(sort_by, sort_order):
+    fields = TOP_K_SORT_FIELDS.get(sort_by, TOP_K_SORT_FIELDS["score"])
+    if sort_order == "desc":
+        return [F(f).desc() for f in fields] + [F("student_id").asc()]
+    return [F(f).asc() for f in fields] + [F("student_id").asc()]
+
+
+def _top_k_rows(entries, sort_by):
+    """ranking_row()-shaped dicts for an ordered StudentScore slice (ties share a rank)."""
+    key_fields = TOP_K_SORT_FIELDS.get(sort_by, TOP_K_SORT_FIELDS["score"])
+    rows = []
+    previous_key = rank = None
+    for position, entry in enumerate(entries, start=1):
+        key = tuple(getattr(entry, f) for f in key_fields)
+        if key != previous_key:
+            rank, previous_key = position, key
+        student = entry.student
+        section = student.section
+        rows.append({
+            "id": student.id,
+            "rank": rank,
+            "student_id": student.student_id,
+            "first_name": student.first_name,
+            "last_name": student.last_name,
+            "section": student.full_section,
+            "department": section.department.name if section else "N/A",
+            "year_level": student.year_level.year if student.year_level else "N/A",
+            "section_letter": section.letter if section else "N/A",
+            "total_time_remaining": entry.total_time_remaining,
+            "achievements_unlocked": entry.achievements_unlocked,
+            "score": entry.score,
+        })
+    return rows
+
+
+def _top_k_base(section_ids):
+    # Every student has a StudentScore row (created by the sync_*_progress paths, see
+    # scoreboard.ensure_student_scores), so the scoreboard alone covers the ranking population
+    return StudentScore.objects.filter(student__section_id__in=section_ids).select_related(
+        "student__section__department", "student__section__year_level", "student__year_level"
     )
-    level_map = {row["student_id"]: row["level_score"] or 0 for row in level_scores}
 
-    students = Student.objects.select_related("section__department", "section__year_level").all()
 
-    section_groups = {}
-    for s in students:
-        total_score = level_map.get(s.id, 0)  # 🚫 no achievement bonus
+def get_top_students(section_ids, limit=5, sort_by="score", sort_order="desc"):
+    """
+    The `limit` best students of the given sections: a single ORDER BY ... LIMIT
+    on the scoreboard, so cost does not grow with section size.
+    """
+    entries = _top_k_base(section_ids).order_by(*_top_k_order(sort_by, sort_order))[:limit]
+    return _top_k_rows(entries, sort_by)
+
+
+def get_top_students_per_section(section_ids, limit=3, sort_by="score", sort_order="desc"):
+    """
+    Top `limit` students of every given section in one query
+    (ROW_NUMBER() OVER (PARTITION BY section) ... <= limit).
+    Returns [{"section": "CS1A", "students": [...]}, ...] ordered by section name.
+    """
+    order = _top_k_order(sort_by, sort_order)
+    entries = (
+        _top_k_base(section_ids)
+        .annotate(section_position=Window(RowNumber(), partition_by=[F("student__section_id")], order_by=order))
+        .filter(section_position__lte=limit)
+        .order_by("student__section_id", "section_position")
+    )
 
-        if s.section:
-            section_name = f"{s.section.department.name}{s.section.year_level.year}{s.section.letter}"
-            section_groups.setdefault(section_name, []).append(total_score)
+    by_section = {}
+    for entry in entries:
+        by_section.setdefault(entry.student.section_id, []).append(entry)
 
-    section_averages = [
-        {"section": sec, "average_score": sum(scores) / len(scores) if scores else 0}
-        for sec, scores in section_groups.items()
+    groups = [
+        {"section": group[0].student.full_section, "students": _top_k_rows(group, sort_by)}
+        for group in by_section.values()
     ]
+    return sorted(groups, key=lambda g: g["section"])
 
-    reverse = sort_order == "desc"
-    section_averages.sort(key=lambda x: x["average_score"], reverse=reverse)
 
-    return section_averages[:limit]
+# --------------------------
+# Section rankings
+# --------------------------
+def get_section_rankings(sort_order="desc", limit=5, department_filter=None, year_filter=None):
+    """
+    Average level score per section (no achievement bonus), computed in one grouped
+    query over the StudentScore scoreboard. Optional department name / year filters.
+    """
+    qs = Student.objects.filter(section__isnull=False)
+    if department_filter:
+        qs = qs.filter(section__department__name=department_filter)
+    if year_filter:
+        qs = qs.filter(section__year_level__year=year_filter)
+
+    average = F("average_score").desc() if sort_order == "desc" else F("average_score").asc()
+    rows = (
+        qs.values("section_id")
+        .annotate(
+            section_name=Concat(
+                "section__department__name",
+                Cast("section__year_level__year", CharField()),
+                "section__letter",
+                output_field=CharField(),
+            ),
+            average_score=Avg(Coalesce("score_summary__score", Value(0)), output_field=FloatField()),
+            student_count=Count("id"),
+        )
+        .order_by(average, "section_name")
+    )[:limit]
+
+    return [
+        {
+            "section": row["section_name"],
+            "average_score": row["average_score"],
+            "student_count": row["student_count"],
+        }
+        for row in rows
+    ]
@@ -0,0 +1,114 @@
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+from GameProgress.models import VersionCounter
+from GameProgress.services.ranking import get_student_ranking_queryset, ranking_row
+
+RANKING_CACHE_TIMEOUT = 60 * 10  # seconds; entries are also dropped implicitly by version bumps
+
+
+# ============================================================
+# 🔹 PROGRESS VERSION
+# ============================================================
+
+def get_progress_version():
+    """
+    Current global progress version (part of every ranking cache key).
+    Debounced score changes older than RANKING_CACHE_DEBOUNCE seconds are folded in first.
+    """
+    VersionCounter.settle(VersionCounter.PROGRESS, settings.RANKING_CACHE_DEBOUNCE)
+    return VersionCounter.current(VersionCounter.PROGRESS)
+
+
+def bump_progress_version(debounce=False):
+    """
+    Invalidate every cached ranking.
+    Runs after the surrounding transaction commits, so no worker can cache
+    pre-commit data under the new version.
+
+    debounce=True (autosave scoreboard refreshes): the change is only marked, and rankings
+    pick it up at most once every RANKING_CACHE_DEBOUNCE seconds, so a class saving
+    every few seconds does not empty the cache on every save.
+    """
+    if debounce:
+        transaction.on_commit(lambda: VersionCounter.mark_changed(VersionCounter.PROGRESS))
+    else:
+        transaction.on_commit(lambda: VersionCounter.bump(VersionCounter.PROGRESS))
+
+
+# ============================================================
+# 🔹 CACHED RANKINGS
+# ============================================================
+
+def _scope_digest(limit_to_students):
+    """Stable digest of the student scope (None → every student)."""
+    if limit_to_students is None:
+        return "all"
+    ids = ",".join(str(pk) for pk in sorted(limit_to_students))
+    return hashlib.md5(ids.encode()).hexdigest()
+
+
+class CachedRanking:
+    """
+    Paginator-compatible view over get_student_ranking_queryset().
+
+    count() and every slice are cached under a key made of the progress version plus
+    (sort_by, sort_order, filter_by, department, search, student scope), so a stale
+    entry is never served and repeated page loads cost a single cache lookup.
+    """
+
+    def __init__(
+            self,
+            sort_by="score",
+            sort_order="desc",
+            filter_by=None,
+            department_filter=None,
+            limit_to_students=None,
+            search_query=None,
+    ):
+        self.queryset = get_student_ranking_queryset(
+            sort_by=sort_by,
+            sort_order=sort_order,
+            filter_by=filter_by,
+            department_filter=department_filter,
+            limit_to_students=limit_to_students,
+            search_query=search_query,
+        )
+        raw_key = "|".join([
+            sort_by or "",
+            sort_order or "",
+            filter_by or "",
+            department_filter or "",
+            search_query or "",
+            _scope_digest(limit_to_students),
+        ])
+        self.key = f"rankings:v{get_progress_version()}:{hashlib.md5(raw_key.encode()).hexdigest()}"
+
+    def _cached(self, suffix, compute):
+        return cache.get_or_set(f"{self.key}:{suffix}", compute, RANKING_CACHE_TIMEOUT)
+
+    def count(self):
+        return self._cached("count", self.queryset.count)
+
+    def __len__(self):
+        return self.count()
+
+    def __getitem__(self, item):
+        if isinstance(item, slice):
+            return self._cached(f"{item.start}:{item.stop}", lambda: list(self.queryset[item]))
+        return self[item:item + 1][0]
+
+    def __iter__(self):
+        return iter(self[0:None])
+
+    def rows(self):
+        """Every row serialized with ranking_row() (exports, print, dashboards)."""
+        return self._cached("rows", lambda: [ranking_row(s) for s in self.queryset])
+
+
+def get_cached_student_rankings(**kwargs):
+    """Cached equivalent of get_all_student_rankings() (same keyword arguments)."""
+    return CachedRanking(**kwargs).rows()
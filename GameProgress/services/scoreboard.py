@@ -0,0 +1,110 @@
+from django.db import transaction
+from django.db.models import Count
+from django.utils.timezone import now
+
+from GameProgress.models import AchievementProgress, StudentScore
+from GameProgress.services.ranking_cache import bump_progress_version
+from GameProgress.services.scoring import level_totals
+from StudentManagementSystem.models.student import Student
+
+SCORE_FIELDS = ["score", "total_time_remaining", "achievements_unlocked", "levels_completed", "updated_at"]
+
+
+# ============================================================
+# 🔹 SCOREBOARD MAINTENANCE
+# ============================================================
+
+def refresh_student_scores(student_ids, debounce=False):
+    """
+    Recompute the StudentScore rows of the given students from their progress
+    (level scores from the vectorized engine in scoring.py, like every other score).
+    Missing rows are created, existing rows are overwritten (single upsert).
+    debounce=True for autosaves: cached rankings catch up within RANKING_CACHE_DEBOUNCE.
+    """
+    student_ids = list(student_ids)
+    if not student_ids:
+        return 0
+
+    levels_by_student = level_totals(student_ids)
+    achievement_totals = {
+        row["student_id"]: row["total"]
+        for row in AchievementProgress.objects.filter(student_id__in=student_ids, unlocked=True)
+        .values("student_id")
+        .annotate(total=Count("id"))
+    }
+
+    rows = []
+    for student_id in student_ids:
+        score, total_time, completed = levels_by_student.get(student_id, (0, 0, 0))
+        rows.append(
+            StudentScore(
+                student_id=student_id,
+                score=score,
+                total_time_remaining=total_time,
+                achievements_unlocked=achievement_totals.get(student_id, 0),
+                levels_completed=completed,
+            )
+        )
+
+    StudentScore.objects.bulk_create(
+        rows,
+        batch_size=1000,
+        update_conflicts=True,
+        unique_fields=["student"],
+        update_fields=SCORE_FIELDS,
+    )
+    bump_progress_version(debounce=debounce)
+    return len(rows)
+
+
+def reset_student_scores(student_ids=None):
+    """Zero the scoreboard (all students, or only the given ones) after a progress reset."""
+    qs = StudentScore.objects.all()
+    if student_ids is not None:
+        qs = qs.filter(student_id__in=student_ids)
+    bump_progress_version()
+    return qs.update(
+        score=0,
+        total_time_remaining=0,
+        achievements_unlocked=0,
+        levels_completed=0,
+        updated_at=now(),
+    )
+
+
+def _refresh_in_chunks(students, chunk_size):
+    """refresh_student_scores over a Student queryset, chunk by chunk so memory stays flat."""
+    total = 0
+    last_id = 0
+    while True:
+        chunk = list(
+            students.filter(id__gt=last_id)
+            .order_by("id")
+            .values_list("id", flat=True)[:chunk_size]
+        )
+        if not chunk:
+            break
+        with transaction.atomic():
+            total += refresh_student_scores(chunk)
+        last_id = chunk[-1]
+    return total
+
+
+def rebuild_student_scores(chunk_size=1000):
+    """
+    Rebuild the whole scoreboard from scratch, chunk by chunk so memory stays flat.
+    Returns the number of students refreshed.
+    """
+    return _refresh_in_chunks(Student.objects.all(), chunk_size)
+
+
+def ensure_student_scores(student_ids=None, chunk_size=1000):
+    """
+    Create the StudentScore row of every student (or of the given ones) that has none yet,
+    so top-K and standing rank the same population as the Coalesce-to-0 ranking queryset.
+    Returns the number of rows created.
+    """
+    students = Student.objects.filter(score_summary__isnull=True)
+    if student_ids is not None:
+        students = students.filter(id__in=list(student_ids))
+    return _refresh_in_chunks(students, chunk_size)
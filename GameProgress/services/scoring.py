@@ -0,0 +1,148 @@
+from dataclasses import dataclass
+from functools import lru_cache
+from itertools import chain
+
+import numpy as np
+
+from GameProgress.models import LevelProgress
+from StudentManagementSystem.models import Student
+
+# (min best_time, score), best first. best_time is the time REMAINING, so higher is better.
+LEVEL_SCORE_THRESHOLDS = [
+    (90, 100),
+    (60, 70),
+    (30, 40),
+    (1, 10),
+]
+
+# Stars for each LEVEL_SCORE_THRESHOLDS entry (same order); below every threshold → 0 stars
+LEVEL_STARS = [3, 2, 2, 1]
+
+SCORE_CHUNK_SIZE = 2000  # students scored per pass (memory ≈ chunk × levels × 16 bytes)
+FETCH_CHUNK_SIZE = 10000  # LevelProgress rows per server-side cursor fetch
+
+
+# ============================================================
+# 🔹 COMPILED THRESHOLDS
+# ============================================================
+
+@dataclass(frozen=True)
+class ScoreTable:
+    """
+    Thresholds compiled for np.searchsorted:
+      bounds[i]       ascending minimum best_time of bucket i + 1
+      scores[bucket]  score of each bucket (bucket 0 = below every threshold)
+      stars[bucket]   stars of each bucket
+    """
+    bounds: np.ndarray
+    scores: np.ndarray
+    stars: np.ndarray
+
+    def bucket(self, best_times):
+        """Bucket index of every best_time (any shape; None / NaN → 0)."""
+        times = np.nan_to_num(np.asarray(best_times, dtype=float), nan=0.0)
+        return np.searchsorted(self.bounds, times, side="right")
+
+    def score(self, best_times):
+        return self.scores[self.bucket(best_times)]
+
+    def stars_for(self, best_times):
+        return self.stars[self.bucket(best_times)]
+
+    def score_and_stars(self, best_times):
+        buckets = self.bucket(best_times)
+        return self.scores[buckets], self.stars[buckets]
+
+
+def compile_thresholds(thresholds=None, stars=None):
+    """Compile [(min_best_time, score), ...] (any order) into a ScoreTable."""
+    thresholds = LEVEL_SCORE_THRESHOLDS if thresholds is None else thresholds
+    stars = LEVEL_STARS if stars is None else stars
+    if len(stars) != len(thresholds):
+        raise ValueError("stars must have one entry per threshold")
+
+    ordered = sorted(zip(thresholds, stars), key=lambda item: item[0][0])
+    return ScoreTable(
+        bounds=np.array([t for (t, _), _ in ordered], dtype=float),
+        scores=np.array([0] + [s for (_, s), _ in ordered], dtype=np.int64),
+        stars=np.array([0] + [st for _, st in ordered], dtype=np.int64),
+    )
+
+
+@lru_cache(maxsize=1)
+def default_table():
+    """ScoreTable for the live LEVEL_SCORE_THRESHOLDS (compiled once per process)."""
+    return compile_thresholds()
+
+
+# ============================================================
+# 🔹 VECTORIZED SCORING
+# ============================================================
+
+def score_levels(best_times, table=None):
+    """Score array for an array of best_time values (e.g. students × levels)."""
+    return (table or default_table()).score(best_times)
+
+
+def stars_levels(best_times, table=None):
+    """Stars array for an array of best_time values."""
+    return (table or default_table()).stars_for(best_times)
+
+
+def _level_rows(student_ids):
+    """(student_id, best_time) rows of these students as an int64 array, streamed from the cursor."""
+    rows = (
+        LevelProgress.objects.filter(student_id__in=student_ids)
+        .values_list("student_id", "best_time")
+        .iterator(chunk_size=FETCH_CHUNK_SIZE)
+    )
+    return np.fromiter(chain.from_iterable(rows), dtype=np.int64).reshape(-1, 2)
+
+
+def level_totals(student_ids, table=None):
+    """
+    Level aggregates of the given students, the ones the scoreboard stores:
+    {student_id: (score, total best_time, levels completed)}.
+    One streamed fetch, one searchsorted and three bincounts.
+    """
+    rows = _level_rows(list(student_ids))
+    if not len(rows):
+        return {}
+
+    owners, positions = np.unique(rows[:, 0], return_inverse=True)
+    scores, times, completed = (
+        np.bincount(positions, weights=weights, minlength=len(owners)).astype(np.int64).tolist()
+        for weights in (score_levels(rows[:, 1], table), rows[:, 1], rows[:, 1] > 0)
+    )
+    return {sid: totals for sid, *totals in zip(owners.tolist(), scores, times, completed)}
+
+
+def _student_chunks(student_ids, chunk_size):
+    """Student ids `chunk_size` at a time (every student, by id, when `student_ids` is None)."""
+    if student_ids is not None:
+        student_ids = list(student_ids)
+        for start in range(0, len(student_ids), chunk_size):
+            yield student_ids[start:start + chunk_size]
+        return
+
+    last_id = 0
+    while True:
+        chunk = list(
+            Student.objects.filter(id__gt=last_id).order_by("id").values_list("id", flat=True)[:chunk_size]
+        )
+        if not chunk:
+            return
+        yield chunk
+        last_id = chunk[-1]
+
+
+def score_students(student_ids=None, table=None, chunk_size=SCORE_CHUNK_SIZE):
+    """
+    Total level score per student, one chunk of students at a time so memory stays
+    bounded by the chunk, not the cohort. Pass a custom table (compile_thresholds(...))
+    for what-if rescoring. Returns {student_id: score}.
+    """
+    scores = {}
+    for chunk in _student_chunks(student_ids, chunk_size):
+        scores.update((sid, totals[0]) for sid, totals in level_totals(chunk, table).items())
+    return scores
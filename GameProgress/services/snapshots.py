@@ -0,0 +1,120 @@
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import F, Window
+from django.db.models.functions import Coalesce, Rank
+from django.utils.timezone import localdate
+
+from GameProgress.models import RankingSnapshot
+from StudentManagementSystem.models import Student
+
+SNAPSHOT_RETENTION_DAYS = 90
+TREND_DAYS = 7
+
+
+# ============================================================
+# 🔹 SNAPSHOT JOB
+# ============================================================
+
+def take_ranking_snapshot(day=None):
+    """
+    Store today's (or `day`'s) global + section ranks for every student.
+    Ranks are computed by one windowed query and written with one bulk INSERT;
+    running twice on the same day is a no-op (ON CONFLICT DO NOTHING).
+    Returns the number of rows in the snapshot.
+    """
+    day = day or localdate()
+    ranked = (
+        Student.objects.annotate(current_score=Coalesce("score_summary__score", 0))
+        .annotate(
+            current_rank=Window(Rank(), order_by=F("current_score").desc()),
+            current_section_rank=Window(
+                Rank(), partition_by=[F("section_id")], order_by=F("current_score").desc()
+            ),
+        )
+        .values_list("id", "section_id", "current_score", "current_rank", "current_section_rank")
+    )
+
+    rows = [
+        RankingSnapshot(
+            student_id=student_id,
+            taken_on=day,
+            rank=rank,
+            section_rank=section_rank if section_id else None,
+            score=score,
+        )
+        for student_id, section_id, score, rank, section_rank in ranked
+    ]
+    RankingSnapshot.objects.bulk_create(rows, ignore_conflicts=True)
+    return len(rows)
+
+
+def prune_ranking_snapshots(keep_days=SNAPSHOT_RETENTION_DAYS, today=None):
+    """Delete snapshots older than the retention window. Returns rows deleted."""
+    cutoff = (today or localdate()) - timedelta(days=keep_days)
+    deleted, _ = RankingSnapshot.objects.filter(taken_on__lt=cutoff).delete()
+    return deleted
+
+
+def run_daily_ranking_snapshot(keep_days=SNAPSHOT_RETENTION_DAYS):
+    """Take today's snapshot if it is missing and apply retention (cheap to call every minute)."""
+    today = localdate()
+    if RankingSnapshot.objects.filter(taken_on=today).exists():
+        return 0
+    with transaction.atomic():
+        taken = take_ranking_snapshot(today)
+        prune_ranking_snapshots(keep_days, today)
+    return taken
+
+
+# ============================================================
+# 🔹 RANK DELTAS / TRENDS
+# ============================================================
+
+def _sparkline_points(ranks, width=60, height=16):
+    """SVG polyline points for a rank series (rank 1 drawn at the top)."""
+    if len(ranks) < 2:
+        return ""
+    low, high = min(ranks), max(ranks)
+    spread = (high - low) or 1
+    step = width / (len(ranks) - 1)
+    return " ".join(
+        f"{round(i * step, 1)},{round((rank - low) / spread * height, 1)}"
+        for i, rank in enumerate(ranks)
+    )
+
+
+def get_rank_trends(student_ids, days=TREND_DAYS):
+    """
+    Rank history of the given students over the last `days` days, from snapshots only.
+    Returns {student_id: {"ranks": [...oldest → newest], "delta": places gained, "points": svg}}.
+    A positive delta means the student moved up.
+    """
+    since = localdate() - timedelta(days=days)
+    history = {}
+    for student_id, rank in (
+            RankingSnapshot.objects.filter(student_id__in=student_ids, taken_on__gte=since)
+                    .order_by("taken_on")
+                    .values_list("student_id", "rank")
+    ):
+        history.setdefault(student_id, []).append(rank)
+
+    return {
+        student_id: {
+            "ranks": ranks,
+            "delta": ranks[0] - ranks[-1],
+            "points": _sparkline_points(ranks),
+        }
+        for student_id, ranks in history.items()
+    }
+
+
+def attach_rank_trends(students, days=TREND_DAYS):
+    """Set rank_delta / rank_trend_points on each ranking row of a page (one query)."""
+    students = list(students)
+    trends = get_rank_trends([s.id for s in students], days)
+    for student in students:
+        trend = trends.get(student.id)
+        student.rank_delta = trend["delta"] if trend else None
+        student.rank_trend_points = trend["points"] if trend else ""
+    return students
@@ -0,0 +1,122 @@
+from django.core.cache import cache
+from django.db.models import Count, Q
+
+from GameProgress.models import StudentScore
+from StudentManagementSystem.models import Student
+
+MAX_NEIGHBOURS = 10
+STUDENT_TOTAL_TIMEOUT = 60  # seconds
+
+
+# ============================================================
+# 🔹 "MY RANK AND NEIGHBOURS"
+# ============================================================
+
+def _neighbour_row(entry, rank):
+    student = entry.student
+    return {
+        "id": student.id,
+        "student_id": student.student_id,
+        "first_name": student.first_name,
+        "last_name": student.last_name,
+        "section": student.full_section,
+        "score": entry.score,
+        "rank": rank,
+    }
+
+
+def _neighbours(score, student_id, k):
+    """
+    The k students directly above and below (score DESC, student id ASC).
+    Each side is one LIMIT k range scan on the (-score, student) index.
+    """
+    base = StudentScore.objects.select_related(
+        "student__section__department", "student__section__year_level"
+    )
+    above = list(
+        base.filter(Q(score__gt=score) | Q(score=score, student_id__lt=student_id))
+        .order_by("score", "-student_id")[:k]
+    )[::-1]
+    below = list(
+        base.filter(Q(score__lt=score) | Q(score=score, student_id__gt=student_id))
+        .order_by("-score", "student_id")[:k]
+    )
+    return above, below
+
+
+def _ranked_rows(entries, score, ranks, first_position):
+    """
+    Competition ranks (same score → same rank) for an ordered neighbour slice, from positions alone:
+    its rows scored other than `score` sit at first_position, first_position + 1, ...
+    and a score group is ranked at the position of its first row (`ranks` holds the known ones).
+    """
+    position = first_position
+    rows = []
+    for entry in entries:
+        if entry.score != score:
+            ranks.setdefault(entry.score, position)
+            position += 1
+        rows.append(_neighbour_row(entry, ranks[entry.score]))
+    return rows
+
+
+def _student_total():
+    """Number of students (cached: it only moves on registration / deletion)."""
+    return cache.get_or_set("standing:students", Student.objects.count, STUDENT_TOTAL_TIMEOUT)
+
+
+def get_student_standing(student, neighbours=3):
+    """
+    A student's global rank, section rank, percentile and the `neighbours`
+    students directly above / below them. Ranks match score_rank in
+    get_student_ranking_queryset() (RANK() over score DESC): both rank every
+    student, with a missing scoreboard row counting as 0 (see ensure_student_scores).
+
+    Cost: one indexed range count (score >= mine) for rank and percentile, a cached
+    student total, one count bounded by the section and two LIMIT k scans for the
+    neighbours, whose ranks follow from their offsets next to the student.
+    """
+    neighbours = max(0, min(int(neighbours), MAX_NEIGHBOURS))
+    score = (
+        StudentScore.objects.filter(student_id=student.id)
+        .values_list("score", flat=True)
+        .first()
+    ) or 0
+
+    counts = StudentScore.objects.filter(score__gte=score).aggregate(
+        higher=Count("pk", filter=Q(score__gt=score)),
+        at_or_above=Count("pk"),
+    )
+    rank = counts["higher"] + 1
+    total = max(_student_total(), counts["at_or_above"])
+
+    section_rank = section_total = None
+    if student.section_id:
+        section_counts = Student.objects.filter(section_id=student.section_id).aggregate(
+            higher=Count("pk", filter=Q(score_summary__score__gt=score)),
+            total=Count("pk"),
+        )
+        section_rank, section_total = section_counts["higher"] + 1, section_counts["total"]
+
+    above, below = _neighbours(score, student.id, neighbours) if neighbours else ([], [])
+
+    # 🔹 Rows above with a higher score end right at position `higher`; only a top score
+    # group cut by the slice edge needs its own (narrower) count
+    first_above = counts["higher"] - sum(1 for entry in above if entry.score != score) + 1
+    above_ranks = {score: rank}
+    if above and above[0].score != score and first_above > 1:
+        above_ranks[above[0].score] = StudentScore.objects.filter(score__gt=above[0].score).count() + 1
+
+    return {
+        "student_id": student.student_id,
+        "score": score,
+        "rank": rank,
+        "total_students": total,
+        "section_rank": section_rank,
+        "section_total": section_total,
+        # share of students ranked strictly below this student
+        "percentile": round(100 * (total - counts["at_or_above"]) / total, 1) if total else 0,
+        "above": _ranked_rows(above, score, above_ranks, first_above),
+        # rows below with a lower score start right after every row scored >= mine
+        "below": _ranked_rows(below, score, {score: rank}, counts["at_or_above"] + 1),
+    }
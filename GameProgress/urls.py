@@ -1,10 +1,21 @@
 from django.urls import path
 
-from GameProgress.views import get_game_progress, update_game_progress
+from GameProgress.views import (
+    get_game_progress,
+    update_game_progress,
+    get_student_rank,
+    get_level_leaderboard_api,
+    batch_get_game_progress,
+    batch_update_game_progress,
+)
 from StudentManagementSystem.views.students.api.auth_api_students import api_student_login
 
 urlpatterns = [
     path('progress/<int:student_id>/', get_game_progress, name='get_game_progress'),
     path('progress/update/<int:student_id>/', update_game_progress, name='update_game_progress'),
+    path('progress/batch/', batch_get_game_progress, name='batch_get_game_progress'),
+    path('progress/batch/update/', batch_update_game_progress, name='batch_update_game_progress'),
+    path('progress/rank/<int:student_id>/', get_student_rank, name='get_student_rank'),
+    path('leaderboard/level/<str:level_name>/', get_level_leaderboard_api, name='get_level_leaderboard_api'),
     path('student_login/', api_student_login, name='api_student_login'),
 ]
@@ -1,2 +1,5 @@
 from .progress_export import get_game_progress
 from .progress_update import update_game_progress
+from .progress_standing import get_student_rank
+from .progress_leaderboard import get_level_leaderboard_api
+from .progress_batch import batch_get_game_progress, batch_update_game_progress
@@ -0,0 +1,188 @@
+from django.conf import settings
+from django.http import JsonResponse, HttpResponseBadRequest
+from django.views.decorators.csrf import csrf_exempt
+
+from GameProgress.models import LevelProgress, AchievementProgress
+from GameProgress.services.definitions import get_definitions
+from GameProgress.services.progress_versions import get_progress_versions_many, format_sync_token, parse_sync_token
+from GameProgress.services.progress_writes import (
+    flush_student_progress,
+    parse_level_rows,
+    parse_save_identity,
+    parse_unlocked_achievements,
+    save_progress_payloads,
+)
+from GameProgress.views.progress_export import build_progress_document, build_delta_document, load_tombstones
+from GameProgress.views.request_guards import rate_limited
+from GameProgress.views.wire_format import decode_payload, encode_response
+from StudentManagementSystem.views.students.api.api_token import get_students_for_tokens
+
+MAX_BATCH_STUDENTS = 100  # 🔹 a full computer lab, with room to spare
+MAX_BATCH_BODY_BYTES = 512 * 1024  # 🔹 on the wire, checked before anything is decoded (tokens live in the body)
+
+
+# ============================================================
+# 🔹 BATCH REQUESTS (lab gateways)
+# ============================================================
+# Body: {"students": [{"token": "<api_student_login token>", ...}, ...]} as JSON or msgpack.
+# Each entry is authenticated by its own student's token; one bad entry never fails the batch.
+# Results come back in request order.
+# Bodies are size-capped and each view is rate-limited per client IP before any token is checked.
+
+def _read_batch(request):
+    """(entries, students aligned with entries) or an error JsonResponse."""
+    if request.method != "POST":
+        return HttpResponseBadRequest("POST required")
+    try:
+        too_large = int(request.headers.get("Content-Length") or 0) > MAX_BATCH_BODY_BYTES
+    except ValueError:
+        return JsonResponse({"error": "Invalid Content-Length"}, status=400)
+    if too_large or len(request.body) > MAX_BATCH_BODY_BYTES:
+        return JsonResponse({"error": f"Batch body larger than {MAX_BATCH_BODY_BYTES} bytes"}, status=413)
+
+    try:
+        entries = decode_payload(request).get("students")
+    except (ValueError, AttributeError) as e:
+        return JsonResponse({"error": f"Invalid payload: {e}"}, status=400)
+
+    if not isinstance(entries, list) or not all(isinstance(entry, dict) for entry in entries):
+        return JsonResponse({"error": "students must be a list of objects"}, status=400)
+    if len(entries) > MAX_BATCH_STUDENTS:
+        return JsonResponse({"error": f"At most {MAX_BATCH_STUDENTS} students per batch"}, status=400)
+
+    return entries, get_students_for_tokens([entry.get("token") for entry in entries])
+
+
+def _entry_errors(entries, students):
+    """[error result or None, ...]: bad tokens and repeated students are rejected per entry."""
+    seen, errors = set(), []
+    for student in students:
+        if student is None:
+            errors.append({"status": 401, "error": "Invalid or expired token"})
+        elif student.id in seen:
+            errors.append({"student_id": student.student_id, "status": 409, "error": "Duplicate student in batch"})
+        else:
+            seen.add(student.id)
+            errors.append(None)
+    return errors
+
+
+@csrf_exempt
+@rate_limited("progress-batch-update", by="ip")
+def batch_update_game_progress(request):
+    """
+    Apply save payloads for many students in one transaction
+    (entries: {"token": ..., "payload": <same document as update_game_progress>,
+    optional "seq" / "idempotency_key" like X-Save-Seq / Idempotency-Key}).
+    Follows PROGRESS_WRITE_BEHIND (status 202, buffered) and drops retried or stale entries
+    (status 200, "save_status": "duplicate" / "stale") exactly like update_game_progress.
+    """
+    batch = _read_batch(request)
+    if not isinstance(batch, tuple):
+        return batch
+    entries, students = batch
+    results = _entry_errors(entries, students)
+
+    saves = []
+    for i, (entry, student) in enumerate(zip(entries, students)):
+        if results[i] is not None:
+            continue
+        payload = entry.get("payload")
+        try:
+            seq, key = parse_save_identity(entry.get("seq"), entry.get("idempotency_key"))
+            parse_level_rows(payload.get("levels", {}).get("value", {}))
+            parse_unlocked_achievements(payload.get("achievements", {}).get("value", {}))
+        except (AttributeError, TypeError, ValueError) as e:
+            results[i] = {"student_id": student.student_id, "status": 400, "error": f"Invalid payload: {e}"}
+            continue
+        saves.append((student.id, payload, seq, key))
+
+    try:
+        saved = save_progress_payloads(saves, buffered=settings.PROGRESS_WRITE_BEHIND)
+    except Exception as e:
+        return JsonResponse({"error": str(e)}, status=500)
+
+    for i, student in enumerate(students):
+        if results[i] is None:
+            document = dict(saved[student.id])
+            save_status = document.pop("status")
+            results[i] = {
+                "student_id": student.student_id,
+                "status": 202 if save_status == "queued" else 200,
+                "save_status": save_status,
+                **document,
+            }
+
+    return encode_response(request, {"results": results})
+
+
+@csrf_exempt
+@rate_limited("progress-batch-get", by="ip")
+def batch_get_game_progress(request):
+    """
+    Save documents for many students (entries: {"token": ..., "since": optional sync token}).
+    Entries whose `since` is still current get status 304 and no document;
+    other `since` entries get a delta, the rest a full document.
+    """
+    batch = _read_batch(request)
+    if not isinstance(batch, tuple):
+        return batch
+    entries, students = batch
+    results = _entry_errors(entries, students)
+
+    since = {}
+    for i, (entry, student) in enumerate(zip(entries, students)):
+        if results[i] is None and entry.get("since"):
+            try:
+                since[student.id] = parse_sync_token(str(entry["since"]))
+            except ValueError:
+                results[i] = {"student_id": student.student_id, "status": 400, "error": "Invalid since token"}
+
+    valid = [student for i, student in enumerate(students) if results[i] is None]
+    if settings.PROGRESS_WRITE_BEHIND and valid:
+        flush_student_progress([student.id for student in valid])
+    versions, definitions_version = get_progress_versions_many([student.id for student in valid])
+    definitions = get_definitions(definitions_version)
+
+    # 🔹 Up-to-date clients need nothing; everyone else shares two progress queries
+    current = {student.id: (versions[student.id], definitions_version) for student in valid}
+    stale = [student.id for student in valid if since.get(student.id) != current[student.id]]
+
+    level_progress, achievement_progress = {}, {}
+    for p in LevelProgress.objects.filter(student_id__in=stale).only(
+            "student_id", "level_id", "best_time", "current_time", "unlocked", "version"
+    ):
+        level_progress.setdefault(p.student_id, {})[p.level_id] = p
+    for p in AchievementProgress.objects.filter(student_id__in=stale).only(
+            "student_id", "achievement_id", "unlocked", "version"
+    ):
+        achievement_progress.setdefault(p.student_id, {})[p.achievement_id] = p
+
+    delta_since = [since[student_id] for student_id in stale if student_id in since]
+    tombstones = load_tombstones(min(dv for _, dv in delta_since)) if delta_since else []
+
+    for i, student in enumerate(students):
+        if results[i] is not None:
+            continue
+        token = current[student.id]
+        result = {"student_id": student.student_id, "version": format_sync_token(*token)}
+        if since.get(student.id) == token:
+            result["status"] = 304
+        elif student.id in since:
+            result["status"] = 200
+            result["progress"] = build_delta_document(
+                definitions,
+                level_progress.get(student.id, {}),
+                achievement_progress.get(student.id, {}),
+                since[student.id],
+                token,
+                tombstones,
+            )
+        else:
+            result["status"] = 200
+            result["progress"] = build_progress_document(
+                definitions, level_progress.get(student.id, {}), achievement_progress.get(student.id, {})
+            )
+        results[i] = result
+
+    return encode_response(request, {"results": results})
@@ -1,14 +1,22 @@
 from collections import OrderedDict
 
-from django.http import JsonResponse
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db.models import Q
+from django.http import JsonResponse, HttpResponseNotModified
+from django.utils.cache import patch_vary_headers
 from django.views.decorators.csrf import csrf_exempt
 
 from GameProgress.models import (
     LevelProgress,
     AchievementProgress,
-    LevelDefinition,
-    AchievementDefinition,
+    DefinitionTombstone,
 )
+from GameProgress.services.definitions import get_definitions
+from GameProgress.services.progress_versions import get_progress_versions, format_sync_token, parse_sync_token
+from GameProgress.services.progress_writes import flush_student_progress
+from GameProgress.views.request_guards import SingleFlight, rate_limited
+from GameProgress.views.wire_format import encode_response, representation_etag
 from StudentManagementSystem.decorators.custom_decorators import api_login_required
 from StudentManagementSystem.models.roles import Role
 
@@ -26,62 +34,193 @@ ACHIEVEMENT_TYPE = (
     "PublicKeyToken=null]],mscorlib"
 )
 
+_progress_reads = SingleFlight()
 
+
+def _since_token(request):
+    """The `since` sync token (POST or GET), or None for a full document."""
+    return request.POST.get("since") or request.GET.get("since")
+
+
+@rate_limited("progress-read", by="ip")
 @api_login_required(role=Role.STUDENT, lookup_kwarg="student_id")
+@rate_limited("progress-read", by="student")
 @csrf_exempt
-def get_game_progress(request, student_id):
+async def get_game_progress(request, student_id):
+    """
+    Async (ASGI) save download: a slow client holds a coroutine, not a worker thread.
+    Transactional / raw-SQL services run through sync_to_async; progress rows use the async ORM.
+    """
     # 🔹 Fetch student (only the ID for efficiency)
     student = request.user_obj
 
+    # 🔹 Delta mode: since=<student version>.<definitions version> (or the ETag of the client's last copy)
+    since = _since_token(request)
+    if since:
+        try:
+            since = parse_sync_token(since)
+        except ValueError:
+            return JsonResponse({"error": "Invalid since token (expected <version>.<version>)"}, status=400)
+
+    # 🔹 Write-behind: apply this student's buffered saves first (read-your-writes)
+    if settings.PROGRESS_WRITE_BEHIND:
+        await sync_to_async(flush_student_progress)([student.id])
+
+    # 🔹 Revalidation: unchanged progress + definitions → 304 without touching progress tables
+    student_version, definitions_version = await sync_to_async(get_progress_versions)(student.id)
+    etag = representation_etag(request, format_sync_token(student_version, definitions_version))
+    if etag in [tag.strip().removeprefix("W/") for tag in request.META.get("HTTP_IF_NONE_MATCH", "").split(",")]:
+        response = HttpResponseNotModified()
+        response["ETag"] = etag
+        patch_vary_headers(response, ("Accept", "Accept-Encoding"))
+        return response
+
+    # 🔹 Definitions come from this worker's registry (no query: the version was just read)
+    definitions = await sync_to_async(get_definitions)(definitions_version)
+
+    # 🔹 Identical in-flight reads (same student, since and version) share one fetch
+    data = await _progress_reads.run(
+        (student.id, since, student_version, definitions_version),
+        _load_progress, student, definitions, since, (student_version, definitions_version),
+    )
+    response = encode_response(request, data)
+    response["ETag"] = etag
+    return response
+
+
+async def _load_progress(student, definitions, since, version):
+    """Delta (when `since` is given) or full save document for one student."""
+    if since:
+        return await sync_to_async(build_progress_delta)(student, definitions, *since, version=version)
+
     # 🔹 Bulk-fetch progress
     level_progress = {
         p.level_id: p
-        for p in LevelProgress.objects.filter(student=student)
+        async for p in LevelProgress.objects.filter(student=student)
         .only("level_id", "best_time", "current_time", "unlocked")
     }
     achievement_progress = {
         p.achievement_id: p
-        for p in AchievementProgress.objects.filter(student=student)
+        async for p in AchievementProgress.objects.filter(student=student)
         .only("achievement_id", "unlocked")
     }
+    return build_progress_document(definitions, level_progress, achievement_progress)
 
-    # ------------------------------
-    # Levels (ordered by sort_order via model Meta)
-    # ------------------------------
+
+def _level_entry(level, p):
+    return {
+        "bestTime": p.best_time if p else 0,
+        "currentTime": p.current_time if p else 0,
+        "unlocked": p.unlocked if p else level.unlocked,
+    }
+
+
+def _achievement_entry(ach, p):
+    return {
+        "title": ach.title,
+        "description": ach.description,
+        "unlocked": p.unlocked if p else False,
+    }
+
+
+def _document(levels, achievements):
+    return {
+        "levels": {
+            "__type": LEVEL_TYPE,
+            "value": levels,
+        },
+        "achievements": {
+            "__type": ACHIEVEMENT_TYPE,
+            "value": achievements,
+        },
+    }
+
+
+def build_progress_document(definitions, level_progress, achievement_progress):
+    """
+    Full Unity save document from one student's progress rows ({level_id: row}, {achievement_id: row}).
+    Levels follow sort_order, achievements follow code (only globally active ones).
+    """
     levels = OrderedDict()
-    for level in LevelDefinition.objects.only("id", "name", "unlocked", "sort_order"):
+    for level in definitions.levels:
+        levels[level.name] = _level_entry(level, level_progress.get(level.id))
+
+    achievements = OrderedDict()
+    for ach in definitions.active_achievements:
+        achievements[ach.code] = _achievement_entry(ach, achievement_progress.get(ach.id))
+
+    return _document(levels, achievements)
+
+
+# ============================================================
+# 🔹 DELTA SYNC
+# ============================================================
+
+def load_tombstones(since_definitions_version):
+    """[(kind, key, version), ...] of definitions removed after the given version."""
+    return list(
+        DefinitionTombstone.objects.filter(version__gt=since_definitions_version)
+        .values_list("kind", "key", "version")
+    )
+
+
+def build_delta_document(definitions, level_progress, achievement_progress, since, version, tombstones):
+    """
+    Only what changed after the client's `since` token: levels / achievements whose progress row
+    or definition carries a newer version, plus definitions removed since (deleted, renamed or
+    deactivated). Progress rows must include `version`; extra (unchanged) rows are ignored.
+    `version` is the token read BEFORE the rows, so a write racing this read is sent again
+    next time rather than lost.
+    """
+    sv, dv = since
+
+    levels = OrderedDict()
+    for level in definitions.levels:
         p = level_progress.get(level.id)
-        levels[level.name] = {
-            "bestTime": p.best_time if p else 0,
-            "currentTime": p.current_time if p else 0,
-            "unlocked": p.unlocked if p else level.unlocked,
-        }
-
-    # ------------------------------
-    # Achievements (ordered by code via model Meta)
-    # ------------------------------
+        if level.version > dv or (p is not None and p.version > sv):
+            levels[level.name] = _level_entry(level, p)
+
     achievements = OrderedDict()
-    for ach in AchievementDefinition.objects.filter(is_active=True).only("id", "code", "title", "description"):
+    for ach in definitions.active_achievements:
         p = achievement_progress.get(ach.id)
-        achievements[ach.code] = {
-            "title": ach.title,
-            "description": ach.description,
-            "unlocked": p.unlocked if p else False,
-        }
-
-    # ------------------------------
-    # Response
-    # ------------------------------
-    return JsonResponse(
-        {
-            "levels": {
-                "__type": LEVEL_TYPE,
-                "value": levels,
-            },
-            "achievements": {
-                "__type": ACHIEVEMENT_TYPE,
-                "value": achievements,
-            },
+        if ach.version > dv or (p is not None and p.version > sv):
+            achievements[ach.code] = _achievement_entry(ach, p)
+
+    removed = {"levels": set(), "achievements": set()}
+    for kind, key, removed_version in tombstones:
+        if removed_version > dv:
+            removed["levels" if kind == DefinitionTombstone.LEVEL else "achievements"].add(key)
+    removed["achievements"] |= {ach.code for ach in definitions.achievements if not ach.is_active and ach.version > dv}
+
+    return {
+        "version": format_sync_token(*version),
+        "since": format_sync_token(sv, dv),
+        **_document(levels, achievements),
+        # 🔹 A key can be removed and re-created within one delta window: the live entry wins
+        "removed": {
+            "levels": sorted(removed["levels"] - set(levels)),
+            "achievements": sorted(removed["achievements"] - set(achievements)),
         },
-        json_dumps_params={"indent": 4},
+    }
+
+
+def build_progress_delta(student, definitions, since_student_version, since_definitions_version, version):
+    """Delta document for one student, fetching only the changed progress rows."""
+    sv, dv = since_student_version, since_definitions_version
+    changed = Q(version__gt=sv)
+
+    level_progress = {
+        p.level_id: p
+        for p in LevelProgress.objects.filter(student=student)
+        .filter(changed | Q(level_id__in=[level.id for level in definitions.levels if level.version > dv]))
+        .only("level_id", "best_time", "current_time", "unlocked", "version")
+    }
+    achievement_progress = {
+        p.achievement_id: p
+        for p in AchievementProgress.objects.filter(student=student)
+        .filter(changed | Q(achievement_id__in=[ach.id for ach in definitions.achievements if ach.version > dv]))
+        .only("achievement_id", "unlocked", "version")
+    }
+    return build_delta_document(
+        definitions, level_progress, achievement_progress, (sv, dv), version, load_tombstones(dv)
     )
@@ -0,0 +1,32 @@
+from django.http import JsonResponse
+from django.views.decorators.csrf import csrf_exempt
+
+from GameProgress.services.level_leaderboard import get_level_leaderboard, compact_leaderboard
+from GameProgress.views.wire_format import encode_response
+from StudentManagementSystem.decorators.custom_decorators import api_login_required
+from StudentManagementSystem.models.roles import Role
+
+
+@csrf_exempt
+@api_login_required(role=Role.STUDENT)
+def get_level_leaderboard_api(request, level_name):
+    """
+    Compact best-times leaderboard for one level.
+    Optional `limit` (default 10), `filter_by` (e.g. "CS2B") and `department`.
+    """
+    params = request.POST
+    try:
+        limit = int(params.get("limit") or 10)
+    except ValueError:
+        return JsonResponse({"error": "limit must be an integer"}, status=400)
+
+    leaderboard = get_level_leaderboard(
+        level_name,
+        limit=limit,
+        filter_by=params.get("filter_by") or None,
+        department_filter=params.get("department") or None,
+    )
+    if leaderboard is None:
+        return JsonResponse({"error": "Level not found"}, status=404)
+
+    return encode_response(request, compact_leaderboard(leaderboard))
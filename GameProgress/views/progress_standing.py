@@ -0,0 +1,23 @@
+from django.http import JsonResponse
+from django.views.decorators.csrf import csrf_exempt
+
+from GameProgress.services.standing import get_student_standing
+from GameProgress.views.wire_format import encode_response
+from StudentManagementSystem.decorators.custom_decorators import api_login_required
+from StudentManagementSystem.models.roles import Role
+
+
+@csrf_exempt
+@api_login_required(role=Role.STUDENT, lookup_kwarg="student_id")
+def get_student_rank(request, student_id):
+    """
+    Student's global / section rank, percentile and nearby leaderboard entries.
+    Optional `neighbours` (default 3, max 10) sets how many students are returned above and below.
+    """
+    neighbours = request.POST.get("neighbours") or request.GET.get("neighbours") or 3
+    try:
+        neighbours = int(neighbours)
+    except (TypeError, ValueError):
+        return JsonResponse({"error": "neighbours must be an integer"}, status=400)
+
+    return encode_response(request, get_student_standing(request.user_obj, neighbours=neighbours))
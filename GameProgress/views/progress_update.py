@@ -1,108 +1,65 @@
-import json
-
-from django.db import transaction
+from asgiref.sync import sync_to_async
+from django.conf import settings
 from django.http import JsonResponse, HttpResponseBadRequest
 from django.views.decorators.csrf import csrf_exempt
 
-from GameProgress.models import (
-    LevelDefinition,
-    LevelProgress,
-    AchievementDefinition,
-    AchievementProgress,
-)
+from GameProgress.services.progress_writes import parse_save_identity, rejected_save, save_progress_payload
+from GameProgress.views.request_guards import rate_limited
+from GameProgress.views.wire_format import decode_payload, encode_response
 from StudentManagementSystem.decorators.custom_decorators import api_login_required
 from StudentManagementSystem.models.roles import Role
 
 
+def _save_identity(request):
+    """
+    (seq, idempotency key) of a save: `X-Save-Seq` / `Idempotency-Key` headers,
+    or `seq` / `idempotency_key` form fields. Raises ValueError when malformed.
+    """
+    return parse_save_identity(
+        request.headers.get("X-Save-Seq") or request.POST.get("seq"),
+        request.headers.get("Idempotency-Key") or request.POST.get("idempotency_key"),
+    )
+
+
 @csrf_exempt
+@rate_limited("progress-update", by="ip")
 @api_login_required(role=Role.STUDENT, lookup_kwarg="student_id")
-def update_game_progress(request, student_id):
+@rate_limited("progress-update", by="student")
+async def update_game_progress(request, student_id):
     """
     Updates a student's existing level and achievement progress.
     - Ownership & role enforced by api_login_required.
     - Does not create new progress records.
+    - Accepts the payload as a JSON or msgpack body, or as the legacy `payload` form field.
+    - Responds with the number of level / achievement rows actually changed,
+      or 202 "queued" when PROGRESS_WRITE_BEHIND buffers the save.
+    - Optional save sequence number / idempotency key (see _save_identity): saves already applied
+      answer "duplicate" (with the original result), older ones "stale"; neither is applied again.
+    - Token-bucket limited per student and per IP (429 + Retry-After, see PROGRESS_RATE_LIMITS).
+    - Async (ASGI): the transactional write runs through sync_to_async.
     """
     if request.method != "POST":
         return HttpResponseBadRequest("POST required")
 
     try:
         student = request.user_obj  # ✅ injected by decorator
-        data = json.loads(request.POST.get("payload"))
-
-        # Prefetch existing progress
-        existing_levels = {
-            lp.level_id: lp
-            for lp in LevelProgress.objects.filter(student=student)
-        }
-        existing_achs = {
-            ap.achievement_id: ap
-            for ap in AchievementProgress.objects.filter(student=student)
-        }
-
-        # Bulk fetch definitions (ordered by Meta)
-        level_defs = {lvl.name: lvl for lvl in LevelDefinition.objects.all()}
-        achievement_defs = {
-            ach.code: ach
-            for ach in AchievementDefinition.objects.filter(is_active=True)
-        }
-
-        update_level_objs, update_ach_objs = [], []
-
-        # ------------------------------
-        # Levels
-        # ------------------------------
-        for name, values in data.get("levels", {}).get("value", {}).items():
-            level = level_defs.get(name)
-            if not level:
-                continue
-
-            progress = existing_levels.get(level.id)
-            if not progress:
-                continue  # skip if no existing record
-
-            current = int(values.get("currentTime", 0))
-            best = int(values.get("bestTime", 0))
-
-            if current < 0 or best < 0:
-                continue
-
-            if best < progress.best_time:
-                best = progress.best_time
-
-            progress.current_time = current
-            progress.best_time = best
-            progress.unlocked = values.get("unlocked", progress.unlocked)
-            update_level_objs.append(progress)
-
-        # ------------------------------
-        # Achievements
-        # ------------------------------
-        for code, values in data.get("achievements", {}).get("value", {}).items():
-            ach = achievement_defs.get(code)
-            if not ach:
-                continue
-
-            progress = existing_achs.get(ach.id)
-            if not progress:
-                continue  # skip if no existing record
+        seq, key = _save_identity(request)
 
-            unlocked = bool(values.get("unlocked", False))
-            if unlocked and not progress.unlocked:
-                progress.unlocked = True
-                update_ach_objs.append(progress)
+        # 🔹 Retries / out-of-order saves: one primary-key read, before the body is even decoded
+        rejected = await sync_to_async(rejected_save)(student.id, seq, key)
+        if rejected:
+            return encode_response(request, rejected)
 
-        # ------------------------------
-        # Batch update inside a transaction
-        # ------------------------------
-        with transaction.atomic():
-            if update_level_objs:
-                LevelProgress.objects.bulk_update(
-                    update_level_objs, ["current_time", "best_time", "unlocked"]
-                )
-            if update_ach_objs:
-                AchievementProgress.objects.bulk_update(update_ach_objs, ["unlocked"])
+        data = decode_payload(request)  # 🔹 JSON / msgpack body (gzip / br) or legacy "payload" field
 
-        return JsonResponse({"status": "updated"})
+        # 🔹 One UPDATE per table (best_time never goes down, unchanged rows are skipped),
+        #    or with write-behind: buffer the save; the flusher applies it within seconds
+        result = await sync_to_async(save_progress_payload)(
+            student.id, data, seq, key, buffered=settings.PROGRESS_WRITE_BEHIND
+        )
+        return encode_response(request, result, status=202 if result["status"] == "queued" else 200)
 
+    except ValueError as e:
+        return JsonResponse({"error": f"Invalid payload: {e}"}, status=400)
     except Exception as e:
         return JsonResponse({"error": str(e)}, status=500)
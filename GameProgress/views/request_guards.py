@@ -0,0 +1,165 @@
+import asyncio
+import ipaddress
+import math
+import threading
+import time
+from concurrent.futures import Future
+from functools import wraps
+
+from asgiref.sync import iscoroutinefunction
+from django.conf import settings
+from django.core.cache import cache
+from django.http import JsonResponse
+
+
+# ============================================================
+# 🔹 RATE LIMITING (token buckets)
+# ============================================================
+# One bucket per (endpoint, student) and per (endpoint, client IP), sized by
+# PROGRESS_RATE_LIMITS {"student" | "ip": (tokens per second, burst)}.
+# A bucket is stored as its "theoretical arrival time" (GCRA): one float per key, no timer.
+# Backend "memory" keeps buckets in this worker; "cache" shares them through Django's
+# cache (use a shared CACHES backend such as Redis / Memcached for that to matter).
+# The IP is the TCP peer (REMOTE_ADDR); X-Forwarded-For only counts when that peer is one of
+# PROGRESS_TRUSTED_PROXIES, and then only the entries those proxies appended themselves.
+
+_buckets = {}
+_buckets_lock = threading.Lock()
+_BUCKET_PRUNE_SIZE = 10000  # 🔹 drop idle buckets once this many keys accumulate
+
+
+def _is_trusted_proxy(address):
+    try:
+        ip = ipaddress.ip_address(address)
+    except ValueError:
+        return False
+    return any(ip in ipaddress.ip_network(network, strict=False) for network in settings.PROGRESS_TRUSTED_PROXIES)
+
+
+def client_ip(request):
+    """
+    Address a request is rate-limited by. Client-sent X-Forwarded-For entries are ignored:
+    behind trusted proxies, the rightmost entry not added by one of them is the client.
+    """
+    address = request.META.get("REMOTE_ADDR")
+    if not _is_trusted_proxy(address):
+        return address
+    forwarded = [entry.strip() for entry in request.META.get("HTTP_X_FORWARDED_FOR", "").split(",")]
+    for entry in reversed(forwarded):
+        if not entry or not _is_trusted_proxy(entry):
+            return entry or address
+        address = entry
+    return address
+
+
+def _advance(tat, now, rate, burst):
+    """(new arrival time or None when rejected, seconds until the next token)."""
+    interval = 1.0 / rate
+    tat = max(tat or now, now)
+    wait = tat - (burst - 1) * interval - now
+    if wait > 0:
+        return None, wait
+    return tat + interval, 0.0
+
+
+def take_token(key, rate, burst):
+    """Take one token from bucket `key`. Returns 0 when allowed, else seconds to wait."""
+    now = time.time()
+    if settings.PROGRESS_RATE_LIMIT_BACKEND == "cache":
+        # Best effort: two workers racing on one key may both pass, never both be refused
+        new_tat, wait = _advance(cache.get(f"rate:{key}"), now, rate, burst)
+        if new_tat is not None:
+            cache.set(f"rate:{key}", new_tat, math.ceil(new_tat - now) + 1)
+        return wait
+
+    with _buckets_lock:
+        if len(_buckets) >= _BUCKET_PRUNE_SIZE:
+            for stale in [k for k, tat in _buckets.items() if tat <= now]:
+                del _buckets[stale]
+        new_tat, wait = _advance(_buckets.get(key), now, rate, burst)
+        if new_tat is not None:
+            _buckets[key] = new_tat
+        return wait
+
+
+def _limit_error(scope, kind, value):
+    """429 JsonResponse (with Retry-After) when the bucket is empty, else None."""
+    rate, burst = settings.PROGRESS_RATE_LIMITS.get(kind, (0, 0))
+    if rate <= 0 or value is None:
+        return None
+    wait = take_token(f"{scope}:{kind}:{value}", rate, burst)
+    if not wait:
+        return None
+    response = JsonResponse({"error": "Too many requests", "retry_after": round(wait, 2)}, status=429)
+    response["Retry-After"] = str(math.ceil(wait))
+    return response
+
+
+def rate_limited(scope, by):
+    """
+    Token-bucket limit on an API view (sync or async), keyed by `by`:
+    - "ip": the client IP; put it OUTSIDE api_login_required so floods never reach credential checks
+    - "student": the authenticated student; put it INSIDE api_login_required (needs request.user_obj)
+    """
+
+    def key_for(request):
+        if by == "ip":
+            return client_ip(request)
+        user = getattr(request, "user_obj", None)
+        return user.id if user is not None else None
+
+    def decorator(view_func):
+        if iscoroutinefunction(view_func):
+            @wraps(view_func)
+            async def _async_wrapped_view(request, *args, **kwargs):
+                return _limit_error(scope, by, key_for(request)) or await view_func(request, *args, **kwargs)
+
+            return _async_wrapped_view
+
+        @wraps(view_func)
+        def _wrapped_view(request, *args, **kwargs):
+            return _limit_error(scope, by, key_for(request)) or view_func(request, *args, **kwargs)
+
+        return _wrapped_view
+
+    return decorator
+
+
+# ============================================================
+# 🔹 READ COALESCING (single flight)
+# ============================================================
+
+class SingleFlight:
+    """
+    Concurrent calls with the same key share one execution: the first caller runs
+    `func`, later ones await its result. Works across event loops (one per request
+    thread under WSGI), and a disconnecting first caller does not cancel the others.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+
+    async def run(self, key, func, *args):
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = self._calls[key] = Future()
+        if not leader:
+            return await asyncio.wrap_future(future)
+
+        task = asyncio.ensure_future(func(*args))
+
+        def _finish(done):
+            with self._lock:
+                del self._calls[key]
+            if done.cancelled():
+                future.cancel()
+            elif done.exception() is not None:
+                future.set_exception(done.exception())
+            else:
+                future.set_result(done.result())
+
+        task.add_done_callback(_finish)
+        return await asyncio.shield(task)
@@ -0,0 +1,138 @@
+import gzip
+import json
+import zlib
+
+import brotli
+import msgpack
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import HttpResponse
+from django.utils.cache import patch_vary_headers
+
+JSON_TYPE = "application/json"
+MSGPACK_TYPES = ("application/msgpack", "application/x-msgpack")
+
+# Bodies smaller than this are sent uncompressed (same cut-off as Django's GZipMiddleware)
+MIN_COMPRESS_BYTES = 200
+BROTLI_QUALITY = 5  # 🔹 fast enough per request, still well ahead of gzip on repeated __type strings
+
+
+# ============================================================
+# 🔹 RESPONSES
+# ============================================================
+
+def _qvalues(header):
+    """{token: q} from an Accept / Accept-Encoding header (q=0 means "not acceptable")."""
+    accepted = {}
+    for part in header.split(","):
+        token, *params = [piece.strip() for piece in part.split(";")]
+        q = 1.0
+        for param in params:
+            if param.startswith("q="):
+                try:
+                    q = float(param[2:])
+                except ValueError:
+                    q = 0.0
+        if token:
+            accepted[token.lower()] = max(q, accepted.get(token.lower(), 0.0))
+    return accepted
+
+
+def _accepted_encodings(request):
+    return _qvalues(request.headers.get("Accept-Encoding", ""))
+
+
+def wants_msgpack(request):
+    """msgpack when the client accepts it (q > 0) at least as much as JSON."""
+    accepted = _qvalues(request.headers.get("Accept", ""))
+    msgpack_q = max(accepted.get(media_type, 0.0) for media_type in MSGPACK_TYPES)
+    json_q = max(accepted.get(media_type, 0.0) for media_type in (JSON_TYPE, "application/*", "*/*"))
+    return msgpack_q > 0 and msgpack_q >= json_q
+
+
+def negotiate(request):
+    """(content type, content coding or None) this request gets for a compressible body."""
+    content_type = MSGPACK_TYPES[0] if wants_msgpack(request) else JSON_TYPE
+    accepted = _accepted_encodings(request)
+    if accepted.get("br", 0) > 0:
+        return content_type, "br"
+    if accepted.get("gzip", 0) > 0:
+        return content_type, "gzip"
+    return content_type, None
+
+
+def representation_etag(request, token):
+    """
+    Strong ETag for `token` in the representation this request negotiates,
+    e.g. "12.3;msgpack+br": a 304 never validates a copy in another format or coding.
+    """
+    content_type, encoding = negotiate(request)
+    variant = "msgpack" if content_type in MSGPACK_TYPES else "json"
+    return f'"{token};{variant}{"+" + encoding if encoding else ""}"'
+
+
+def encode_response(request, data, status=200):
+    """
+    Negotiated API response: msgpack when the client Accepts it, minified JSON otherwise,
+    brotli / gzip compressed when Accept-Encoding allows and the body is worth it.
+    """
+    content_type, encoding = negotiate(request)
+    if content_type in MSGPACK_TYPES:
+        body = msgpack.packb(data, use_bin_type=True)
+    else:
+        body = json.dumps(data, cls=DjangoJSONEncoder, separators=(",", ":")).encode()
+
+    if len(body) < MIN_COMPRESS_BYTES:
+        encoding = None
+    elif encoding == "br":
+        body = brotli.compress(body, quality=BROTLI_QUALITY)
+    elif encoding == "gzip":
+        body = gzip.compress(body, mtime=0)
+
+    response = HttpResponse(body, status=status, content_type=content_type)
+    if encoding:
+        response["Content-Encoding"] = encoding
+    patch_vary_headers(response, ("Accept", "Accept-Encoding"))
+    return response
+
+
+# ============================================================
+# 🔹 REQUEST PAYLOADS
+# ============================================================
+
+def _decompress(body, encoding):
+    """Inflate a request body, never past the upload limit (+1 byte, to detect bombs)."""
+    limit = settings.DATA_UPLOAD_MAX_MEMORY_SIZE or 2621440
+    try:
+        if encoding in ("", "identity"):
+            data = body
+        elif encoding == "gzip":
+            data = zlib.decompressobj(16 + zlib.MAX_WBITS).decompress(body, limit + 1)
+        elif encoding == "br":
+            data = brotli.Decompressor().process(body, output_buffer_limit=limit + 1)
+        else:
+            raise ValueError(f"Unsupported Content-Encoding: {encoding}")
+    except (zlib.error, brotli.error) as e:
+        raise ValueError(f"Corrupt {encoding} body: {e}")
+    if len(data) > limit:
+        raise ValueError("Payload too large")
+    return data
+
+
+def decode_payload(request):
+    """
+    Save payload of an API request, in any of the accepted formats:
+      - body with Content-Type application/json or application/msgpack (optionally gzip / br encoded)
+      - legacy form field `payload` holding a JSON string
+    Raises ValueError on malformed or missing payloads.
+    """
+    if request.content_type == JSON_TYPE or request.content_type in MSGPACK_TYPES:
+        body = _decompress(request.body, request.headers.get("Content-Encoding", "").strip().lower())
+        if request.content_type == JSON_TYPE:
+            return json.loads(body)
+        return msgpack.unpackb(body, raw=False)
+
+    payload = request.POST.get("payload")
+    if payload is None:
+        raise ValueError("Missing payload")
+    return json.loads(payload)
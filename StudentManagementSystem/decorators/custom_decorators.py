@@ -1,11 +1,14 @@
 from functools import wraps
 
+from asgiref.sync import iscoroutinefunction, sync_to_async
 from django.contrib.auth.hashers import check_password
 from django.http.response import JsonResponse
 from django.shortcuts import redirect, get_object_or_404
 
 from StudentManagementSystem.models import Student, Teacher, SimpleAdmin
 from StudentManagementSystem.models.roles import Role
+from StudentManagementSystem.views.students.api.api_token import get_student_for_token
+from StudentManagementSystem.views.students.api.password_check import acheck_password
 
 
 def session_login_required(role=None, lookup_kwarg="id"):
@@ -60,60 +63,132 @@ def session_login_required(role=None, lookup_kwarg="id"):
     return decorator
 
 
+# Credential lookup per role: (model, identifier field)
+API_LOGIN_MODELS = {
+    Role.STUDENT: (Student, "student_id"),
+    Role.TEACHER: (Teacher, "teacher_id"),
+    Role.ADMIN: (SimpleAdmin, "username"),
+}
+
+
+def get_bearer_token(request):
+    """Token from `Authorization: Bearer <token>` (or a `token` form field)."""
+    header = request.META.get("HTTP_AUTHORIZATION", "")
+    if header.startswith("Bearer "):
+        return header[len("Bearer "):].strip()
+    return request.POST.get("token")
+
+
+def _api_allowed_roles(role):
+    """Roles an API view accepts (all API_LOGIN_MODELS when unspecified)."""
+    return (
+        role if isinstance(role, (list, tuple, set))
+        else [role] if role else list(API_LOGIN_MODELS)
+    )
+
+
+def _api_access_error(user, user_role, allowed_roles, requested_id):
+    """Role / ownership check shared by the sync and async API decorators (JsonResponse or None)."""
+    # Role restriction
+    if user_role not in allowed_roles:
+        return JsonResponse({"error": "Insufficient role"}, status=403)
+
+    # Ownership enforcement
+    if requested_id is not None and str(requested_id) != str(user.id):
+        return JsonResponse({"error": "Forbidden"}, status=403)
+    return None
+
+
 def api_login_required(role=None, lookup_kwarg="id"):
     """
     API decorator:
-    - Reads `student_id` and `password` from request.POST / request.body
-    - Confirms user exists and password matches
+    - Prefers a signed bearer token from api_student_login (HMAC check, no password hashing)
+    - Falls back to `student_id` and `password` from request.POST for older clients
     - Role restriction (if specified)
     - Injects user into `request.user_obj`
+    - Async views get an async wrapper: async ORM lookups, password hashing on the bounded executor
     """
 
     def decorator(view_func):
+        if iscoroutinefunction(view_func):
+            @wraps(view_func)
+            async def _async_wrapped_view(request, *args, **kwargs):
+                allowed_roles = _api_allowed_roles(role)
+
+                user = None
+                user_role = None
+
+                token = get_bearer_token(request)
+                if token:
+                    user = await sync_to_async(get_student_for_token)(token)
+                    if not user:
+                        return JsonResponse({"error": "Invalid or expired token"}, status=401)
+                    user_role = Role.STUDENT
+                else:
+                    user_id = request.POST.get("student_id") or request.POST.get("user_id")
+                    password = request.POST.get("password")
+
+                    if not user_id or not password:
+                        return JsonResponse({"error": "Missing credentials"}, status=400)
+
+                    for role_type in allowed_roles:
+                        model, id_field = API_LOGIN_MODELS[role_type]
+                        obj = await model.objects.filter(**{id_field: user_id}).afirst()
+                        if obj and await acheck_password(password, obj.password):
+                            user = obj
+                            user_role = role_type
+                            break
+
+                    if not user:
+                        return JsonResponse({"error": "Invalid credentials"}, status=401)
+
+                error = _api_access_error(user, user_role, allowed_roles, kwargs.get(lookup_kwarg))
+                if error:
+                    return error
+
+                request.user_obj = user
+                return await view_func(request, *args, **kwargs)
+
+            return _async_wrapped_view
+
         @wraps(view_func)
         def _wrapped_view(request, *args, **kwargs):
-            # Extract credentials (works with form-data or JSON body)
-            user_id = request.POST.get("student_id") or request.POST.get("user_id")
-            password = request.POST.get("password")
-
-            if not user_id or not password:
-                return JsonResponse({"error": "Missing credentials"}, status=400)
-
             # Which roles are allowed?
-            allowed_roles = (
-                role if isinstance(role, (list, tuple, set))
-                else [role] if role else []
-            )
+            allowed_roles = _api_allowed_roles(role)
 
-            # Try each role type
             user = None
             user_role = None
 
-            for model, role_type in [
-                (Student, Role.STUDENT),
-                (Teacher, Role.TEACHER),
-                (SimpleAdmin, Role.ADMIN),
-            ]:
-                try:
-                    obj = model.objects.get(student_id=user_id)
-                    if check_password(password, obj.password):  # assumes hashed pw
+            token = get_bearer_token(request)
+            if token:
+                user = get_student_for_token(token)
+                if not user:
+                    return JsonResponse({"error": "Invalid or expired token"}, status=401)
+                user_role = Role.STUDENT
+            else:
+                # Extract credentials (works with form-data or JSON body)
+                user_id = request.POST.get("student_id") or request.POST.get("user_id")
+                password = request.POST.get("password")
+
+                if not user_id or not password:
+                    return JsonResponse({"error": "Missing credentials"}, status=400)
+
+                # Only look in the tables of allowed roles, each by its own identifier field
+                for role_type in allowed_roles:
+                    model, id_field = API_LOGIN_MODELS[role_type]
+                    obj = model.objects.filter(**{id_field: user_id}).first()
+                    if obj and check_password(password, obj.password):  # assumes hashed pw
                         user = obj
                         user_role = role_type
                         break
-                except model.DoesNotExist:
-                    continue
-
-            if not user:
-                return JsonResponse({"error": "Invalid credentials"}, status=401)
 
-            # Role restriction
-            if allowed_roles and user_role not in allowed_roles:
-                return JsonResponse({"error": "Insufficient role"}, status=403)
+                if not user:
+                    return JsonResponse({"error": "Invalid credentials"}, status=401)
 
-            # Ownership enforcement
-            requested_id = kwargs.get(lookup_kwarg)
-            if requested_id is not None and str(requested_id) != str(user.id):
-                return JsonResponse({"error": "Forbidden"}, status=403)
+            # Role restriction / ownership enforcement
+            error = _api_access_error(user, user_role, allowed_roles, kwargs.get(lookup_kwarg))
+            if error:
+                return error
 
             # Inject into request
             request.user_obj = user
@@ -41,6 +41,11 @@ def admin_dashboard(request):
 # --- Only ranking stays async ---
 @session_login_required(Role.ADMIN)
 def dashboard_ranking(request):
+    year_filter = request.GET.get("year", "").strip()
     return JsonResponse({
-        "ranking_by_section": get_section_rankings()
+        "ranking_by_section": get_section_rankings(
+            sort_order=request.GET.get("sort_order", "desc"),
+            department_filter=request.GET.get("department") or None,
+            year_filter=int(year_filter) if year_filter.isdigit() else None,
+        )
     })
@@ -2,13 +2,15 @@ from django.contrib import messages
 from django.http.response import JsonResponse
 from django.shortcuts import redirect, get_object_or_404
 
-from GameProgress.models import LevelDefinition, AchievementDefinition
+from GameProgress.models import LevelDefinition, AchievementDefinition, DefinitionTombstone
+from GameProgress.services.progress_versions import touch_definitions, tombstone_definition
 from StudentManagementSystem.decorators.custom_decorators import session_login_required
 from StudentManagementSystem.models import Teacher
 from StudentManagementSystem.models.roles import Role
 from StudentManagementSystem.views.logger import create_log
 from StudentManagementSystem.views.notifications_helper import create_notification
-from StudentManagementSystem.views.sync_all_progress import run_sync_in_background
+from StudentManagementSystem.views.sync_all_progress import run_sync_in_background, \
+    run_scoreboard_rebuild_in_background
 
 
 # Add Level View
@@ -26,7 +28,8 @@ def add_level(request):
             )
 
             if created:
-                run_sync_in_background()
+                touch_definitions(LevelDefinition.objects.filter(pk=level.pk))
+                run_sync_in_background("sync_level_progress", level.id)
                 messages.success(request, f"Level '{level_name}' has been created successfully.",
                                  extra_tags=message_tag)
                 create_log(request, "CREATE", f"Admin {admin.username} created level '{level_name}'.")
@@ -48,7 +51,9 @@ def delete_level(request, level_id):
         admin = request.user_obj  # ✅ validated SimpleAdmin
 
         level.delete()
-        run_sync_in_background()
+        tombstone_definition(DefinitionTombstone.LEVEL, level_name)
+        # 🔹 Progress rows went with the cascade; only the scoreboard needs rebuilding
+        run_scoreboard_rebuild_in_background()
         create_log(request, "DELETE", f"Admin {admin.username} deleted level '{level_name}'.")
 
         return JsonResponse({'success': True})
@@ -73,7 +78,8 @@ def add_achievement(request):
             )
 
             if created:
-                run_sync_in_background()
+                touch_definitions(AchievementDefinition.objects.filter(pk=achievement.pk))
+                run_sync_in_background("sync_achievement_progress", achievement.id)
                 messages.success(request, f"Achievement '{ach_title}' created.", extra_tags=message_tag)
                 create_log(request, "CREATE", f"Admin {admin.username} created achievement '{ach_title}'.")
 
@@ -102,10 +108,13 @@ def delete_achievement(request, achievement_id):
     if request.method == 'POST':
         achievement = get_object_or_404(AchievementDefinition, id=achievement_id)
         ach_title = achievement.title
+        ach_code = achievement.code
         admin = request.user_obj  # ✅ validated SimpleAdmin
 
         achievement.delete()
-        run_sync_in_background()
+        tombstone_definition(DefinitionTombstone.ACHIEVEMENT, ach_code)
+        # 🔹 Progress rows went with the cascade; only the scoreboard needs rebuilding
+        run_scoreboard_rebuild_in_background()
         create_log(request, "DELETE", f"Admin {admin.username} deleted achievement '{ach_title}'.")
 
         return JsonResponse({'success': True})
@@ -152,13 +161,18 @@ def edit_achievement(request, achievement_id):
 
         # Update achievement
         old_title = achievement.title
-        achievement.code = ach_code
-        achievement.title = ach_title
-        achievement.description = ach_description
-        achievement.is_active = ach_is_active
-        achievement.save()
+        old_code = achievement.code
+        touch_definitions(
+            AchievementDefinition.objects.filter(pk=achievement.pk),
+            code=ach_code,
+            title=ach_title,
+            description=ach_description,
+            is_active=ach_is_active,
+        )
+        if ach_code != old_code:
+            # 🪦 Delta-sync clients still hold the old code
+            tombstone_definition(DefinitionTombstone.ACHIEVEMENT, old_code)
 
-        run_sync_in_background()
         create_log(request, "UPDATE", f"Admin {admin.username} updated achievement '{old_title}' to '{ach_title}'.")
 
         return JsonResponse({'success': True, 'message': f"Achievement '{ach_title}' updated successfully."})
@@ -174,7 +188,7 @@ def force_sync_everyone(request):
     if request.method == 'POST':
         try:
             run_sync_in_background()
-            messages.success(request, 'Everyone synced successfully!', extra_tags=message_tag)
+            messages.success(request, 'Sync queued for everyone!', extra_tags=message_tag)
             create_log(request, "UPDATE", f"Admin {admin.username} triggered force sync.")
         except Exception as e:
             messages.error(request, f"Error during sync: {str(e)}", extra_tags=message_tag)
@@ -1,6 +1,6 @@
 from django.shortcuts import render
 
-from GameProgress.services.ranking import get_all_student_rankings
+from GameProgress.services.ranking_cache import CachedRanking
 from StudentManagementSystem.decorators.custom_decorators import session_login_required
 from StudentManagementSystem.models.roles import Role
 from StudentManagementSystem.models.section import Section, Department
@@ -24,28 +24,16 @@ def admin_student_ranking(request):
     sections = Section.objects.select_related("year_level").order_by("year_level__year", "letter")
     unique_sections = deduplicate_sections(sections)
 
-    rankings = get_all_student_rankings(
+    rankings = CachedRanking(
         sort_by=params["sort_by"],
         sort_order=params["sort_order"],
         filter_by=params["section_filter"],
         department_filter=None if not params["department_name"] or params["department_name"].lower() == "all"
         else params["department_name"],
+        search_query=params["search_query"],
     )
 
-    # ✅ Apply search filter if provided
-    search_query = request.GET.get("search", "").strip().lower()
-    if search_query:
-        rankings = [
-            r for r in rankings
-            if search_query in str(r.get("student_id", "")).lower()
-               or search_query in str(r.get("first_name", "")).lower()
-               or search_query in str(r.get("last_name", "")).lower()
-               or search_query in f"{r.get('first_name', '')} {r.get('last_name', '')}".lower()
-               or search_query in str(r.get("section", "")).lower()
-               or search_query in str(r.get("score", "")).lower()
-        ]
-
-    # ✅ Paginate AFTER filtering
+    # ✅ Paginate in the database (LIMIT/OFFSET)
     page_obj = paginate_queryset(rankings, params["per_page"], params["page_number"])
 
     context = build_ranking_context(rankings, page_obj, params, user_context, {
@@ -4,13 +4,13 @@ from django.contrib import messages
 from django.contrib.auth.hashers import check_password, make_password
 from django.shortcuts import render, redirect
 
+from GameProgress.services.progress import sync_student_progress
 from StudentManagementSystem.models import Student, Teacher, SimpleAdmin, SectionJoinCode
 from StudentManagementSystem.models.roles import Role
 from StudentManagementSystem.models.teachers import HandledSection
 from StudentManagementSystem.views.logger import create_log
 from StudentManagementSystem.views.login_key import make_login_key
 from StudentManagementSystem.views.notifications_helper import create_notification
-from StudentManagementSystem.views.sync_all_progress import run_sync_in_background
 
 
 def unified_login(request):
@@ -152,7 +152,7 @@ def register_student(request):
             section=join_code.section,
             role=Role.STUDENT,
         )
-        run_sync_in_background()
+        sync_student_progress([student.id])  # 🔹 this student's rows only (a few dozen inserts + a zero scoreboard row)
         # --- Notify teacher(s) who handle this section ---
         handled_sections = HandledSection.objects.select_related("teacher").filter(
             section=join_code.section,
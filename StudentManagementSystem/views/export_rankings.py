@@ -3,7 +3,7 @@ from django.http import HttpResponse
 from django.shortcuts import render
 from openpyxl.utils import get_column_letter
 
-from GameProgress.services.ranking import get_all_student_rankings
+from GameProgress.services.ranking_cache import get_cached_student_rankings
 from StudentManagementSystem.decorators.custom_decorators import session_login_required
 from StudentManagementSystem.models import Student
 from StudentManagementSystem.models.roles import Role
@@ -29,28 +29,16 @@ def export_ranking_xls(request):
         limit_to_students = student_ids
 
     # Fetch rankings
-    rankings = get_all_student_rankings(
+    rankings = get_cached_student_rankings(
         sort_by=params["sort_by"],
         sort_order=params["sort_order"],
         filter_by=params["section_filter"],
         department_filter=None if not params["department_name"] or params["department_name"].lower() == "all"
         else params["department_name"],
         limit_to_students=limit_to_students,
+        search_query=params["search_query"],
     )
 
-    # ✅ Apply search filter
-    search_query = request.GET.get("search", "").strip().lower()
-    if search_query:
-        rankings = [
-            r for r in rankings
-            if search_query in str(r.get("student_id", "")).lower()
-               or search_query in str(r.get("first_name", "")).lower()
-               or search_query in str(r.get("last_name", "")).lower()
-               or search_query in f"{r.get('first_name', '')} {r.get('last_name', '')}".lower()
-               or search_query in str(r.get("section", "")).lower()
-               or search_query in str(r.get("score", "")).lower()
-        ]
-
     # Create workbook
     wb = openpyxl.Workbook()
     ws = wb.active
@@ -122,28 +110,16 @@ def print_ranking(request):
         limit_to_students = student_ids
 
     # Fetch rankings
-    rankings = get_all_student_rankings(
+    rankings = get_cached_student_rankings(
         sort_by=params["sort_by"],
         sort_order=params["sort_order"],
         filter_by=params["section_filter"],
         department_filter=None if not params["department_name"] or params["department_name"].lower() == "all"
         else params["department_name"],
         limit_to_students=limit_to_students,
+        search_query=params["search_query"],
     )
 
-    # ✅ Apply search filter if provided
-    search_query = request.GET.get("search", "").strip().lower()
-    if search_query:
-        rankings = [
-            r for r in rankings
-            if search_query in str(r.get("student_id", "")).lower()
-               or search_query in str(r.get("first_name", "")).lower()
-               or search_query in str(r.get("last_name", "")).lower()
-               or search_query in f"{r.get('first_name', '')} {r.get('last_name', '')}".lower()
-               or search_query in str(r.get("section", "")).lower()
-               or search_query in str(r.get("score", "")).lower()
-        ]
-
     context = {
         "rankings": rankings,
         "selected_department": params["department_name"],
@@ -0,0 +1,25 @@
+from django.http import JsonResponse
+
+from GameProgress.services.level_leaderboard import get_level_leaderboard
+from StudentManagementSystem.decorators.custom_decorators import session_login_required
+from StudentManagementSystem.models.roles import Role
+
+
+@session_login_required(role=[Role.ADMIN, Role.TEACHER, Role.STUDENT])
+def level_leaderboard(request, level_name):
+    """Top times for one level (AJAX), e.g. /ranking/level/Level5/?filter_by=CS2B&limit=10"""
+    try:
+        limit = int(request.GET.get("limit", 10))
+    except ValueError:
+        return JsonResponse({"success": False, "message": "Invalid limit."}, status=400)
+
+    leaderboard = get_level_leaderboard(
+        level_name,
+        limit=limit,
+        filter_by=request.GET.get("filter_by") or None,
+        department_filter=request.GET.get("department") or None,
+    )
+    if leaderboard is None:
+        return JsonResponse({"success": False, "message": "Level not found."}, status=404)
+
+    return JsonResponse({"success": True, **leaderboard})
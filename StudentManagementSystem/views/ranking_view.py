@@ -1,5 +1,7 @@
 from django.core.paginator import Paginator
 
+from GameProgress.services.snapshots import attach_rank_trends
+
 
 def get_common_params(request):
     """Extract common GET parameters for ranking views."""
@@ -10,6 +12,7 @@ def get_common_params(request):
         "sort_order": request.GET.get("sort_order", "desc"),
         "page_number": request.GET.get("page", 1),
         "per_page": int(request.GET.get("per_page", 25)),
+        "search_query": request.GET.get("search", "").strip(),
     }
 
 
@@ -21,7 +24,7 @@ def paginate_queryset(queryset, per_page, page_number):
 def build_ranking_context(rankings, page_obj, params, user_context, extra_context=None):
     """Build the final render context for ranking views."""
     context = {
-        "rankings": page_obj.object_list,
+        "rankings": attach_rank_trends(page_obj.object_list),  # deltas come from daily snapshots
         "page_obj": page_obj,
         "sort_by": params["sort_by"],
         "sort_order": params["sort_order"],
@@ -0,0 +1,57 @@
+import hashlib
+
+from django.conf import settings
+from django.core import signing
+
+from StudentManagementSystem.models import Student
+
+API_TOKEN_SALT = "thinkjava.game-api"
+
+
+def _password_fingerprint(student):
+    """Short digest of the stored hash, so changing the password revokes old tokens."""
+    return hashlib.sha256(student.password.encode()).hexdigest()[:16]
+
+
+def make_api_token(student):
+    """Signed, timestamped bearer token for the game client (verified with HMAC only)."""
+    return signing.TimestampSigner(salt=API_TOKEN_SALT).sign_object(
+        {"id": student.id, "pw": _password_fingerprint(student)}
+    )
+
+
+def _unsign(token):
+    try:
+        return signing.TimestampSigner(salt=API_TOKEN_SALT).unsign_object(
+            token, max_age=settings.API_TOKEN_MAX_AGE
+        )
+    except (signing.BadSignature, ValueError, TypeError):
+        return None
+
+
+def get_student_for_token(token):
+    """
+    Student for a valid, unexpired token, else None.
+    No password hashing: one HMAC check plus a primary-key lookup. The student is read fresh
+    on every check (never cached per worker), so a password change or delete revokes tokens at once.
+    """
+    return get_students_for_tokens([token])[0]
+
+
+def get_students_for_tokens(tokens):
+    """
+    get_student_for_token() for many tokens at once (lab gateways): one query for all
+    validly signed tokens. Returns a list aligned with `tokens`.
+    """
+    payloads = [_unsign(token) for token in tokens]
+    ids = {payload["id"] for payload in payloads if payload}
+    students = {student.id: student for student in Student.objects.filter(id__in=ids)} if ids else {}
+
+    results = []
+    for payload in payloads:
+        student = students.get(payload["id"]) if payload else None
+        if student is not None and _password_fingerprint(student) != payload.get("pw"):
+            student = None
+        results.append(student)
+    return results
+
@@ -1,12 +1,19 @@
-from django.contrib.auth.hashers import check_password
+from asgiref.sync import sync_to_async
+from django.conf import settings
 from django.http import JsonResponse
 from django.views.decorators.csrf import csrf_exempt
 
 from StudentManagementSystem.models import Student, UserProfile
+from StudentManagementSystem.views.students.api.api_token import make_api_token
+from StudentManagementSystem.views.students.api.password_check import acheck_password
 
 
 @csrf_exempt
-def api_student_login(request):
+async def api_student_login(request):
+    """
+    Async (ASGI) game login: the student lookup uses the async ORM and the password hash
+    runs on the bounded password executor, so a login burst never pins every worker thread.
+    """
     if request.method != "POST":
         return JsonResponse({"error": "POST required"}, status=405)
 
@@ -20,70 +27,79 @@ def api_student_login(request):
 
         #  Fetch student
         try:
-            student = Student.objects.select_related(
+            student = await Student.objects.select_related(
                 "section__department", "section__year_level"
-            ).get(student_id=student_id)
+            ).aget(student_id=student_id)
         except Student.DoesNotExist:
             return JsonResponse({"error": "Student not found"}, status=404)
 
         #  Verify password
-        if not check_password(password, student.password):
+        if not await acheck_password(password, student.password):
             return JsonResponse({"error": "Incorrect password"}, status=401)
 
-        # Get UserProfile
-        try:
-            profile = UserProfile.objects.get(object_id=student.id, content_type__model="student")
-        except UserProfile.DoesNotExist:
-            profile = None
-
-        # phone = f"0{profile.phone}"
-        # Build response
-        section = student.section
-        response = {
-            "status": "success",
-            "student": {
-                "id": student.id,
-                "student_id": student.student_id,
-                "first_name": student.first_name,
-                "last_name": student.last_name,
-                "role": student.role,
-            },
-            "section": {
-                "dept": section.department.name if section else None,
-                "year_level": section.year_level.year if section else None,
-                "section_letter": section.letter if section else None,
-                "full_section": student.full_section,
-            },
-            "profile": {
-                "middle_initial": profile.middle_initial if profile else None,
-                "suffix": profile.suffix if profile else None,
-                "date_of_birth": str(profile.date_of_birth) if profile and profile.date_of_birth else None,
-                "age": profile.age() if profile else None,
-                "bio": profile.bio if profile else None,
-                "phone": profile.phone if profile else None,
-                "father_name": profile.father_name if profile else None,
-                "mother_name": profile.mother_name if profile else None,
-                "address": {
-                    "street": profile.street if profile else None,
-                    "barangay": profile.barangay if profile else None,
-                    "city": profile.city if profile else None,
-                    "province": profile.province if profile else None,
-                } if profile else None,
-                "profile_picture": request.build_absolute_uri(profile.avatar_url) if (
-                            profile and profile.avatar_url) else None,
-                "education": [
-                    {
-                        "institution": edu.institution,
-                        "start_year": edu.start_date.year if edu.start_date else None,
-                        "graduation_year": edu.graduation_date.year if edu.graduation_date else None,
-                    }
-                    for edu in profile.educational_backgrounds.all()
-                ] if profile else [],
-            },
-            "test_status": student.test_status,
-        }
-
+        # 🔹 Profile, avatar storage check and test status are sync ORM / storage calls
+        response = await sync_to_async(_login_response)(request, student)
         return JsonResponse(response, status=200)
 
     except Exception as e:
         return JsonResponse({"error": f"Unexpected error: {str(e)}"}, status=500)
+
+
+def _login_response(request, student):
+    """Login payload for a verified student (token, section, profile, test status)."""
+    # Get UserProfile
+    try:
+        profile = UserProfile.objects.get(object_id=student.id, content_type__model="student")
+    except UserProfile.DoesNotExist:
+        profile = None
+
+    # phone = f"0{profile.phone}"
+    # Build response
+    section = student.section
+    response = {
+        "status": "success",
+        # Send as "Authorization: Bearer <token>" on progress calls instead of the password
+        "token": make_api_token(student),
+        "token_expires_in": settings.API_TOKEN_MAX_AGE,
+        "student": {
+            "id": student.id,
+            "student_id": student.student_id,
+            "first_name": student.first_name,
+            "last_name": student.last_name,
+            "role": student.role,
+        },
+        "section": {
+            "dept": section.department.name if section else None,
+            "year_level": section.year_level.year if section else None,
+            "section_letter": section.letter if section else None,
+            "full_section": student.full_section,
+        },
+        "profile": {
+            "middle_initial": profile.middle_initial if profile else None,
+            "suffix": profile.suffix if profile else None,
+            "date_of_birth": str(profile.date_of_birth) if profile and profile.date_of_birth else None,
+            "age": profile.age() if profile else None,
+            "bio": profile.bio if profile else None,
+            "phone": profile.phone if profile else None,
+            "father_name": profile.father_name if profile else None,
+            "mother_name": profile.mother_name if profile else None,
+            "address": {
+                "street": profile.street if profile else None,
+                "barangay": profile.barangay if profile else None,
+                "city": profile.city if profile else None,
+                "province": profile.province if profile else None,
+            } if profile else None,
+            "profile_picture": request.build_absolute_uri(profile.avatar_url) if (
+                        profile and profile.avatar_url) else None,
+            "education": [
+                {
+                    "institution": edu.institution,
+                    "start_year": edu.start_date.year if edu.start_date else None,
+                    "graduation_year": edu.graduation_date.year if edu.graduation_date else None,
+                }
+                for edu in profile.educational_backgrounds.all()
+            ] if profile else [],
+        },
+        "test_status": student.test_status,
+    }
+    return response
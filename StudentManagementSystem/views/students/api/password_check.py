@@ -0,0 +1,18 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth.hashers import check_password
+
+# 🔹 Password hashing is deliberately slow; async views run it here so a burst of logins
+# queues on a few threads instead of taking every thread of the server.
+_password_executor = ThreadPoolExecutor(
+    max_workers=settings.API_PASSWORD_CHECK_WORKERS,
+    thread_name_prefix="password-check",
+)
+
+
+async def acheck_password(password, encoded):
+    """check_password() for async views, on the bounded password executor."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_password_executor, check_password, password, encoded)
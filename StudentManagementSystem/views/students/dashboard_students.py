@@ -1,7 +1,10 @@
 from django.shortcuts import render
 
-from GameProgress.models import AchievementDefinition, AchievementProgress, LevelProgress, LevelDefinition
-from GameProgress.services.ranking import get_student_performance, calc_level_score, calc_level_stars
+from GameProgress.models import AchievementProgress, LevelProgress
+from GameProgress.services.definitions import get_definitions
+from GameProgress.services.ranking import get_student_performance
+from GameProgress.services.scoring import default_table
+from GameProgress.services.standing import get_student_standing
 from StudentManagementSystem.decorators.custom_decorators import session_login_required
 from StudentManagementSystem.models import Notification
 from StudentManagementSystem.models.roles import Role
@@ -12,10 +15,12 @@ def student_dashboard(request):
     student = request.user_obj  # ✅ DB-validated Student from decorator
     full_name = f"{student.first_name} {student.last_name}"
 
-    achievements = get_student_achievements(student)
+    definitions = get_definitions()  # 🔹 one version check for the whole page
+    achievements = get_student_achievements(student, definitions)
     performance = get_student_performance(student)
-    game_completion = get_game_completion(student)
-    levels = get_student_levels(student)
+    game_completion = get_game_completion(student, definitions)
+    levels = get_student_levels(student, definitions)
+    standing = get_student_standing(student, neighbours=2)
 
     notifications = Notification.objects.filter(
         recipient_role=Role.STUDENT,
@@ -31,15 +36,16 @@ def student_dashboard(request):
         "achievements": achievements,
         "game_completion": game_completion,
         "levels": levels,
+        "standing": standing,
         "notifications": notifications,
         "unread_count": unread_count,
     }
     return render(request, "students/main/dashboard.html", context)
 
 
-def get_student_achievements(student):
+def get_student_achievements(student, definitions=None):
     """Return all achievements for a student with unlocked/locked status."""
-    all_achievements = AchievementDefinition.objects.all()
+    all_achievements = (definitions or get_definitions()).achievements
     progress_qs = AchievementProgress.objects.filter(student=student)
     progress_map = {p.achievement_id: p.unlocked for p in progress_qs}
 
@@ -54,13 +60,14 @@ def get_student_achievements(student):
     ]
 
 
-def get_game_completion(student):
+def get_game_completion(student, definitions=None):
     """
     Calculate overall game progression percentage based on:
       - Levels finished (90% weight)
       - Achievements unlocked (10% weight)
     """
-    total_levels = LevelDefinition.objects.count()
+    definitions = definitions or get_definitions()
+    total_levels = len(definitions.levels)
     levels_finished = (
         LevelProgress.objects.filter(student=student, best_time__gt=0)
         .values("level_id")
@@ -69,7 +76,7 @@ def get_game_completion(student):
     )
     level_progress = levels_finished / total_levels if total_levels > 0 else 0
 
-    total_achievements = AchievementDefinition.objects.count()
+    total_achievements = len(definitions.achievements)
     unlocked_count = AchievementProgress.objects.filter(student=student, unlocked=True).count()
     achievement_progress = unlocked_count / total_achievements if total_achievements > 0 else 0
 
@@ -82,26 +89,26 @@ def get_game_completion(student):
     return round(level_score + achievement_score, 2)
 
 
-def get_student_levels(student):
+def get_student_levels(student, definitions=None):
     """Return all levels with student's progress, sorted by LevelDefinition.sort_order."""
     # Get all levels, ordered by sort_order
-    all_levels = LevelDefinition.objects.all().order_by("sort_order")
+    all_levels = (definitions or get_definitions()).levels
 
     # Build a map of progress keyed by level_id
     progress_qs = LevelProgress.objects.filter(student=student).select_related("level")
     progress_map = {lp.level_id: lp for lp in progress_qs}
 
-    levels = []
-    for level in all_levels:
-        lp = progress_map.get(level.id)
-        best_time = lp.best_time if lp else None
+    best_times = [progress_map[level.id].best_time if level.id in progress_map else None for level in all_levels]
+    scores, stars = default_table().score_and_stars(best_times)  # 🔹 one vectorized pass
 
+    levels = []
+    for level, best_time, score, star_count in zip(all_levels, best_times, scores.tolist(), stars.tolist()):
         levels.append({
             "id": level.id,
             "name": level.name,
             "best_time": best_time,
-            "score": calc_level_score(best_time) if best_time else None,
-            "stars": calc_level_stars(best_time) if best_time else 0,
+            "score": score if best_time else None,
+            "stars": star_count if best_time else 0,
         })
 
     return levels
@@ -1,7 +1,7 @@
 from django.http import HttpResponseForbidden
 from django.shortcuts import render
 
-from GameProgress.services.ranking import get_all_student_rankings
+from GameProgress.services.ranking_cache import CachedRanking
 from StudentManagementSystem.decorators.custom_decorators import session_login_required
 from StudentManagementSystem.models import Student, Notification
 from StudentManagementSystem.models.roles import Role
@@ -24,12 +24,13 @@ def student_student_ranking(request):
         section=student.section
     ).values_list("id", flat=True)
 
-    rankings = get_all_student_rankings(
+    rankings = CachedRanking(
         sort_by=params["sort_by"],
         sort_order=params["sort_order"],
         filter_by=f"{student.section.year_level.year}{student.section.letter}",
         department_filter=student.section.department.name,
         limit_to_students=student_ids,
+        search_query=params["search_query"],
     )
     notifications = Notification.objects.filter(
         recipient_role=Role.STUDENT,
@@ -38,20 +39,7 @@ def student_student_ranking(request):
 
     unread_count = notifications.filter(is_read=False).count()
 
-    # ✅ Apply search filter if provided
-    search_query = request.GET.get("search", "").strip().lower()
-    if search_query:
-        rankings = [
-            r for r in rankings
-            if search_query in str(r.get("student_id", "")).lower()
-               or search_query in str(r.get("first_name", "")).lower()
-               or search_query in str(r.get("last_name", "")).lower()
-               or search_query in f"{r.get('first_name', '')} {r.get('last_name', '')}".lower()
-               or search_query in str(r.get("section", "")).lower()
-               or search_query in str(r.get("score", "")).lower()
-        ]
-
-    # ✅ Paginate after filtering
+    # ✅ Paginate in the database (LIMIT/OFFSET)
     page_obj = paginate_queryset(rankings, params["per_page"], params["page_number"])
 
     user_context = {
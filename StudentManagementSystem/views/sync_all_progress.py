@@ -1,19 +1,18 @@
-import logging
-import threading
+from GameProgress.services.jobs import enqueue_job
 
-from GameProgress.services.progress import sync_all_students_with_all_progress
 
-
-def run_sync_in_background():
+def run_sync_in_background(job="sync_all_progress", *args):
     """
-    Fire sync_all_students_with_all_progress() in a background thread.
-    Can be used in views or anywhere else.
+    Queue a progress sync for the background worker (`run_worker`): the full resync by default,
+    or a scoped one (e.g. run_sync_in_background("sync_level_progress", level.id)).
+    Identical syncs already waiting in the queue are coalesced into one.
     """
+    return enqueue_job(job, *args)
 
-    def task():
-        try:
-            sync_all_students_with_all_progress()
-        except Exception as e:
-            logging.getLogger(__name__).error("Background sync failed: %s", str(e))
 
-    threading.Thread(target=task, daemon=True).start()
+def run_scoreboard_rebuild_in_background():
+    """
+    Queue rebuild_student_scores() for the background worker.
+    Needed after deleting a level/achievement, since the cascade removes progress rows.
+    """
+    return enqueue_job("rebuild_scoreboard")
@@ -1,7 +1,7 @@
 from django.shortcuts import render
 
-from GameProgress.models import LevelDefinition, AchievementDefinition
-from GameProgress.services.ranking import get_all_student_rankings
+from GameProgress.services.definitions import get_definitions
+from GameProgress.services.ranking import get_top_students, get_top_students_per_section
 from StudentManagementSystem.decorators.custom_decorators import session_login_required
 from StudentManagementSystem.models import Notification
 from StudentManagementSystem.models.roles import Role
@@ -9,8 +9,9 @@ from StudentManagementSystem.models.section import Section, Department
 from StudentManagementSystem.models.student import Student
 
 
-def get_teacher_dashboard_context(teacher):
+def get_teacher_dashboard_context(teacher, definitions=None):
     handled_sections = teacher.handled_sections.all()
+    definitions = definitions or get_definitions()
 
     # 🔒 Only include students from teacher's handled sections
     students = Student.objects.filter(section__in=handled_sections.values_list("section_id", flat=True))
@@ -27,6 +28,7 @@ def get_teacher_dashboard_context(teacher):
     total_cs_section = handled_sections.filter(department__name="CS").count()
     total_it_section = handled_sections.filter(department__name="IT").count()
     top_5_students = get_teacher_top_students(teacher, limit=5)
+    top_students_by_section = get_teacher_top_students_by_section(teacher, limit=3)
 
     notifications = Notification.objects.filter(
         recipient_role=Role.TEACHER,
@@ -40,10 +42,10 @@ def get_teacher_dashboard_context(teacher):
         "handled_sections": handled_sections,
         "handled_sections_names": [f"{hs.year_level.year} {hs.section.letter}" for hs in handled_sections],
         "handled_students": students,  # ✅ safe now
-        "level_options": [{"value": level.name, "label": level.name} for level in LevelDefinition.objects.all()],
+        "level_options": [{"value": level.name, "label": level.name} for level in definitions.levels],
         "achievement_options": [
             {"value": ach.code, "label": ach.title, "is_active": ach.is_active}
-            for ach in AchievementDefinition.objects.all()
+            for ach in definitions.achievements
         ],
         "departments": Department.objects.all(),
         "sections_for_department": sections_for_department,
@@ -53,6 +55,7 @@ def get_teacher_dashboard_context(teacher):
         "total_cs_section": total_cs_section,
         "total_it_section": total_it_section,
         "top_5_students": top_5_students,
+        "top_students_by_section": top_students_by_section,
         'notifications': notifications,
         'unread_count': unread_count
     }
@@ -68,18 +71,13 @@ def teacher_dashboard(request):
 def get_teacher_top_students(teacher, limit=5, sort_by="score", sort_order="desc"):
     """
     Return the top N students (default 5) from the sections handled by a teacher.
-    Ranking is based on get_all_student_rankings.
+    Single ORDER BY ... LIMIT N on the scoreboard (no full ranking).
     """
-
-    # Get IDs of students only in the teacher's handled sections
     handled_section_ids = teacher.handled_sections.values_list("section_id", flat=True)
-    student_ids = Student.objects.filter(section_id__in=handled_section_ids).values_list("id", flat=True)
+    return get_top_students(handled_section_ids, limit=limit, sort_by=sort_by, sort_order=sort_order)
 
-    # Reuse your existing ranking function with limit_to_students
-    rankings = get_all_student_rankings(
-        sort_by=sort_by,
-        sort_order=sort_order,
-        limit_to_students=student_ids
-    )
 
-    return rankings[:limit]
+def get_teacher_top_students_by_section(teacher, limit=3):
+    """Top N students of each handled section (one query)."""
+    handled_section_ids = teacher.handled_sections.values_list("section_id", flat=True)
+    return get_top_students_per_section(handled_section_ids, limit=limit)
@@ -5,7 +5,8 @@ from django.shortcuts import render, redirect
 from django.urls import reverse
 from django.utils import timezone, formats
 
-from GameProgress.models import LevelDefinition, AchievementDefinition, LevelProgress, AchievementProgress
+from GameProgress.models import LevelProgress, AchievementProgress
+from GameProgress.services.definitions import get_definitions
 from GameProgress.services.progress_teacher import (
     unlock_levels_for_students,
     lock_levels_for_students,
@@ -88,12 +89,12 @@ def _attach_section_progress(section, students, all_levels, all_achievements):
     """Annotate a section with its levels and achievements progress."""
     section.levels = [
         {"name": lvl.name,
-         "unlocked": LevelProgress.objects.filter(student__in=students, level=lvl, unlocked=True).exists()}
+         "unlocked": LevelProgress.objects.filter(student__in=students, level_id=lvl.id, unlocked=True).exists()}
         for lvl in all_levels
     ]
     section.achievements = [
         {"code": ach.code, "title": ach.title,
-         "is_active": AchievementProgress.objects.filter(student__in=students, achievement=ach,
+         "is_active": AchievementProgress.objects.filter(student__in=students, achievement_id=ach.id,
                                                          is_active=True).exists()}
         for ach in all_achievements
     ]
@@ -280,8 +281,9 @@ def progress_control_teacher(request):
         return redirect(redirect_url)
 
     # ---------------- GET ----------------
-    all_levels = list(LevelDefinition.objects.all())
-    all_achievements = list(AchievementDefinition.objects.all())
+    definitions = get_definitions()
+    all_levels = definitions.levels
+    all_achievements = definitions.achievements
 
     sections = [hs.section for hs in handled_sections]
     departments = {hs.section.department for hs in handled_sections}
@@ -300,7 +302,7 @@ def progress_control_teacher(request):
         students = Student.objects.filter(section_id=selected_section_obj.id)
         selected_section_obj = _attach_section_progress(selected_section_obj, students, all_levels, all_achievements)
 
-    context = get_teacher_dashboard_context(teacher)
+    context = get_teacher_dashboard_context(teacher, definitions)
     context.update(
         {
             "handled_sections": handled_sections,
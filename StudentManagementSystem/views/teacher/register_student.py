@@ -6,6 +6,8 @@ from django.db.models.query_utils import Q
 from django.http.response import JsonResponse
 from django.shortcuts import redirect, render, get_object_or_404
 
+from GameProgress.services.progress import sync_student_progress
+from GameProgress.services.ranking_cache import bump_progress_version
 from StudentManagementSystem.decorators.custom_decorators import session_login_required
 from StudentManagementSystem.models import Student, SectionJoinCode, Notification
 from StudentManagementSystem.models.roles import Role
@@ -14,7 +16,6 @@ from StudentManagementSystem.models.teachers import HandledSection
 from StudentManagementSystem.views.logger import create_log
 from StudentManagementSystem.views.ranking_view import build_ranking_context, paginate_queryset, get_common_params, \
     deduplicate_sections
-from StudentManagementSystem.views.sync_all_progress import run_sync_in_background
 
 
 @session_login_required(role=Role.TEACHER)
@@ -63,7 +64,7 @@ def register_student(request):
             student_id=student_id,
             password=make_password(password),
         )
-        run_sync_in_background()
+        sync_student_progress([student.id])  # 🔹 this student's rows only (a few dozen inserts + a zero scoreboard row)
 
         messages.success(
             request,
@@ -244,6 +245,7 @@ def edit_student(request, student_id):
                 student.password = hashed_password
 
         student.save()
+        bump_progress_version()  # name/section appear in cached rankings
 
         if changes:
             log_description = (
@@ -287,6 +289,7 @@ def delete_student(request, student_id):
         )
 
         student.delete()
+        bump_progress_version()
         messages.success(request, f"Student {student_name} deleted successfully.", extra_tags="edit_message")
         create_log(request, "DELETE", log_description)
 
@@ -1,6 +1,6 @@
 from django.shortcuts import render
 
-from GameProgress.services.ranking import get_all_student_rankings
+from GameProgress.services.ranking_cache import CachedRanking
 from StudentManagementSystem.decorators.custom_decorators import session_login_required
 from StudentManagementSystem.models import Student, Notification
 from StudentManagementSystem.models.roles import Role
@@ -39,29 +39,17 @@ def teacher_student_ranking(request):
     ).values_list("id", flat=True)
 
     # get base rankings
-    rankings = get_all_student_rankings(
+    rankings = CachedRanking(
         sort_by=params["sort_by"],
         sort_order=params["sort_order"],
         filter_by=params["section_filter"],
         department_filter=None if params["department_name"] and params["department_name"].lower() == "all"
         else params["department_name"],
         limit_to_students=student_ids,
+        search_query=params["search_query"],
     )
 
-    # ✅ Apply search filter if provided
-    search_query = request.GET.get("search", "").strip().lower()
-    if search_query:
-        rankings = [
-            r for r in rankings
-            if search_query in str(r.get("student_id", "")).lower()
-               or search_query in str(r.get("first_name", "")).lower()
-               or search_query in str(r.get("last_name", "")).lower()
-               or search_query in f"{r.get('first_name', '')} {r.get('last_name', '')}".lower()
-               or search_query in str(r.get("section", "")).lower()
-               or search_query in str(r.get("score", "")).lower()
-        ]
-
-    # paginate results
+    # paginate results (LIMIT/OFFSET in the database)
     page_obj = paginate_queryset(rankings, params["per_page"], params["page_number"])
     notifications = Notification.objects.filter(
         recipient_role=Role.TEACHER,
@@ -276,6 +276,34 @@ if not DEBUG:
     # SECURE_HSTS_INCLUDE_SUBDOMAINS = False
     # SECURE_HSTS_PRELOAD = False
 
+# ----------------------------------------------------
+# GAME API
+# ----------------------------------------------------
+API_TOKEN_MAX_AGE = int(os.environ.get("API_TOKEN_MAX_AGE", 60 * 60 * 8))  # seconds a login token stays valid
+API_PASSWORD_CHECK_WORKERS = int(os.environ.get("API_PASSWORD_CHECK_WORKERS", 4))  # threads hashing passwords (async API)
+# Write-behind autosaves: update_game_progress only buffers, the job worker applies them in batches
+PROGRESS_WRITE_BEHIND = os.environ.get("PROGRESS_WRITE_BEHIND", "false").lower() == "true"
+PROGRESS_FLUSH_INTERVAL = float(os.environ.get("PROGRESS_FLUSH_INTERVAL", 5))  # seconds between flushes
+# Autosaves invalidate cached rankings at most this often (seconds); teacher actions still invalidate at once
+RANKING_CACHE_DEBOUNCE = float(os.environ.get("RANKING_CACHE_DEBOUNCE", 15))
+# Token buckets on the progress endpoints: (tokens per second, burst); a rate of 0 disables the bucket.
+# The IP bucket is wide because a whole computer lab usually shares one address.
+PROGRESS_RATE_LIMITS = {
+    "student": (
+        float(os.environ.get("PROGRESS_RATE_STUDENT", 2)),
+        int(os.environ.get("PROGRESS_BURST_STUDENT", 10)),
+    ),
+    "ip": (
+        float(os.environ.get("PROGRESS_RATE_IP", 50)),
+        int(os.environ.get("PROGRESS_BURST_IP", 300)),
+    ),
+}
+PROGRESS_RATE_LIMIT_BACKEND = os.environ.get("PROGRESS_RATE_LIMIT_BACKEND", "memory")  # "memory" or "cache" (shared)
+# Reverse proxies (IPs / CIDRs) whose X-Forwarded-For is believed for the IP bucket; empty = REMOTE_ADDR only
+PROGRESS_TRUSTED_PROXIES = [
+    proxy.strip() for proxy in os.environ.get("PROGRESS_TRUSTED_PROXIES", "").split(",") if proxy.strip()
+]
+
 # ----------------------------------------------------
 # OTHER DEFAULTS
 # ----------------------------------------------------
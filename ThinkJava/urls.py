@@ -20,6 +20,7 @@ from django.conf.urls.static import static
 from django.urls import path, include
 
 from StudentManagementSystem.views.export_rankings import export_ranking_xls, print_ranking
+from StudentManagementSystem.views.level_leaderboard import level_leaderboard
 from StudentManagementSystem.views.notifications import read_notification, mark_all_as_read_view, delete_notification
 from StudentManagementSystem.views.ph_locations import provinces, cities, barangays
 
@@ -36,6 +37,7 @@ urlpatterns = [
 
                   path("ranking/export-xls/", export_ranking_xls, name="export_ranking_xls"),
                   path("ranking/print/", print_ranking, name="print_ranking"),
+                  path("ranking/level/<str:level_name>/", level_leaderboard, name="level_leaderboard"),
 
                   path("notifications/read/<int:notif_id>/", read_notification, name="read_notification"),
                   path("notifications/read/all/", mark_all_as_read_view, name="mark_all_notifications_as_read"),